@@ -4,39 +4,65 @@ from jose import JWTError, jwt
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import get_settings
-from app.core.database import get_db
+from app.core.database import get_read_db, route_recent_writer
+from app.core.principal_cache import Principal, TokenClaims, principal_cache
 from app.core.security import ALGORITHM
-from app.models.user import User
 from app.repositories.user_repository import user_repository
 
 settings = get_settings()
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
 
+async def resolve_principal(db: AsyncSession, token: str) -> Principal | None:
+    """校验 token 并返回对应用户身份；无效或用户不存在时返回 None。"""
+    claims = principal_cache.get_token(token)
+    if claims is None:
+        try:
+            payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[ALGORITHM])
+            claims = TokenClaims(
+                user_id=int(payload.get("sub")),
+                expires_at=float(payload["exp"]),
+                session_id=payload.get("sid"),
+                password_marker=payload.get("pwd"),
+            )
+        except (JWTError, KeyError, TypeError, ValueError):
+            return None
+        principal_cache.set_token(token, claims)
+    if claims.session_id is not None and principal_cache.is_revoked(claims.session_id):
+        return None
+
+    principal = principal_cache.get_principal(claims.user_id)
+    if principal is None:
+        user = await user_repository.get_by_id(db, claims.user_id)
+        if user is None:
+            return None
+        principal = Principal.from_user(user)
+        principal_cache.set_principal(principal)
+    # 修改密码之前签发的令牌（以及不带标记的旧令牌）一律拒绝
+    if claims.password_marker != principal.password_marker:
+        return None
+    return principal
+
+
 async def get_current_user(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     token: str = Depends(oauth2_scheme),
-) -> User:
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="无法验证凭证",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
-    try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[ALGORITHM])
-        user_id = int(payload.get("sub"))
-    except (JWTError, TypeError, ValueError) as e:
-        raise credentials_exception from e
-
-    user = await user_repository.get_by_id(db, user_id)
-    if user is None:
-        raise credentials_exception
-    return user
+) -> Principal:
+    principal = await resolve_principal(db, token)
+    if principal is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="无法验证凭证",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    # 同一请求的读会话由 get_read_db 缓存共享，此处决定后续查询是否改走主库
+    route_recent_writer(db, principal.id)
+    return principal
 
 
 async def get_admin_user(
-    current_user: User = Depends(get_current_user),
-) -> User:
+    current_user: Principal = Depends(get_current_user),
+) -> Principal:
     if current_user.role != "admin":
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
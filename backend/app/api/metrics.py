@@ -0,0 +1,59 @@
+import secrets
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.dependencies import resolve_principal
+from app.core.catalog_cache import catalog_cache
+from app.core.config import get_settings
+from app.core.database import get_read_db
+from app.core.events import book_events
+from app.core.metrics import registry, stats_collector
+from app.core.principal_cache import principal_cache
+from app.core.security import password_executor
+
+settings = get_settings()
+router = APIRouter()
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+registry.register_collector(
+    stats_collector("password_executor", "bcrypt 线程池", password_executor.stats)
+)
+registry.register_collector(
+    stats_collector("catalog_cache", "图书响应缓存", catalog_cache.stats)
+)
+registry.register_collector(
+    stats_collector("auth_cache", "认证缓存", principal_cache.stats)
+)
+registry.register_collector(
+    stats_collector("book_events", "图书事件流", book_events.stats)
+)
+
+
+async def _authorized(db: AsyncSession, authorization: str | None) -> bool:
+    if settings.METRICS_PUBLIC:
+        return True
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return False
+    if settings.METRICS_TOKEN and secrets.compare_digest(token, settings.METRICS_TOKEN):
+        return True
+    # 未配置抓取令牌时也可用管理员的访问令牌查看
+    principal = await resolve_principal(db, token)
+    return principal is not None and principal.role == "admin"
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics(
+    authorization: str | None = Header(default=None),
+    db: AsyncSession = Depends(get_read_db),
+):
+    # 指标包含各路由的延迟与数据库统计，默认不公开
+    if not await _authorized(db, authorization):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="无效的指标令牌",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return Response(registry.render(), media_type=CONTENT_TYPE)
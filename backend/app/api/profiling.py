@@ -0,0 +1,71 @@
+import secrets
+from datetime import datetime
+from urllib.parse import parse_qsl
+
+from app.api.dependencies import resolve_principal
+from app.core.database import AsyncReadSessionLocal
+from app.core.profiling import Profile, profile_request
+
+PROFILE_ID_HEADER = b"x-profile-id"
+
+
+def _header(scope, name: bytes) -> str | None:
+    for key, value in scope["headers"]:
+        if key == name:
+            return value.decode("latin-1")
+    return None
+
+
+def _requested(scope) -> bool:
+    query = scope["query_string"]
+    if b"profile=" in query and ("profile", "1") in parse_qsl(query.decode()):
+        return True
+    return _header(scope, b"x-profile") == "1"
+
+
+async def _is_admin(scope) -> bool:
+    authorization = _header(scope, b"authorization") or ""
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return False
+    async with AsyncReadSessionLocal() as db:
+        principal = await resolve_principal(db, token)
+    return principal is not None and principal.role == "admin"
+
+
+class ProfilingMiddleware:
+    """管理员请求携带 ?profile=1 或 X-Profile: 1 时剖析该请求。
+
+    非管理员的剖析标记直接忽略，请求照常处理；剖析结果的 ID 通过 X-Profile-Id 返回。
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not _requested(scope):
+            await self.app(scope, receive, send)
+            return
+        if not await _is_admin(scope):
+            await self.app(scope, receive, send)
+            return
+
+        profile = Profile(
+            id=secrets.token_hex(8),
+            method=scope["method"],
+            path=scope["path"],
+            started_at=datetime.utcnow(),
+        )
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                profile.status = message["status"]
+                headers = [
+                    *message.get("headers", ()),
+                    (PROFILE_ID_HEADER, profile.id.encode()),
+                ]
+                message = {**message, "headers": headers}
+            await send(message)
+
+        with profile_request(profile):
+            await self.app(scope, receive, send_wrapper)
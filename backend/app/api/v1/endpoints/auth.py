@@ -3,7 +3,7 @@ from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
-from app.schemas.auth import Token
+from app.schemas.auth import RefreshRequest, Token
 from app.services.auth_service import auth_service
 
 router = APIRouter()
@@ -21,5 +21,14 @@ async def login(
             detail="用户名或密码错误",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    access_token = auth_service.create_token(user.id)
-    return Token(access_token=access_token)
+    return await auth_service.issue_tokens(db, user)
+
+
+@router.post("/refresh", response_model=Token)
+async def refresh(data: RefreshRequest, db: AsyncSession = Depends(get_db)):
+    return await auth_service.refresh(db, data.refresh_token)
+
+
+@router.post("/logout", status_code=204)
+async def logout(data: RefreshRequest, db: AsyncSession = Depends(get_db)):
+    await auth_service.logout(db, data.refresh_token)
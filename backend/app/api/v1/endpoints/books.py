@@ -1,49 +1,167 @@
-from fastapi import APIRouter, Depends
+from datetime import datetime
+from typing import Literal
+
+from fastapi import (
+    APIRouter,
+    Depends,
+    Header,
+    HTTPException,
+    Query,
+    Request,
+    UploadFile,
+)
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.dependencies import get_admin_user, get_current_user
-from app.core.database import get_db
-from app.models.user import User
-from app.schemas.book import BookCreate, BookResponse, BookUpdate
-from app.schemas.borrow_record import BorrowRecordResponse
+from app.core.bulk_io import iter_records, iter_upload, resolve_format
+from app.core.catalog_cache import cached_json
+from app.core.config import get_settings
+from app.core.database import get_db, get_read_db
+from app.core.events import book_events
+from app.core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from app.core.principal_cache import Principal
+from app.core.serialization import ORJSONResponse, dumps
+from app.schemas.book import (
+    DEFAULT_BOOK_SORT,
+    BookCreate,
+    BookFilters,
+    BookPage,
+    BookResponse,
+    BookSort,
+    BookUpdate,
+    book_serializer,
+)
+from app.schemas.borrow_record import BorrowRecordResponse, borrow_record_serializer
+from app.schemas.bulk import ImportReport
+from app.schemas.pagination import CursorPage
+from app.services.book_import_service import book_import_service
 from app.services.book_service import book_service
 from app.services.borrow_service import borrow_service
 
+settings = get_settings()
 router = APIRouter()
 
 
-@router.get("/", response_model=list[BookResponse])
+@router.get("/", response_model=BookPage)
 async def list_books(
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    request: Request,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    fields: str | None = None,
+    status: Literal["available", "borrowed"] | None = None,
+    author: str | None = Query(None, max_length=100),
+    publisher: str | None = Query(None, max_length=100),
+    isbn_prefix: str | None = Query(None, max_length=20),
+    created_from: datetime | None = None,
+    created_to: datetime | None = None,
+    sort: BookSort = DEFAULT_BOOK_SORT,
+    facets: bool = False,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user),
+):
+    selected = book_serializer.parse_fields(fields)
+    filters = BookFilters(
+        status=status,
+        author=author,
+        publisher=publisher,
+        isbn_prefix=isbn_prefix,
+        created_from=created_from,
+        created_to=created_to,
+    )
+
+    async def render() -> bytes:
+        page = await book_service.get_all(db, limit, cursor, filters, sort)
+        body = book_serializer.dump_page(page, selected)
+        if facets:
+            body["facets"] = await book_service.get_facets(db, filters)
+        return dumps(body)
+
+    key = (
+        f"list:{limit}:{cursor or ''}:{','.join(selected)}"
+        f":{sort}:{filters.cache_key()}:{int(facets)}"
+    )
+    return await cached_json(request, key, render)
+
+
+@router.get("/search", response_model=list[BookResponse])
+async def search_books(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(20, ge=1, le=MAX_PAGE_SIZE),
+    fields: str | None = None,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user),
+):
+    selected = book_serializer.parse_fields(fields)
+    books = await book_service.search(db, q, limit)
+    return ORJSONResponse(book_serializer.dump_many(books, selected))
+
+
+@router.get("/events")
+async def stream_book_events(
+    last_event_id: str | None = Header(None),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user),
 ):
-    return await book_service.get_all(db)
+    """图书状态变化的 SSE 流（created/updated/deleted/borrowed/returned/imported）。"""
+    if book_events.full():
+        raise HTTPException(
+            status_code=503,
+            detail="事件订阅数已达上限，请稍后重试",
+            headers={"Retry-After": "5"},
+        )
+    # 认证完成后立即归还连接，长连接期间不占用连接池
+    await db.close()
+    return StreamingResponse(
+        book_events.stream(last_event_id, settings.EVENTS_KEEPALIVE_SECONDS),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @router.get("/{book_id}", response_model=BookResponse)
 async def get_book(
+    request: Request,
     book_id: int,
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user),
 ):
-    return await book_service.get_by_id(db, book_id)
+    async def render() -> bytes:
+        book = await book_service.get_by_id(db, book_id)
+        return dumps(book_serializer.dump(book))
+
+    return await cached_json(request, f"detail:{book_id}", render)
 
 
 @router.post("/", response_model=BookResponse, status_code=201)
 async def create_book(
     data: BookCreate,
     db: AsyncSession = Depends(get_db),
-    admin: User = Depends(get_admin_user),
+    admin: Principal = Depends(get_admin_user),
 ):
     return await book_service.create_book(db, data)
 
 
+@router.post("/import", response_model=ImportReport)
+async def import_books(
+    file: UploadFile,
+    format: str | None = Query(None, pattern="^(csv|jsonl)$"),
+    chunk_size: int = Query(settings.BOOK_IMPORT_CHUNK_SIZE, ge=1, le=10000),
+    db: AsyncSession = Depends(get_db),
+    admin: Principal = Depends(get_admin_user),
+):
+    fmt = resolve_format(format, file.filename)
+    return await book_import_service.import_records(
+        db, iter_records(iter_upload(file), fmt), chunk_size
+    )
+
+
 @router.put("/{book_id}", response_model=BookResponse)
 async def update_book(
     book_id: int,
     data: BookUpdate,
     db: AsyncSession = Depends(get_db),
-    admin: User = Depends(get_admin_user),
+    admin: Principal = Depends(get_admin_user),
 ):
     return await book_service.update_book(db, book_id, data)
 
@@ -52,7 +170,7 @@ async def update_book(
 async def delete_book(
     book_id: int,
     db: AsyncSession = Depends(get_db),
-    admin: User = Depends(get_admin_user),
+    admin: Principal = Depends(get_admin_user),
 ):
     await book_service.delete_book(db, book_id)
 
@@ -61,24 +179,31 @@ async def delete_book(
 async def borrow_book(
     book_id: int,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
-    return await book_service.borrow_book(db, book_id, current_user.id)
+    return await book_service.borrow_book(db, book_id, current_user)
 
 
 @router.post("/{book_id}/return", response_model=BorrowRecordResponse)
 async def return_book(
     book_id: int,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
-    return await book_service.return_book(db, book_id, current_user.id)
+    return await book_service.return_book(db, book_id, current_user)
 
 
-@router.get("/{book_id}/records", response_model=list[BorrowRecordResponse])
+@router.get("/{book_id}/records", response_model=CursorPage[BorrowRecordResponse])
 async def get_book_records(
     book_id: int,
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    fields: str | None = None,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user),
 ):
-    return await borrow_service.get_book_records(db, book_id)
+    selected = borrow_record_serializer.parse_fields(fields)
+    page = await borrow_service.get_book_records(
+        db, book_id, limit, cursor, borrow_record_serializer.relations(selected)
+    )
+    return ORJSONResponse(borrow_record_serializer.dump_page(page, selected))
@@ -1,21 +1,65 @@
-from fastapi import APIRouter, Depends
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.dependencies import get_current_user
-from app.core.database import get_db
-from app.models.user import User
-from app.schemas.borrow_record import BorrowRecordResponse, NoteUpdate
+from app.api.dependencies import get_admin_user, get_current_user
+from app.core.database import get_db, get_read_db
+from app.core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from app.core.principal_cache import Principal
+from app.core.serialization import ORJSONResponse
+from app.schemas.borrow_record import (
+    BorrowRecordResponse,
+    NoteUpdate,
+    OverdueSweepResult,
+    borrow_record_serializer,
+)
+from app.schemas.pagination import CursorPage
+from app.services.borrow_export_service import MEDIA_TYPES, borrow_export_service
 from app.services.borrow_service import borrow_service
+from app.services.overdue_service import overdue_service
 
 router = APIRouter()
 
 
-@router.get("/", response_model=list[BorrowRecordResponse])
+@router.get("/", response_model=CursorPage[BorrowRecordResponse])
 async def list_my_records(
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    fields: str | None = None,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user),
+):
+    selected = borrow_record_serializer.parse_fields(fields)
+    page = await borrow_service.get_user_records(
+        db,
+        current_user.id,
+        limit,
+        cursor,
+        borrow_record_serializer.relations(selected),
+    )
+    return ORJSONResponse(borrow_record_serializer.dump_page(page, selected))
+
+
+@router.get("/overdue", response_model=CursorPage[BorrowRecordResponse])
+async def list_overdue_records(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    fields: str | None = None,
+    db: AsyncSession = Depends(get_read_db),
+    admin: Principal = Depends(get_admin_user),
 ):
-    return await borrow_service.get_user_records(db, current_user.id)
+    selected = borrow_record_serializer.parse_fields(fields)
+    page = await overdue_service.get_overdue(
+        db, limit, cursor, borrow_record_serializer.relations(selected)
+    )
+    return ORJSONResponse(borrow_record_serializer.dump_page(page, selected))
+
+
+@router.post("/overdue/sweep", response_model=OverdueSweepResult)
+async def sweep_overdue_records(admin: Principal = Depends(get_admin_user)):
+    return OverdueSweepResult(marked=await overdue_service.sweep())
 
 
 @router.put("/{record_id}/note", response_model=BorrowRecordResponse)
@@ -23,6 +67,22 @@ async def update_note(
     record_id: int,
     data: NoteUpdate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     return await borrow_service.update_note(db, record_id, current_user.id, data.note)
+
+
+@router.get("/export")
+async def export_records(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    start: datetime | None = Query(None, description="借阅时间下限（含）"),
+    end: datetime | None = Query(None, description="借阅时间上限（不含）"),
+    admin: Principal = Depends(get_admin_user),
+):
+    return StreamingResponse(
+        borrow_export_service.export_history(format, start, end),
+        media_type=MEDIA_TYPES[format],
+        headers={
+            "Content-Disposition": f'attachment; filename="borrow-records.{format}"'
+        },
+    )
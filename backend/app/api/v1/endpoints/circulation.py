@@ -0,0 +1,19 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.dependencies import get_admin_user
+from app.core.database import get_db
+from app.core.principal_cache import Principal
+from app.schemas.circulation import BatchCirculationRequest, BatchCirculationResult
+from app.services.circulation_service import circulation_service
+
+router = APIRouter()
+
+
+@router.post("/batch", response_model=BatchCirculationResult)
+async def batch_circulation(
+    request: BatchCirculationRequest,
+    db: AsyncSession = Depends(get_db),
+    admin: Principal = Depends(get_admin_user),
+):
+    return await circulation_service.batch(db, request)
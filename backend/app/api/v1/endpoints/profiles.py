@@ -0,0 +1,27 @@
+from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
+
+from app.api.dependencies import get_admin_user
+from app.core.principal_cache import Principal
+from app.schemas.profile import ProfileDetail, ProfileSummary
+from app.services.profile_service import profile_service
+
+router = APIRouter()
+
+
+@router.get("/", response_model=list[ProfileSummary])
+async def list_profiles(admin: Principal = Depends(get_admin_user)):
+    return profile_service.list_profiles()
+
+
+@router.get("/{profile_id}", response_model=ProfileDetail)
+async def get_profile(profile_id: str, admin: Principal = Depends(get_admin_user)):
+    return profile_service.get_detail(profile_id)
+
+
+@router.get("/{profile_id}/folded", response_class=PlainTextResponse)
+async def get_profile_folded(
+    profile_id: str, admin: Principal = Depends(get_admin_user)
+):
+    # 折叠栈格式，可直接输入 flamegraph.pl、inferno 或 speedscope
+    return profile_service.get_folded(profile_id)
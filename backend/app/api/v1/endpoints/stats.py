@@ -0,0 +1,20 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.dependencies import get_admin_user
+from app.core.database import get_read_db
+from app.core.principal_cache import Principal
+from app.schemas.stats import CirculationStats
+from app.services.stats_service import stats_service
+
+router = APIRouter()
+
+
+@router.get("/circulation", response_model=CirculationStats)
+async def get_circulation_stats(
+    days: int = Query(30, ge=1, le=366, description="按日统计的天数（含今天）"),
+    top: int = Query(10, ge=1, le=100, description="借阅排行榜条数"),
+    db: AsyncSession = Depends(get_read_db),
+    admin: Principal = Depends(get_admin_user),
+):
+    return await stats_service.get_circulation(db, days, top)
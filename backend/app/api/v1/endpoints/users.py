@@ -1,17 +1,32 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query, UploadFile
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.dependencies import get_admin_user, get_current_user
-from app.core.database import get_db
-from app.models.user import User
-from app.schemas.user import PasswordChange, RoleUpdate, UserCreate, UserResponse
+from app.core.bulk_io import iter_records, iter_upload, resolve_format
+from app.core.config import get_settings
+from app.core.database import get_db, get_read_db
+from app.core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from app.core.principal_cache import Principal
+from app.core.serialization import ORJSONResponse
+from app.schemas.bulk import ImportReport
+from app.schemas.pagination import CursorPage
+from app.schemas.user import (
+    PasswordChange,
+    RoleUpdate,
+    UserCreate,
+    UserResponse,
+    user_serializer,
+)
+from app.services.user_import_service import user_import_service
 from app.services.user_service import user_service
 
 router = APIRouter()
 
+settings = get_settings()
+
 
 @router.get("/me", response_model=UserResponse)
-async def get_me(current_user: User = Depends(get_current_user)):
+async def get_me(current_user: Principal = Depends(get_current_user)):
     return current_user
 
 
@@ -19,10 +34,10 @@ async def get_me(current_user: User = Depends(get_current_user)):
 async def change_password(
     data: PasswordChange,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     return await user_service.change_password(
-        db, current_user, data.old_password, data.new_password
+        db, current_user.id, data.old_password, data.new_password
     )
 
 
@@ -30,17 +45,36 @@ async def change_password(
 async def create_user(
     data: UserCreate,
     db: AsyncSession = Depends(get_db),
-    admin: User = Depends(get_admin_user),
+    admin: Principal = Depends(get_admin_user),
 ):
     return await user_service.create_user(db, data)
 
 
-@router.get("/", response_model=list[UserResponse])
-async def list_users(
+@router.post("/import", response_model=ImportReport)
+async def import_users(
+    file: UploadFile,
+    format: str | None = Query(None, pattern="^(csv|jsonl)$"),
+    chunk_size: int = Query(settings.USER_IMPORT_CHUNK_SIZE, ge=1, le=5000),
     db: AsyncSession = Depends(get_db),
-    admin: User = Depends(get_admin_user),
+    admin: Principal = Depends(get_admin_user),
+):
+    fmt = resolve_format(format, file.filename)
+    return await user_import_service.import_records(
+        db, iter_records(iter_upload(file), fmt), chunk_size
+    )
+
+
+@router.get("/", response_model=CursorPage[UserResponse])
+async def list_users(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    fields: str | None = None,
+    db: AsyncSession = Depends(get_read_db),
+    admin: Principal = Depends(get_admin_user),
 ):
-    return await user_service.get_all(db)
+    selected = user_serializer.parse_fields(fields)
+    page = await user_service.get_all(db, limit, cursor)
+    return ORJSONResponse(user_serializer.dump_page(page, selected))
 
 
 @router.put("/{user_id}/role", response_model=UserResponse)
@@ -48,6 +82,6 @@ async def update_role(
     user_id: int,
     data: RoleUpdate,
     db: AsyncSession = Depends(get_db),
-    admin: User = Depends(get_admin_user),
+    admin: Principal = Depends(get_admin_user),
 ):
     return await user_service.update_role(db, user_id, data.role)
@@ -1,6 +1,14 @@
 from fastapi import APIRouter
 
-from app.api.v1.endpoints import auth, books, borrow_records, users
+from app.api.v1.endpoints import (
+    auth,
+    books,
+    borrow_records,
+    circulation,
+    profiles,
+    stats,
+    users,
+)
 
 api_router = APIRouter()
 api_router.include_router(auth.router, prefix="/auth", tags=["认证"])
@@ -9,3 +17,6 @@ api_router.include_router(books.router, prefix="/books", tags=["图书管理"])
 api_router.include_router(
     borrow_records.router, prefix="/borrow-records", tags=["借阅记录"]
 )
+api_router.include_router(circulation.router, prefix="/circulation", tags=["借还台"])
+api_router.include_router(stats.router, prefix="/stats", tags=["借阅统计"])
+api_router.include_router(profiles.router, prefix="/profiles", tags=["性能剖析"])
@@ -0,0 +1,26 @@
+import argparse
+import asyncio
+
+from app.cli import check_query_plans, import_books, import_users, rebuild_stats
+
+COMMANDS = {
+    "check-query-plans": check_query_plans,
+    "import-books": import_books,
+    "import-users": import_users,
+    "rebuild-stats": rebuild_stats,
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m app.cli", description="图书管理系统命令行工具"
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    for name, module in COMMANDS.items():
+        module.add_arguments(subparsers.add_parser(name, help=module.HELP))
+    args = parser.parse_args()
+    raise SystemExit(asyncio.run(COMMANDS[args.command].run(args)))
+
+
+if __name__ == "__main__":
+    main()
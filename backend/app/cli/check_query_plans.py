@@ -0,0 +1,223 @@
+import argparse
+import re
+import tempfile
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import date, datetime
+from pathlib import Path
+from typing import get_args
+
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.migrations import run_migrations
+from app.core.pagination import encode_cursor
+from app.repositories.book_repository import book_repository
+from app.repositories.book_search_repository import book_search_repository
+from app.repositories.borrow_repository import borrow_repository
+from app.repositories.refresh_token_repository import refresh_token_repository
+from app.repositories.stats_repository import stats_repository
+from app.repositories.user_repository import user_repository
+from app.schemas.book import BookFilters, BookSort
+
+HELP = "检查仓储层查询的 EXPLAIN QUERY PLAN，发现全表扫描时返回非零状态"
+
+# 不会命中任何行的参数：只关心执行计划，不关心结果
+MISSING_ID = 2**31 - 1
+CURSOR = encode_cursor(datetime(2000, 1, 1), MISSING_ID)
+# 图书列表的筛选组合：每种组合都与全部排序方式及分面计数一起检查
+FILTER_CASES = (
+    BookFilters(),
+    BookFilters(status="available"),
+    BookFilters(author=""),
+    BookFilters(publisher=""),
+    BookFilters(isbn_prefix="978"),
+    BookFilters(created_from=datetime(2000, 1, 1), created_to=datetime(2000, 2, 1)),
+)
+# 这些计划片段表示走了索引或 FTS，不算全表扫描
+INDEXED_MARKERS = ("USING INDEX", "USING COVERING INDEX", "USING INTEGER PRIMARY KEY")
+# 虚拟表（FTS5）带约束时形如 "VIRTUAL TABLE INDEX 0:M5"，冒号后为空表示无约束扫描
+CONSTRAINED_VTAB = re.compile(r"VIRTUAL TABLE INDEX \d+:\S")
+LIMIT = re.compile(r"\bLIMIT\b")
+# 生成统计信息所用的数据规模：计划按 ANALYZE 得到的行数估算选择索引
+SEED_SCALE = "10k"
+
+# 当前允许整体扫描索引的原因，由 allow_index_scan 设置
+_allowed_reason: str | None = None
+
+
+@contextmanager
+def allow_index_scan(reason: str) -> Iterator[None]:
+    """其中执行的语句允许无边界地扫描整个索引，例如需要聚合全部行的分面计数。"""
+    global _allowed_reason
+    _allowed_reason = reason
+    try:
+        yield
+    finally:
+        _allowed_reason = None
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--database-url",
+        help=(
+            "要检查的 SQLite 库，使用库中已有的统计信息"
+            f"（默认使用迁移到最新版本、写入 {SEED_SCALE} 基准数据并 ANALYZE 的临时库）"
+        ),
+    )
+
+
+async def exercise_repositories(db: AsyncSession) -> None:
+    await book_repository.get_by_id(db, MISSING_ID)
+    await book_repository.get_by_book_no(db, "")
+    await book_repository.get_all(db, 20)
+    await book_repository.get_all(db, 20, CURSOR)
+    for filters in FILTER_CASES:
+        for sort in get_args(BookSort):
+            await book_repository.get_all(db, 20, None, filters, sort)
+        # 分面计数聚合筛选后的全部行，无筛选时必然扫描整个索引
+        with allow_index_scan("分面计数"):
+            await book_repository.count_by_status(db, filters)
+            await book_repository.count_by_publisher(db, filters)
+    await book_repository.transition_status(db, MISSING_ID, "available", "borrowed")
+    await book_repository.transition_statuses(db, [MISSING_ID], "available", "borrowed")
+    await book_repository.get_by_ids_or_book_nos(db, [MISSING_ID], [""])
+    await book_search_repository.search(db, "query", 20)
+    # 短于 trigram 长度的词不走 FTS，候选集各部分由 LIMIT 限定，外层只排序候选集
+    with allow_index_scan("短词检索：最新图书窗口"):
+        await book_search_repository.search(db, "图书", 20)
+        await book_search_repository.search(db, "图书 ab", 20)
+        await book_search_repository.search(db, "query ab", 20)
+    await user_repository.get_by_id(db, MISSING_ID)
+    await user_repository.get_by_username(db, "")
+    await user_repository.get_existing_ids(db, [MISSING_ID])
+    await user_repository.get_existing_usernames(db, [""])
+    await user_repository.get_all(db, 20)
+    await user_repository.get_all(db, 20, CURSOR)
+    await refresh_token_repository.get_by_hash(db, "")
+    await refresh_token_repository.revoke(db, MISSING_ID, datetime(2000, 1, 1))
+    await refresh_token_repository.revoke_family(db, "", datetime(2000, 1, 1))
+    await refresh_token_repository.revoke_user(db, MISSING_ID, datetime(2000, 1, 1))
+    await borrow_repository.get_by_id(db, MISSING_ID)
+    await borrow_repository.get_active_by_user(db, MISSING_ID)
+    await borrow_repository.get_active_by_book(db, MISSING_ID)
+    await borrow_repository.get_by_user(db, MISSING_ID, 20)
+    await borrow_repository.get_by_user(db, MISSING_ID, 20, CURSOR)
+    await borrow_repository.get_by_book(db, MISSING_ID, 20)
+    await borrow_repository.get_by_book(db, MISSING_ID, 20, CURSOR)
+    await borrow_repository.get_all(db, 20)
+    await borrow_repository.get_all(db, 20, CURSOR)
+    await borrow_repository.close_loan(db, MISSING_ID, MISSING_ID)
+    await borrow_repository.close_loans(db, [MISSING_ID])
+    await borrow_repository.get_users_with_active_loans(db, [MISSING_ID])
+    await borrow_repository.get_overdue(db, datetime(2000, 1, 1), 20)
+    await borrow_repository.get_overdue(db, datetime(2000, 1, 1), 20, CURSOR)
+    await borrow_repository.mark_overdue(db, datetime(2000, 1, 1), 100)
+    async for _ in borrow_repository.stream_history(
+        db, datetime(2000, 1, 1), datetime(2000, 2, 1), 100
+    ):
+        pass
+    # 重算（rebuild）需要扫描借阅历史，不在检查范围内
+    await stats_repository.get_counter(db, "")
+    await stats_repository.get_daily(db, date(2000, 1, 1))
+    await stats_repository.get_top_books(db, 10)
+    await stats_repository.get_top_users(db, 10)
+
+
+def subquery_names(details: list[str]) -> set[str]:
+    # 子查询的结果以协程或临时表提供，对它们的 SCAN 不是扫描数据表
+    return {
+        d.split()[1] for d in details if d.startswith(("CO-ROUTINE ", "MATERIALIZE "))
+    }
+
+
+def is_full_scan(detail: str, subqueries: set[str] = frozenset()) -> bool:
+    if not detail.startswith("SCAN "):
+        return False
+    if CONSTRAINED_VTAB.search(detail) or detail.split()[1] in subqueries:
+        return False
+    return not any(marker in detail for marker in INDEXED_MARKERS)
+
+
+def is_unbounded_index_scan(statement: str, details: list[str]) -> bool:
+    """按索引顺序扫描且没有可用边界的计划。
+
+    只有带 LIMIT、并且排序直接由该索引提供（没有临时 B 树排序）时，
+    扫描才会在取够行数后停止；否则会读完整个索引。
+    """
+    subqueries = subquery_names(details)
+    scans = [
+        d
+        for d in details
+        if d.startswith("SCAN ")
+        and not is_full_scan(d, subqueries)
+        and not CONSTRAINED_VTAB.search(d)
+        and d.split()[1] not in subqueries
+    ]
+    if not scans:
+        return False
+    bounded = LIMIT.search(statement) and not any(
+        "USE TEMP B-TREE" in d for d in details
+    )
+    return not bounded
+
+
+async def seed_statistics(engine) -> None:
+    # 延迟导入：只有生成临时库时才需要基准数据工具
+    from benchmarks.scale import SCALES
+    from benchmarks.seed import seed
+
+    async with async_sessionmaker(engine)() as db:
+        await seed(db, SCALES[SEED_SCALE], 42)
+    async with engine.begin() as conn:
+        await conn.execute(text("ANALYZE"))
+
+
+async def run(args: argparse.Namespace) -> int:
+    with tempfile.TemporaryDirectory() as tmp:
+        url = args.database_url or f"sqlite+aiosqlite:///{Path(tmp) / 'plans.db'}"
+        engine = create_async_engine(url)
+        if engine.dialect.name != "sqlite":
+            print("仅支持 SQLite 的 EXPLAIN QUERY PLAN")
+            return 2
+        if args.database_url is None:
+            await run_migrations(engine)
+            await seed_statistics(engine)
+
+        # 语句 -> (参数, 允许整体扫描索引的原因)
+        captured: dict[str, tuple[tuple, str | None]] = {}
+
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            captured.setdefault(statement, (parameters, _allowed_reason))
+
+        event.listen(engine.sync_engine, "before_cursor_execute", capture)
+        async with async_sessionmaker(engine)() as db:
+            await exercise_repositories(db)
+            await db.rollback()
+        event.remove(engine.sync_engine, "before_cursor_execute", capture)
+
+        failures = 0
+        async with engine.connect() as conn:
+            for statement, (parameters, allowed) in captured.items():
+                result = await conn.exec_driver_sql(
+                    f"EXPLAIN QUERY PLAN {statement}", parameters
+                )
+                details = [row[-1] for row in result]
+                subqueries = subquery_names(details)
+                if any(is_full_scan(d, subqueries) for d in details):
+                    status = "SCAN"
+                elif is_unbounded_index_scan(statement, details):
+                    status = "ok* " if allowed else "IDX "
+                else:
+                    status = "ok  "
+                failures += status in ("SCAN", "IDX ")
+                print(status, " ".join(statement.split())[:120])
+                if status == "ok* ":
+                    print("       允许整体扫描索引：", allowed)
+                for detail in details:
+                    print("      ", detail)
+            await conn.rollback()
+        await engine.dispose()
+
+    print(f"\n{len(captured)} 条语句，{failures} 条存在全表扫描或无边界的索引扫描")
+    return 1 if failures else 0
@@ -0,0 +1,35 @@
+import argparse
+from pathlib import Path
+
+from app.core.bulk_io import FORMATS, detect_format, iter_path, iter_records
+from app.core.config import get_settings
+from app.core.database import AsyncSessionLocal, engine
+from app.core.migrations import run_migrations
+from app.services.book_import_service import book_import_service
+
+HELP = "从 CSV/JSONL 文件批量导入图书"
+
+settings = get_settings()
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("path", type=Path, help="CSV（含表头）或 JSONL 文件")
+    parser.add_argument("--format", choices=FORMATS, help="默认按扩展名识别")
+    parser.add_argument(
+        "--chunk-size", type=int, default=settings.BOOK_IMPORT_CHUNK_SIZE
+    )
+
+
+async def run(args: argparse.Namespace) -> int:
+    fmt = args.format or detect_format(args.path.name)
+    if fmt is None:
+        print("无法识别文件格式，请使用 --format 指定 csv 或 jsonl")
+        return 2
+    await run_migrations(engine)
+    async with AsyncSessionLocal() as db:
+        report = await book_import_service.import_records(
+            db, iter_records(iter_path(args.path), fmt), args.chunk_size
+        )
+    await engine.dispose()
+    print(report.model_dump_json(indent=2))
+    return 0 if report.failed == 0 else 1
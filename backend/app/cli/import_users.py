@@ -0,0 +1,53 @@
+import argparse
+import sys
+from pathlib import Path
+
+from app.core.bulk_io import FORMATS, detect_format, iter_path, iter_records
+from app.core.config import get_settings
+from app.core.database import AsyncSessionLocal, engine
+from app.core.migrations import run_migrations
+from app.core.security import bulk_hash_workers, shutdown_bulk_hash_pool
+from app.schemas.bulk import ImportReport
+from app.services.user_import_service import user_import_service
+
+HELP = "从 CSV/JSONL 文件批量创建用户（username、password、role 列）"
+
+settings = get_settings()
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("path", type=Path, help="CSV（含表头）或 JSONL 文件")
+    parser.add_argument("--format", choices=FORMATS, help="默认按扩展名识别")
+    parser.add_argument(
+        "--chunk-size", type=int, default=settings.USER_IMPORT_CHUNK_SIZE
+    )
+
+
+def print_progress(report: ImportReport) -> None:
+    print(
+        f"已处理 {report.total} 行：新增 {report.inserted}，"
+        f"跳过 {report.skipped}，失败 {report.failed}",
+        file=sys.stderr,
+    )
+
+
+async def run(args: argparse.Namespace) -> int:
+    fmt = args.format or detect_format(args.path.name)
+    if fmt is None:
+        print("无法识别文件格式，请使用 --format 指定 csv 或 jsonl")
+        return 2
+    await run_migrations(engine)
+    print(f"使用 {bulk_hash_workers()} 个进程计算密码哈希", file=sys.stderr)
+    try:
+        async with AsyncSessionLocal() as db:
+            report = await user_import_service.import_records(
+                db,
+                iter_records(iter_path(args.path), fmt),
+                args.chunk_size,
+                print_progress,
+            )
+    finally:
+        shutdown_bulk_hash_pool()
+        await engine.dispose()
+    print(report.model_dump_json(indent=2))
+    return 0 if report.failed == 0 else 1
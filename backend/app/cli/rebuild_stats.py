@@ -0,0 +1,23 @@
+import argparse
+
+from app.core.database import AsyncSessionLocal, engine
+from app.core.migrations import run_migrations
+from app.models.circulation_stats import CURRENTLY_BORROWED
+from app.repositories.stats_repository import stats_repository
+from app.services.stats_service import stats_service
+
+HELP = "按借阅历史重算借阅统计汇总表"
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    pass
+
+
+async def run(args: argparse.Namespace) -> int:
+    await run_migrations(engine)
+    async with AsyncSessionLocal() as db:
+        await stats_service.rebuild(db)
+        borrowed = await stats_repository.get_counter(db, CURRENTLY_BORROWED)
+    await engine.dispose()
+    print(f"统计已重算，当前在借 {borrowed} 本")
+    return 0
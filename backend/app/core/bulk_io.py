@@ -0,0 +1,121 @@
+import codecs
+import csv
+import json
+from collections.abc import AsyncIterator, Iterable
+from pathlib import Path
+from typing import Any
+
+from fastapi import HTTPException, UploadFile
+from pydantic import ValidationError
+
+READ_CHUNK_SIZE = 64 * 1024
+FORMATS = ("csv", "jsonl")
+
+
+class RowParseError(ValueError):
+    pass
+
+
+def detect_format(filename: str | None) -> str | None:
+    suffix = Path(filename or "").suffix.lower().lstrip(".")
+    if suffix in ("jsonl", "ndjson"):
+        return "jsonl"
+    return "csv" if suffix == "csv" else None
+
+
+def resolve_format(fmt: str | None, filename: str | None) -> str:
+    fmt = fmt or detect_format(filename)
+    if fmt is None:
+        raise HTTPException(
+            status_code=400, detail="无法识别文件格式，请指定 format=csv 或 jsonl"
+        )
+    return fmt
+
+
+def format_validation_error(e: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(p) for p in err['loc'])}: {err['msg']}" for err in e.errors()
+    )
+
+
+async def iter_upload(file: UploadFile) -> AsyncIterator[bytes]:
+    while chunk := await file.read(READ_CHUNK_SIZE):
+        yield chunk
+
+
+async def iter_path(path: Path) -> AsyncIterator[bytes]:
+    with path.open("rb") as f:
+        while chunk := f.read(READ_CHUNK_SIZE):
+            yield chunk
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    # 增量解码，内存中只保留当前块与一行残余；utf-8-sig 兼容 Excel 导出的 BOM
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            yield line.rstrip("\r")
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending.rstrip("\r")
+
+
+async def iter_records(
+    chunks: AsyncIterator[bytes], fmt: str
+) -> AsyncIterator[tuple[int, dict[str, Any] | RowParseError]]:
+    """逐行产出 ``(行号, 记录)``；无法解析的行产出 RowParseError 而不是中断导入。"""
+    parse = _iter_csv if fmt == "csv" else _iter_jsonl
+    async for item in parse(iter_lines(chunks)):
+        yield item
+
+
+async def _iter_jsonl(lines: AsyncIterator[str]):
+    line_no = 0
+    async for line in lines:
+        line_no += 1
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            yield line_no, RowParseError(f"JSON 解析失败: {e}")
+            continue
+        if not isinstance(record, dict):
+            yield line_no, RowParseError("每行必须是一个 JSON 对象")
+            continue
+        yield line_no, record
+
+
+async def _iter_csv(lines: AsyncIterator[str]):
+    header: list[str] | None = None
+    buffer: list[str] = []
+    line_no = 0
+    async for line in lines:
+        line_no += 1
+        buffer.append(line)
+        # 引号未闭合说明字段内含换行，继续拼接下一行
+        if sum(part.count('"') for part in buffer) % 2:
+            continue
+        row = _parse_csv_row(buffer)
+        buffer = []
+        if not any(cell.strip() for cell in row):
+            continue
+        if header is None:
+            header = [cell.strip() for cell in row]
+            continue
+        if len(row) != len(header):
+            yield (
+                line_no,
+                RowParseError(f"列数不匹配：期望 {len(header)} 列，实际 {len(row)} 列"),
+            )
+            continue
+        yield line_no, {k: v for k, v in zip(header, row, strict=True) if v != ""}
+    if buffer:
+        yield line_no, RowParseError("文件结尾存在未闭合的引号")
+
+
+def _parse_csv_row(lines: Iterable[str]) -> list[str]:
+    return next(csv.reader(["\n".join(lines)]), [])
@@ -0,0 +1,61 @@
+import time
+from collections import OrderedDict
+from typing import Any
+
+
+class TTLCache[K, V]:
+    """进程内 LRU 缓存，条目同时受容量和过期时间约束。"""
+
+    def __init__(self, max_entries: int, ttl_seconds: float, track_stats: bool = True):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.track_stats = track_stats
+        self._data: OrderedDict[K, tuple[float, V]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: K) -> V | None:
+        entry = self._data.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            if entry is not None:
+                del self._data[key]
+            if self.track_stats:
+                self.misses += 1
+            return None
+        self._data.move_to_end(key)
+        if self.track_stats:
+            self.hits += 1
+        return entry[1]
+
+    def set(self, key: K, value: V, ttl_seconds: float | None = None) -> None:
+        if self.max_entries <= 0:
+            return
+        ttl = (
+            self.ttl_seconds
+            if ttl_seconds is None
+            else min(ttl_seconds, self.ttl_seconds)
+        )
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def pop(self, key: K) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "size": len(self._data),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
@@ -0,0 +1,164 @@
+import hashlib
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any
+
+from fastapi import Request, Response
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+
+settings = get_settings()
+
+# 写入事务通过 session.info 标记，提交后再递增版本
+DIRTY_KEY = "catalog_dirty"
+
+
+@dataclass(frozen=True, slots=True)
+class CachedResponse:
+    expires_at: float
+    etag: str
+    body: bytes
+
+
+class CatalogCache:
+    """按目录版本缓存图书列表/详情的序列化结果，并据此应答条件 GET。
+
+    任何图书写入（增删改、借还、导入）提交后版本递增，旧条目全部作废。
+    版本只在当前进程内有效，其他 worker 进程的写入最多在 TTL 内不可见；
+    ETag 取自响应内容，因此跨进程也不会误判 304。
+    """
+
+    def __init__(
+        self,
+        enabled: bool,
+        max_bytes: int,
+        ttl_seconds: float,
+        settle_seconds: float = 0,
+    ):
+        self.enabled = enabled
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        # 版本递增后的这段时间内不写缓存，防止把尚未复制到副本的旧数据缓存下来
+        self.settle_seconds = settle_seconds
+        self.version = 0
+        self._bumped_at = float("-inf")
+        self._data: OrderedDict[tuple[int, str], CachedResponse] = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> CachedResponse | None:
+        if not self.enabled:
+            return None
+        entry = self._data.get((self.version, key))
+        if entry is None or entry.expires_at <= time.monotonic():
+            if entry is not None:
+                self._remove((self.version, key))
+            self.misses += 1
+            return None
+        self._data.move_to_end((self.version, key))
+        self.hits += 1
+        return entry
+
+    def set(self, key: str, body: bytes, version: int) -> CachedResponse:
+        """缓存 body；version 为开始渲染前读到的版本。"""
+        entry = CachedResponse(
+            expires_at=time.monotonic() + self.ttl_seconds,
+            etag='"' + hashlib.blake2b(body, digest_size=12).hexdigest() + '"',
+            body=body,
+        )
+        # 单条超过预算、渲染期间版本已递增（body 可能是写入前的数据）
+        # 或处于版本递增后的等待期时不缓存，但仍返回 ETag
+        if (
+            not self.enabled
+            or version != self.version
+            or len(body) > self.max_bytes
+            or time.monotonic() - self._bumped_at < self.settle_seconds
+        ):
+            return entry
+        self._remove((self.version, key))
+        self._data[(self.version, key)] = entry
+        self._bytes += len(body)
+        while self._bytes > self.max_bytes:
+            _, evicted = self._data.popitem(last=False)
+            self._bytes -= len(evicted.body)
+            self.evictions += 1
+        return entry
+
+    def _remove(self, full_key: tuple[int, str]) -> None:
+        entry = self._data.pop(full_key, None)
+        if entry is not None:
+            self._bytes -= len(entry.body)
+
+    def bump(self) -> None:
+        self.version += 1
+        self._bumped_at = time.monotonic()
+        self._data.clear()
+        self._bytes = 0
+
+    def invalidate_on_commit(self, db: AsyncSession) -> None:
+        db.sync_session.info[DIRTY_KEY] = True
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "version": self.version,
+            "size": len(self._data),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "not_modified": self.not_modified,
+            "evictions": self.evictions,
+        }
+
+
+catalog_cache = CatalogCache(
+    enabled=settings.CATALOG_CACHE_ENABLED,
+    max_bytes=settings.CATALOG_CACHE_MAX_BYTES,
+    ttl_seconds=settings.CATALOG_CACHE_TTL_SECONDS,
+    settle_seconds=(
+        settings.READ_YOUR_WRITES_SECONDS if settings.DATABASE_READ_URL else 0
+    ),
+)
+
+
+@event.listens_for(Session, "after_commit")
+def _bump_after_commit(session: Session) -> None:
+    # 提交前递增会让并发读取把旧数据缓存到新版本下
+    if session.info.pop(DIRTY_KEY, False):
+        catalog_cache.bump()
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_on_rollback(session: Session, previous_transaction) -> None:
+    session.info.pop(DIRTY_KEY, None)
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    tags = {t.strip().removeprefix("W/") for t in header.split(",")}
+    return etag in tags or "*" in tags
+
+
+async def cached_json(
+    request: Request, key: str, render: Callable[[], Awaitable[bytes]]
+) -> Response:
+    entry = catalog_cache.get(key)
+    if entry is None:
+        # 先记下版本再渲染：渲染期间有写入提交时不能把结果缓存到新版本下
+        version = catalog_cache.version
+        entry = catalog_cache.set(key, await render(), version)
+    headers = {"ETag": entry.etag, "Cache-Control": "private, no-cache"}
+    if _etag_matches(request, entry.etag):
+        catalog_cache.not_modified += 1
+        return Response(status_code=304, headers=headers)
+    return Response(entry.body, media_type="application/json", headers=headers)
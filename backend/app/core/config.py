@@ -1,4 +1,5 @@
 from functools import lru_cache
+from typing import Literal
 
 from pydantic_settings import BaseSettings
 
@@ -8,7 +9,76 @@ class Settings(BaseSettings):
     ADMIN_USERNAME: str = "admin"
     ADMIN_PASSWORD: str = "admin123"
     DATABASE_URL: str = "sqlite+aiosqlite:///./library.db"
-    ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24  # 24 hours
+    # 只读副本地址（如 postgresql+asyncpg://...）；未配置时读引擎指向主库
+    DATABASE_READ_URL: str | None = None
+    # 访问令牌短期有效，过期后用刷新令牌换取新令牌（不经过 bcrypt）
+    ACCESS_TOKEN_EXPIRE_MINUTES: int = 15
+    REFRESH_TOKEN_EXPIRE_DAYS: int = 14
+    # 已吊销会话的进程内记录上限；条目保留一个访问令牌有效期
+    REVOKED_SESSIONS_MAX_ENTRIES: int = 100000
+    # 连接池：读写分离时为读连接池，非 SQLite 时同时用于写连接池
+    DB_POOL_SIZE: int = 8
+    DB_MAX_OVERFLOW: int = 8
+    DB_POOL_TIMEOUT: float = 30
+    # 以下两项仅用于服务端数据库（PostgreSQL）
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    # asyncpg 每个连接缓存的预编译语句数；经 PgBouncer 事务模式连接时需设为 0
+    ASYNCPG_STATEMENT_CACHE_SIZE: int = 256
+    # 读写分离：读连接以只读方式打开（SQLite query_only / PostgreSQL 只读事务）。
+    # SQLite 只允许一个写者，写连接池单独限流，减少写请求在数据库层互相 BUSY
+    DB_SPLIT_READ_WRITE: bool = True
+    SQLITE_WRITE_POOL_SIZE: int = 4
+    # 读己之写：借还后该用户的读请求在此时间内改走主库，避开副本复制延迟
+    READ_YOUR_WRITES_SECONDS: float = 5
+    READ_YOUR_WRITES_MAX_USERS: int = 10000
+    # SQLite 性能配置：每个新连接执行的 PRAGMA，关闭后保持 SQLite 默认行为
+    SQLITE_PRAGMAS_ENABLED: bool = True
+    SQLITE_JOURNAL_MODE: Literal["WAL", "DELETE", "TRUNCATE", "PERSIST"] = "WAL"
+    SQLITE_SYNCHRONOUS: Literal["OFF", "NORMAL", "FULL", "EXTRA"] = "NORMAL"
+    SQLITE_MMAP_SIZE: int = 256 * 1024 * 1024
+    SQLITE_CACHE_SIZE_KIB: int = 64 * 1024
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_TEMP_STORE: Literal["DEFAULT", "FILE", "MEMORY"] = "MEMORY"
+    # bcrypt 专用线程池：工作线程数与等待队列上限（超出后返回 503）
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_QUEUE_SIZE: int = 64
+    # 认证缓存：已解码的 token 与用户身份（进程内 TTL + LRU）
+    AUTH_CACHE_ENABLED: bool = True
+    AUTH_CACHE_MAX_ENTRIES: int = 10000
+    AUTH_CACHE_TTL_SECONDS: int = 60
+    AUTH_CACHE_STATS: bool = True
+    # 批量导入图书时每批插入的行数
+    BOOK_IMPORT_CHUNK_SIZE: int = 1000
+    # 批量开户：每批哈希并插入的用户数；哈希进程数为空时取 CPU 核数
+    USER_IMPORT_CHUNK_SIZE: int = 500
+    BULK_HASH_PROCESSES: int | None = None
+    # 图书列表/详情响应缓存：按序列化字节数限制总内存，TTL 约束跨进程的陈旧时间
+    CATALOG_CACHE_ENABLED: bool = True
+    CATALOG_CACHE_MAX_BYTES: int = 16 * 1024 * 1024
+    CATALOG_CACHE_TTL_SECONDS: int = 30
+    # 借阅期限；后台任务按间隔分批标记逾期记录（间隔为 0 时不启动）
+    LOAN_PERIOD_DAYS: int = 30
+    OVERDUE_SWEEP_INTERVAL_SECONDS: float = 300
+    OVERDUE_SWEEP_BATCH_SIZE: int = 500
+    # 图书事件流（SSE）：每个连接的队列长度、可续传的历史事件数、连接数上限
+    EVENTS_QUEUE_SIZE: int = 256
+    EVENTS_HISTORY_SIZE: int = 1024
+    EVENTS_MAX_SUBSCRIBERS: int = 10000
+    EVENTS_KEEPALIVE_SECONDS: float = 15
+    # Prometheus 指标：/metrics 需携带 METRICS_TOKEN 或管理员访问令牌，
+    # METRICS_PUBLIC 为 true 时不校验（仅限内网抓取）；SQL 按规范化语句计时，
+    # 不同语句数超过上限后归入 other。慢查询阈值为 0 时不记录日志
+    METRICS_ENABLED: bool = True
+    METRICS_TOKEN: str | None = None
+    METRICS_PUBLIC: bool = False
+    METRICS_MAX_STATEMENTS: int = 500
+    SLOW_QUERY_MS: float = 200
+    # 按需剖析：管理员请求携带 ?profile=1 或 X-Profile: 1 时采样调用栈并记录 SQL，
+    # 结果保存在进程内最近 PROFILE_STORE_SIZE 份
+    PROFILING_ENABLED: bool = True
+    PROFILE_SAMPLE_INTERVAL_MS: float = 1
+    PROFILE_STORE_SIZE: int = 50
 
     model_config = {"env_file": ".env", "extra": "ignore"}
 
@@ -1,21 +1,148 @@
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
-from sqlalchemy.orm import DeclarativeBase
+from typing import Any
 
+from sqlalchemy import event, make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.orm import DeclarativeBase, Session
+
+from app.core.cache import TTLCache
 from app.core.config import get_settings
+from app.core.metrics import TimedQueuePool, instrument_engine
 
 settings = get_settings()
 
-engine = create_async_engine(settings.DATABASE_URL, echo=False)
+
+def sqlite_pragmas(read_only: bool) -> list[str]:
+    pragmas = []
+    if settings.SQLITE_PRAGMAS_ENABLED:
+        pragmas += [
+            f"PRAGMA journal_mode={settings.SQLITE_JOURNAL_MODE}",
+            f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}",
+            f"PRAGMA mmap_size={settings.SQLITE_MMAP_SIZE:d}",
+            # 负数表示以 KiB 为单位
+            f"PRAGMA cache_size=-{settings.SQLITE_CACHE_SIZE_KIB:d}",
+            f"PRAGMA busy_timeout={settings.SQLITE_BUSY_TIMEOUT_MS:d}",
+            f"PRAGMA temp_store={settings.SQLITE_TEMP_STORE}",
+        ]
+    if read_only:
+        pragmas.append("PRAGMA query_only=ON")
+    return pragmas
+
+
+def _engine_options(url: str, read_only: bool) -> dict[str, Any]:
+    options: dict[str, Any] = {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+    }
+    if settings.METRICS_ENABLED:
+        # 连接池等待时间按读/写引擎分别记录
+        options["poolclass"] = TimedQueuePool
+        options["pool_logging_name"] = "read" if read_only else "write"
+    backend = make_url(url)
+    if backend.get_backend_name() == "sqlite":
+        if not read_only:
+            options["pool_size"] = settings.SQLITE_WRITE_POOL_SIZE
+            options["max_overflow"] = 0
+        return options
+    options["pool_recycle"] = settings.DB_POOL_RECYCLE
+    options["pool_pre_ping"] = settings.DB_POOL_PRE_PING
+    if backend.get_driver_name() == "asyncpg":
+        connect_args: dict[str, Any] = {
+            # 前者是 SQLAlchemy 适配层的预编译语句缓存，后者是 asyncpg 自身的缓存
+            "prepared_statement_cache_size": settings.ASYNCPG_STATEMENT_CACHE_SIZE,
+            "statement_cache_size": settings.ASYNCPG_STATEMENT_CACHE_SIZE,
+        }
+        if read_only:
+            connect_args["server_settings"] = {"default_transaction_read_only": "on"}
+        options["connect_args"] = connect_args
+    return options
+
+
+def _create_engine(url: str, read_only: bool) -> AsyncEngine:
+    new_engine = create_async_engine(url, echo=False, **_engine_options(url, read_only))
+    pragmas = sqlite_pragmas(read_only) if new_engine.dialect.name == "sqlite" else []
+    if pragmas:
+
+        @event.listens_for(new_engine.sync_engine, "connect")
+        def _apply_pragmas(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            for pragma in pragmas:
+                cursor.execute(pragma)
+            cursor.close()
+
+    instrument_engine(new_engine, "read" if read_only else "write")
+    return new_engine
+
+
+engine = _create_engine(settings.DATABASE_URL, read_only=False)
+if settings.DATABASE_READ_URL:
+    read_engine = _create_engine(settings.DATABASE_READ_URL, read_only=True)
+elif settings.DB_SPLIT_READ_WRITE:
+    # 没有副本时用指向主库的第二个只读引擎代替，读写路径与生产一致
+    read_engine = _create_engine(settings.DATABASE_URL, read_only=True)
+else:
+    read_engine = engine
+
+# 借还后短时间内需要读主库的用户
+recent_writers: TTLCache[int, bool] = TTLCache(
+    settings.READ_YOUR_WRITES_MAX_USERS,
+    settings.READ_YOUR_WRITES_SECONDS,
+    track_stats=False,
+)
+USE_PRIMARY_KEY = "use_primary"
+WROTE_USERS_KEY = "wrote_user_ids"
+
+
+class RoutingSession(Session):
+    """读会话：默认绑定读引擎，标记 use_primary 后改用主库。"""
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if self.info.get(USE_PRIMARY_KEY):
+            return engine.sync_engine
+        return read_engine.sync_engine
+
 
 AsyncSessionLocal = async_sessionmaker(
     engine,
     class_=AsyncSession,
     expire_on_commit=False,
 )
+AsyncReadSessionLocal = async_sessionmaker(
+    class_=AsyncSession,
+    sync_session_class=RoutingSession,
+    expire_on_commit=False,
+)
+
+
+def mark_recent_writer(db: AsyncSession, *user_ids: int) -> None:
+    # 提交后才开始计时，见 _remember_writer
+    db.sync_session.info.setdefault(WROTE_USERS_KEY, set()).update(user_ids)
+
+
+def route_recent_writer(db: AsyncSession, user_id: int) -> None:
+    if read_engine is not engine and recent_writers.get(user_id):
+        db.sync_session.info[USE_PRIMARY_KEY] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _remember_writer(session: Session) -> None:
+    for user_id in session.info.pop(WROTE_USERS_KEY, ()):
+        recent_writers.set(user_id, True)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _forget_writer(session: Session, previous_transaction) -> None:
+    session.info.pop(WROTE_USERS_KEY, None)
 
 
 class Base(DeclarativeBase):
-    pass
+    # 插入/更新时通过 RETURNING 取回服务端生成的值，flush 之后无需再 refresh
+    __mapper_args__ = {"eager_defaults": True}
 
 
 async def get_db():
@@ -26,3 +153,9 @@ async def get_db():
         except Exception:
             await session.rollback()
             raise
+
+
+async def get_read_db():
+    # 只读请求使用读连接池，不与写请求争用写连接
+    async with AsyncReadSessionLocal() as session:
+        yield session
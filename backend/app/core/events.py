@@ -0,0 +1,155 @@
+import asyncio
+import secrets
+from collections import deque
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+from typing import Any
+
+import orjson
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+
+settings = get_settings()
+
+# 写入事务通过 session.info 暂存事件，提交后才发布，回滚则丢弃
+PENDING_KEY = "book_events"
+
+
+@dataclass(frozen=True, slots=True)
+class BookEvent:
+    id: str
+    seq: int
+    # 预先编码好的 SSE 帧，所有订阅者共享同一份字节
+    frame: bytes
+
+
+class EventBroker:
+    """进程内的图书事件扇出。
+
+    每个事件只编码一次，发布时对订阅者逐个 put_nowait，不会因慢消费者阻塞；
+    队列已满的订阅者被断开而不是静默丢事件。最近的事件保存在环形缓冲区中，
+    重连时按 Last-Event-ID 补发。事件 ID 带进程启动时生成的 epoch，
+    连到其他 worker 进程或缓冲区已覆盖时改发 reset，提示客户端重新拉取列表。
+    """
+
+    def __init__(self, queue_size: int, history_size: int, max_subscribers: int):
+        self.queue_size = queue_size
+        self.max_subscribers = max_subscribers
+        self.epoch = secrets.token_hex(4)
+        self._seq = 0
+        self._history: deque[BookEvent] = deque(maxlen=history_size)
+        # 每个 SSE 连接一个有界队列，None 为断开标记
+        self._subscribers: set[asyncio.Queue[BookEvent | None]] = set()
+        self.published = 0
+        self.disconnected_slow = 0
+
+    def publish(self, event_type: str, data: dict[str, Any]) -> BookEvent:
+        self._seq += 1
+        book_event = self._encode(event_type, data, self._seq)
+        self._history.append(book_event)
+        self.published += 1
+        slow = []
+        for queue in self._subscribers:
+            try:
+                queue.put_nowait(book_event)
+            except asyncio.QueueFull:
+                slow.append(queue)
+        for queue in slow:
+            self._drop(queue)
+        return book_event
+
+    def _encode(self, event_type: str, data: dict[str, Any], seq: int) -> BookEvent:
+        event_id = f"{self.epoch}-{seq}"
+        frame = (
+            f"id: {event_id}\nevent: {event_type}\ndata: ".encode()
+            + orjson.dumps(data)
+            + b"\n\n"
+        )
+        return BookEvent(event_id, seq, frame)
+
+    def _drop(self, queue: asyncio.Queue[BookEvent | None]) -> None:
+        # 慢消费者直接断开：清空队列后放入断开标记，客户端重连时按 ID 续传
+        self._subscribers.discard(queue)
+        self.disconnected_slow += 1
+        while not queue.empty():
+            queue.get_nowait()
+        queue.put_nowait(None)
+
+    def full(self) -> bool:
+        return len(self._subscribers) >= self.max_subscribers
+
+    async def stream(
+        self, last_event_id: str | None, keepalive_seconds: float
+    ) -> AsyncIterator[bytes]:
+        """SSE 响应体。订阅在生成器内登记，连接断开时由 finally 注销。"""
+        queue: asyncio.Queue[BookEvent | None] = asyncio.Queue(self.queue_size)
+        self._subscribers.add(queue)
+        try:
+            yield b"retry: 3000\n\n" + b"".join(self._replay(last_event_id))
+            while True:
+                try:
+                    async with asyncio.timeout(keepalive_seconds):
+                        item = await queue.get()
+                except TimeoutError:
+                    # 注释行保持连接活跃，防止代理按空闲超时断开
+                    yield b": keepalive\n\n"
+                    continue
+                frames = []
+                # 一次写出队列中已积压的全部事件，减少小块写入
+                while item is not None:
+                    frames.append(item.frame)
+                    if queue.empty():
+                        break
+                    item = queue.get_nowait()
+                if frames:
+                    yield b"".join(frames)
+                if item is None:
+                    return
+        finally:
+            self._subscribers.discard(queue)
+
+    def _replay(self, last_event_id: str | None) -> list[bytes]:
+        if not last_event_id:
+            return []
+        epoch, _, seq = last_event_id.partition("-")
+        if epoch == self.epoch and seq.isdigit():
+            last_seq = int(seq)
+            oldest = self._history[0].seq if self._history else self._seq + 1
+            # 缓冲区仍覆盖断线期间的全部事件时才能无缝续传
+            if oldest - 1 <= last_seq <= self._seq:
+                return [e.frame for e in self._history if e.seq > last_seq]
+        return [self._encode("reset", {}, self._seq).frame]
+
+    def publish_on_commit(
+        self, db: AsyncSession, event_type: str, data: dict[str, Any]
+    ) -> None:
+        db.sync_session.info.setdefault(PENDING_KEY, []).append((event_type, data))
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "subscribers": len(self._subscribers),
+            "published": self.published,
+            "disconnected_slow": self.disconnected_slow,
+            "history": len(self._history),
+        }
+
+
+book_events = EventBroker(
+    queue_size=settings.EVENTS_QUEUE_SIZE,
+    history_size=settings.EVENTS_HISTORY_SIZE,
+    max_subscribers=settings.EVENTS_MAX_SUBSCRIBERS,
+)
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_after_commit(session: Session) -> None:
+    for event_type, data in session.info.pop(PENDING_KEY, ()):
+        book_events.publish(event_type, data)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_on_rollback(session: Session, previous_transaction) -> None:
+    session.info.pop(PENDING_KEY, None)
@@ -0,0 +1,89 @@
+import asyncio
+import contextlib
+import time
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any
+
+
+class ExecutorSaturatedError(RuntimeError):
+    pass
+
+
+class BoundedExecutor:
+    """固定大小的线程池，等待队列有上限，超出时直接拒绝而不是无限排队。
+
+    计数只在事件循环线程中修改，因此不需要加锁。调用方被取消（客户端断开、超时）时
+    线程里的任务仍会跑完，所以 ``_in_flight`` 在线程池 future 完成时才递减，而不是在
+    调用方的 finally 里。
+    """
+
+    def __init__(self, name: str, max_workers: int, max_queue: int):
+        self.name = name
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._pool: ThreadPoolExecutor | None = None
+        self._in_flight = 0
+        self._completed = 0
+        self._rejected = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    @property
+    def queue_depth(self) -> int:
+        return max(0, self._in_flight - self.max_workers)
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        if self._in_flight >= self.max_workers + self.max_queue:
+            self._rejected += 1
+            raise ExecutorSaturatedError(self.name)
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix=self.name
+            )
+        submitted = time.perf_counter()
+
+        def call() -> tuple[float, Any]:
+            return time.perf_counter() - submitted, fn(*args)
+
+        loop = asyncio.get_running_loop()
+        future = self._pool.submit(call)
+        self._in_flight += 1
+
+        def done(finished: Future[tuple[float, Any]]) -> None:
+            # 事件循环已关闭时（进程退出时 shutdown 取消排队任务）不再记账
+            with contextlib.suppress(RuntimeError):
+                loop.call_soon_threadsafe(self._finish, finished)
+
+        future.add_done_callback(done)
+        _, result = await asyncio.wrap_future(future)
+        return result
+
+    def _finish(self, future: Future[tuple[float, Any]]) -> None:
+        self._in_flight -= 1
+        if future.cancelled() or future.exception() is not None:
+            return
+        waited, _ = future.result()
+        self._completed += 1
+        self._wait_total += waited
+        self._wait_max = max(self._wait_max, waited)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "in_flight": self._in_flight,
+            "queue_depth": self.queue_depth,
+            "completed": self._completed,
+            "rejected": self._rejected,
+            "wait_avg_ms": (
+                self._wait_total / self._completed * 1000 if self._completed else 0.0
+            ),
+            "wait_max_ms": self._wait_max * 1000,
+        }
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
@@ -0,0 +1,327 @@
+import logging
+import re
+import time
+from bisect import bisect_left
+from collections.abc import Callable, Iterable
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.core.config import get_settings
+from app.core.profiling import record_statement
+
+settings = get_settings()
+slow_query_logger = logging.getLogger("app.slow_query")
+
+# 秒；覆盖从缓存命中（亚毫秒）到慢查询/慢请求（秒级）
+LATENCY_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+# 采集时调用的回调：产出 (指标名, 说明, 类型, [(标签, 值), ...])
+Sample = tuple[dict[str, str], float]
+Collector = Callable[[], Iterable[tuple[str, str, str, list[Sample]]]]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values, strict=True)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class Counter:
+    def __init__(self, name: str, help_text: str, label_names: tuple[str, ...]):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, labels: tuple[str, ...], amount: float = 1) -> None:
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        for labels, value in self._values.items():
+            lines.append(
+                f"{self.name}{_labels(self.label_names, labels)} {_format(value)}"
+            )
+        return lines
+
+
+class Histogram:
+    """固定桶直方图。观测时只累加所在桶（O(log 桶数)），输出时再转为累计计数。"""
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        label_names: tuple[str, ...],
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self.buckets = buckets
+        # 每个标签组合：[各桶计数..., +Inf 桶, 总和, 次数]
+        self._series: dict[tuple[str, ...], list[float]] = {}
+
+    def observe(self, labels: tuple[str, ...], value: float) -> None:
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = [0] * (len(self.buckets) + 3)
+        series[bisect_left(self.buckets, value)] += 1
+        series[-2] += value
+        series[-1] += 1
+
+    def render(self) -> list[str]:
+        lines = [
+            f"# HELP {self.name} {self.help_text}",
+            f"# TYPE {self.name} histogram",
+        ]
+        for labels, series in self._series.items():
+            cumulative = 0
+            for bound, count in zip(
+                (*map(repr, self.buckets), "+Inf"), series[:-2], strict=True
+            ):
+                cumulative += count
+                label_str = _labels(self.label_names, labels, f'le="{bound}"')
+                lines.append(f"{self.name}_bucket{label_str} {_format(cumulative)}")
+            label_str = _labels(self.label_names, labels)
+            lines.append(f"{self.name}_sum{label_str} {_format(series[-2])}")
+            lines.append(f"{self.name}_count{label_str} {_format(series[-1])}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: list[Counter | Histogram] = []
+        self._collectors: list[Collector] = []
+
+    def counter(self, name: str, help_text: str, labels: tuple[str, ...]) -> Counter:
+        metric = Counter(name, help_text, labels)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(
+        self, name: str, help_text: str, labels: tuple[str, ...]
+    ) -> Histogram:
+        metric = Histogram(name, help_text, labels)
+        self._metrics.append(metric)
+        return metric
+
+    def register_collector(self, collector: Collector) -> None:
+        self._collectors.append(collector)
+
+    def render(self) -> bytes:
+        lines: list[str] = []
+        for metric in self._metrics:
+            lines += metric.render()
+        for collector in self._collectors:
+            for name, help_text, kind, samples in collector():
+                lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+                for labels, value in samples:
+                    names = tuple(labels)
+                    label_str = _labels(names, tuple(labels[n] for n in names))
+                    lines.append(f"{name}{label_str} {_format(value)}")
+        return ("\n".join(lines) + "\n").encode()
+
+
+registry = MetricsRegistry()
+
+http_requests = registry.counter(
+    "http_requests_total", "HTTP 请求数", ("method", "route", "status")
+)
+http_latency = registry.histogram(
+    "http_request_duration_seconds", "HTTP 请求耗时", ("method", "route")
+)
+db_statement_latency = registry.histogram(
+    "db_statement_duration_seconds", "SQL 语句耗时（按规范化语句）", ("engine", "sql")
+)
+db_slow_statements = registry.counter(
+    "db_slow_statements_total", "超过慢查询阈值的语句数", ("engine",)
+)
+db_checkout_wait = registry.histogram(
+    "db_pool_checkout_wait_seconds", "从连接池取得连接的等待时间", ("engine",)
+)
+
+
+class MetricsMiddleware:
+    """纯 ASGI 中间件：按路由模板记录请求数与耗时，不包装请求/响应对象。"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        status = 500
+        started = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            method = scope["method"]
+            template = route_template(scope)
+            http_latency.observe((method, template), time.perf_counter() - started)
+            http_requests.inc((method, template, str(status)))
+
+
+def route_template(scope) -> str:
+    """路由匹配后 scope 中有路由对象；未匹配的请求合并为一类。
+
+    include_router 的路由只带自身的路径，前缀按模板的段数从实际路径中截取。
+    """
+    route_path = getattr(scope.get("route"), "path", None)
+    if route_path is None:
+        return "unmatched"
+    return scope["path"].rsplit("/", route_path.count("/"))[0] + route_path
+
+
+# 规范化 SQL：IN 列表与多行 VALUES 的长度随参数变化，折叠后避免指标基数膨胀
+_WHITESPACE = re.compile(r"\s+")
+_PLACEHOLDER = r"(?:\?|%s|\$\d+|:\w+)"
+_IN_LIST = re.compile(rf"\(\s*{_PLACEHOLDER}(?:\s*,\s*{_PLACEHOLDER})+\s*\)")
+_VALUES_ROWS = re.compile(r"(\([^()]*\))(?:\s*,\s*\([^()]*\))+")
+# 原始语句 -> 指标标签；IN 列表长度不同的语句对应同一标签，缓存上限相应放宽
+_normalized: dict[str, str] = {}
+_statement_labels: set[str] = set()
+OTHER_STATEMENT = "other"
+
+
+def normalize_sql(statement: str) -> str:
+    label = _normalized.get(statement)
+    if label is not None:
+        return label
+    label = _WHITESPACE.sub(" ", statement).strip()
+    label = _IN_LIST.sub("(?, ...)", label)
+    label = _VALUES_ROWS.sub(r"\1, ...", label)[:300]
+    # 不同语句数超过上限后，新语句归入 other
+    if label not in _statement_labels:
+        if len(_statement_labels) >= settings.METRICS_MAX_STATEMENTS:
+            label = OTHER_STATEMENT
+        else:
+            _statement_labels.add(label)
+    if len(_normalized) < settings.METRICS_MAX_STATEMENTS * 10:
+        _normalized[statement] = label
+    return label
+
+
+_engines: dict[str, AsyncEngine] = {}
+
+
+def instrument_engine(engine: AsyncEngine, role: str) -> None:
+    """为引擎挂载语句计时、慢查询日志与按请求的语句记录；读写引擎按 role 区分。"""
+    record = settings.METRICS_ENABLED
+    slow_seconds = settings.SLOW_QUERY_MS / 1000
+    if role in _engines:
+        return
+    _engines[role] = engine
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _start(conn, cursor, statement, parameters, context, executemany):
+        context._metrics_started = time.perf_counter()
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def _finish(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - context._metrics_started
+        record_statement(role, statement, elapsed)
+        sql = normalize_sql(statement)
+        if record:
+            db_statement_latency.observe((role, sql), elapsed)
+        if slow_seconds and elapsed >= slow_seconds:
+            db_slow_statements.inc((role,))
+            slow_query_logger.warning(
+                "慢查询 %.1f ms [%s]: %s", elapsed * 1000, role, sql
+            )
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """记录取连接的等待时间；引擎角色取自 pool_logging_name。"""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            db_checkout_wait.observe(
+                (self.logging_name or "default",), time.perf_counter() - started
+            )
+
+
+def _pool_samples() -> Iterable[tuple[str, str, str, list[Sample]]]:
+    gauges: dict[str, tuple[str, list[Sample]]] = {
+        "db_pool_size": ("连接池容量", []),
+        "db_pool_checked_out": ("已借出的连接数", []),
+        "db_pool_checked_in": ("池中空闲的连接数", []),
+        "db_pool_overflow": ("超出 pool_size 的溢出连接数", []),
+    }
+    for role, engine in _engines.items():
+        pool = engine.pool
+        labels = {"engine": role}
+        for name, method in (
+            ("db_pool_size", "size"),
+            ("db_pool_checked_out", "checkedout"),
+            ("db_pool_checked_in", "checkedin"),
+            ("db_pool_overflow", "overflow"),
+        ):
+            value = getattr(pool, method, None)
+            if value is not None:
+                # QueuePool.overflow() 在池未满时为负数
+                gauges[name][1].append((labels, max(0, value())))
+    for name, (help_text, samples) in gauges.items():
+        yield name, help_text, "gauge", samples
+
+
+registry.register_collector(_pool_samples)
+
+
+def stats_collector(
+    prefix: str, help_text: str, stats: Callable[[], dict[str, Any]]
+) -> Collector:
+    """把各组件 stats() 返回的数值字段导出为 gauge，嵌套 dict 展开为 part 标签。"""
+
+    def collect():
+        data = stats()
+        flat: dict[str, list[Sample]] = {}
+        nested = all(isinstance(v, dict) for v in data.values())
+        for part, values in data.items() if nested else [("", data)]:
+            for key, value in values.items():
+                if isinstance(value, bool) or not isinstance(value, int | float):
+                    continue
+                labels = {"part": part} if part else {}
+                flat.setdefault(key, []).append((labels, value))
+        for key, samples in flat.items():
+            yield f"{prefix}_{key}", f"{help_text} {key}", "gauge", samples
+
+    return collect
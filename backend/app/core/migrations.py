@@ -0,0 +1,43 @@
+from pathlib import Path
+
+from sqlalchemy import Connection, inspect, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+MIGRATIONS_DIR = Path(__file__).resolve().parent.parent / "migrations"
+# 引入迁移前由 create_all 建立的库，对应的基线版本
+BASELINE_REVISION = "0001"
+
+
+def latest_revision() -> str:
+    # 迁移文件按 "<版本号>_<说明>.py" 命名、版本号递增，最大的前缀即最新版本
+    return max(
+        path.name.split("_", 1)[0]
+        for path in (MIGRATIONS_DIR / "versions").glob("[0-9]*_*.py")
+    )
+
+
+def _current_revision(connection: Connection) -> str | None:
+    if not inspect(connection).has_table("alembic_version"):
+        return None
+    return connection.execute(text("SELECT version_num FROM alembic_version")).scalar()
+
+
+def _upgrade(connection: Connection) -> None:
+    # 已是最新版本时直接返回，启动时不必导入 alembic 和加载迁移脚本
+    if _current_revision(connection) == latest_revision():
+        return
+    from alembic import command
+    from alembic.config import Config
+
+    config = Config()
+    config.set_main_option("script_location", str(MIGRATIONS_DIR))
+    config.attributes["connection"] = connection
+    inspector = inspect(connection)
+    if inspector.has_table("books") and not inspector.has_table("alembic_version"):
+        command.stamp(config, BASELINE_REVISION)
+    command.upgrade(config, "head")
+
+
+async def run_migrations(engine: AsyncEngine) -> None:
+    async with engine.begin() as conn:
+        await conn.run_sync(_upgrade)
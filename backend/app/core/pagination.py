@@ -0,0 +1,82 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import DateTime, Select, tuple_
+from sqlalchemy.orm import InstrumentedAttribute
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+class InvalidCursorError(ValueError):
+    pass
+
+
+class Page[T]:
+    __slots__ = ("items", "next_cursor")
+
+    def __init__(self, items: list[T], next_cursor: str | None):
+        self.items = items
+        self.next_cursor = next_cursor
+
+
+def encode_cursor(
+    sort_value: datetime | str, row_id: int, sort_key: str | None = None
+) -> str:
+    # 非默认排序的游标带上排序方式，换了排序再用旧游标时报错而不是返回错乱的页
+    if isinstance(sort_value, datetime):
+        sort_value = sort_value.isoformat()
+    payload = (
+        [sort_value, row_id] if sort_key is None else [sort_value, row_id, sort_key]
+    )
+    raw = json.dumps(payload, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(
+    cursor: str, sort_key: str | None = None, parse: Any = datetime.fromisoformat
+) -> tuple[Any, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort_value, row_id, *tag = json.loads(base64.urlsafe_b64decode(padded))
+        if (tag[0] if tag else None) != sort_key or len(tag) > 1:
+            raise ValueError("cursor sort mismatch")
+        return parse(sort_value), int(row_id)
+    except (ValueError, TypeError) as e:
+        raise InvalidCursorError(cursor) from e
+
+
+def keyset_page(
+    stmt: Select,
+    sort_column: InstrumentedAttribute,
+    id_column: InstrumentedAttribute,
+    limit: int,
+    cursor: str | None = None,
+    descending: bool = True,
+    sort_key: str | None = None,
+) -> Select:
+    if cursor is not None:
+        parse = (
+            datetime.fromisoformat if isinstance(sort_column.type, DateTime) else str
+        )
+        sort_value, row_id = decode_cursor(cursor, sort_key, parse)
+        key, after = tuple_(sort_column, id_column), tuple_(sort_value, row_id)
+        stmt = stmt.where(key < after if descending else key > after)
+    if descending:
+        stmt = stmt.order_by(sort_column.desc(), id_column.desc())
+    else:
+        stmt = stmt.order_by(sort_column, id_column)
+    # 多取一行用于判断是否存在下一页，避免额外的 COUNT 查询
+    return stmt.limit(limit + 1)
+
+
+def build_page(
+    rows: list[Any], limit: int, sort_attr: str, sort_key: str | None = None
+) -> Page:
+    if len(rows) <= limit:
+        return Page(rows, None)
+    rows = rows[:limit]
+    last = rows[-1]
+    return Page(rows, encode_cursor(getattr(last, sort_attr), last.id, sort_key))
@@ -0,0 +1,148 @@
+import hashlib
+import time
+from dataclasses import dataclass
+from datetime import datetime
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.cache import TTLCache
+from app.core.config import get_settings
+from app.models.user import User
+
+settings = get_settings()
+
+# 修改了角色或密码的用户 id、被吊销的会话记在 session.info 中，提交后再生效
+STALE_USERS_KEY = "principal_stale_users"
+REVOKED_SESSIONS_KEY = "principal_revoked_sessions"
+
+
+@dataclass(frozen=True, slots=True)
+class Principal:
+    id: int
+    username: str
+    role: str
+    created_at: datetime
+    # 密码哈希的摘要，写入访问令牌；修改密码后此前签发的令牌不再匹配
+    password_marker: str
+
+    @classmethod
+    def from_user(cls, user: User) -> "Principal":
+        return cls(
+            id=user.id,
+            username=user.username,
+            role=user.role,
+            created_at=user.created_at,
+            password_marker=password_marker(user.hashed_password),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class TokenClaims:
+    user_id: int
+    expires_at: float
+    # 签发该访问令牌的登录会话（刷新令牌的 family_id）
+    session_id: str | None = None
+    # 签发时的密码标记，与当前用户的标记不一致说明其后修改过密码
+    password_marker: str | None = None
+
+
+def password_marker(hashed_password: str) -> str:
+    return hashlib.sha256(hashed_password.encode("utf-8")).hexdigest()[:16]
+
+
+class PrincipalCache:
+    """缓存已解码的 JWT 与用户身份，命中时认证无需解码和查库。
+
+    缓存仅在当前进程内有效；角色或密码变更时由 UserService 在事务提交后失效，
+    其他 worker 进程最多在 TTL 内看到旧值。
+
+    已吊销的会话记录在有界的 revoked_sessions 中，不受 enabled 开关影响；
+    条目保留一个访问令牌有效期，之后该会话签发的访问令牌已全部过期。
+    """
+
+    def __init__(
+        self, enabled: bool, max_entries: int, ttl_seconds: float, stats: bool
+    ):
+        self.enabled = enabled
+        self.tokens: TTLCache[str, TokenClaims] = TTLCache(
+            max_entries, ttl_seconds, stats
+        )
+        self.principals: TTLCache[int, Principal] = TTLCache(
+            max_entries, ttl_seconds, stats
+        )
+        self.revoked_sessions: TTLCache[str, bool] = TTLCache(
+            settings.REVOKED_SESSIONS_MAX_ENTRIES,
+            settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+            track_stats=False,
+        )
+
+    def get_token(self, token: str) -> TokenClaims | None:
+        if not self.enabled:
+            return None
+        claims = self.tokens.get(token)
+        if claims is not None and claims.expires_at <= time.time():
+            self.tokens.pop(token)
+            return None
+        return claims
+
+    def set_token(self, token: str, claims: TokenClaims) -> None:
+        if self.enabled:
+            self.tokens.set(token, claims, claims.expires_at - time.time())
+
+    def get_principal(self, user_id: int) -> Principal | None:
+        if not self.enabled:
+            return None
+        return self.principals.get(user_id)
+
+    def set_principal(self, principal: Principal) -> None:
+        if self.enabled:
+            self.principals.set(principal.id, principal)
+
+    def invalidate_user(self, user_id: int) -> None:
+        self.principals.pop(user_id)
+
+    def invalidate_on_commit(self, db: AsyncSession, user_id: int) -> None:
+        # 提交前失效会让并发请求把旧行重新载入缓存，持续整个 TTL
+        db.sync_session.info.setdefault(STALE_USERS_KEY, set()).add(user_id)
+
+    def revoke_session(self, session_id: str) -> None:
+        self.revoked_sessions.set(session_id, True)
+
+    def revoke_sessions_on_commit(
+        self, db: AsyncSession, session_ids: set[str]
+    ) -> None:
+        db.sync_session.info.setdefault(REVOKED_SESSIONS_KEY, set()).update(session_ids)
+
+    def is_revoked(self, session_id: str) -> bool:
+        return self.revoked_sessions.get(session_id) is not None
+
+    def stats(self) -> dict[str, dict]:
+        return {
+            "tokens": self.tokens.stats(),
+            "principals": self.principals.stats(),
+            "revoked_sessions": self.revoked_sessions.stats(),
+        }
+
+
+principal_cache = PrincipalCache(
+    enabled=settings.AUTH_CACHE_ENABLED,
+    max_entries=settings.AUTH_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.AUTH_CACHE_TTL_SECONDS,
+    stats=settings.AUTH_CACHE_STATS,
+)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session: Session) -> None:
+    for user_id in session.info.pop(STALE_USERS_KEY, ()):
+        principal_cache.invalidate_user(user_id)
+    for session_id in session.info.pop(REVOKED_SESSIONS_KEY, ()):
+        principal_cache.revoke_session(session_id)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_on_rollback(session: Session, previous_transaction) -> None:
+    session.info.pop(STALE_USERS_KEY, None)
+    session.info.pop(REVOKED_SESSIONS_KEY, None)
@@ -0,0 +1,193 @@
+import asyncio
+import re
+import sys
+import threading
+import time
+from collections import Counter, OrderedDict
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import datetime
+
+from app.core.config import get_settings
+
+settings = get_settings()
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+@dataclass(frozen=True, slots=True)
+class ExecutedStatement:
+    engine: str
+    sql: str
+    duration_ms: float
+
+
+# 当前请求/检查范围内执行的语句；由 metrics 的 after_cursor_execute 钩子追加
+_statements: ContextVar[list[ExecutedStatement] | None] = ContextVar(
+    "executed_statements", default=None
+)
+
+
+def record_statement(engine: str, statement: str, seconds: float) -> None:
+    captured = _statements.get()
+    if captured is not None:
+        sql = _WHITESPACE.sub(" ", statement).strip()
+        captured.append(ExecutedStatement(engine, sql, seconds * 1000))
+
+
+@contextmanager
+def capture_statements() -> Iterator[list[ExecutedStatement]]:
+    """收集代码块内（含其派生的任务）执行的 SQL 语句，语句中不含参数值。"""
+    captured: list[ExecutedStatement] = []
+    token = _statements.set(captured)
+    try:
+        yield captured
+    finally:
+        _statements.reset(token)
+
+
+class QueryBudgetExceeded(AssertionError):
+    def __init__(self, label: str, budget: int, statements: list[ExecutedStatement]):
+        self.budget = budget
+        self.statements = statements
+        listing = "\n".join(f"  {s.sql}" for s in statements)
+        super().__init__(
+            f"{label} 执行了 {len(statements)} 条语句，超出预算 {budget}：\n{listing}"
+        )
+
+
+@contextmanager
+def query_budget(
+    max_statements: int, label: str = "代码块"
+) -> Iterator[list[ExecutedStatement]]:
+    """断言代码块执行的语句数不超过 max_statements，用于发现 N+1 查询。"""
+    with capture_statements() as captured:
+        yield captured
+    if len(captured) > max_statements:
+        raise QueryBudgetExceeded(label, max_statements, captured)
+
+
+def _frame_label(frame) -> str:
+    return f"{frame.f_globals.get('__name__', '?')}.{frame.f_code.co_qualname}"
+
+
+def _await_stack(awaitable) -> list[str]:
+    """沿 cr_await 链展开挂起协程的逻辑调用栈，叶子为正在等待的对象。"""
+    stack = []
+    while awaitable is not None:
+        frame = getattr(awaitable, "cr_frame", None) or getattr(
+            awaitable, "ag_frame", None
+        )
+        if frame is None:
+            stack.append(f"<await {type(awaitable).__name__}>")
+            break
+        stack.append(_frame_label(frame))
+        awaitable = getattr(awaitable, "cr_await", None) or getattr(
+            awaitable, "ag_await", None
+        )
+    return stack
+
+
+class SamplingProfiler:
+    """在后台线程中按固定间隔采样请求所在任务的调用栈。
+
+    任务正在执行时取事件循环线程的栈；任务挂起（等待数据库、线程池等）时
+    沿协程的 await 链取逻辑栈，等待时间因此计入发起等待的函数。
+    结果为折叠栈（"根;...;叶 次数"），可直接用于 flamegraph.pl / speedscope。
+    """
+
+    def __init__(self, interval_seconds: float, task: asyncio.Task):
+        self.interval = interval_seconds
+        self.samples: Counter[str] = Counter()
+        self._coro = task.get_coro()
+        self._target = threading.get_ident()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="request-profiler", daemon=True
+        )
+
+    def _sample(self) -> list[str]:
+        coro = self._coro
+        if not coro.cr_running:
+            return _await_stack(coro)
+        frames = []
+        frame = sys._current_frames().get(self._target)
+        while frame is not None:
+            frames.append(frame)
+            if frame is coro.cr_frame:
+                break
+            frame = frame.f_back
+        return [_frame_label(f) for f in reversed(frames)]
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            stack = self._sample()
+            if stack:
+                self.samples[";".join(stack)] += 1
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> Counter[str]:
+        self._stop.set()
+        self._thread.join()
+        return self.samples
+
+
+@dataclass(slots=True)
+class Profile:
+    id: str
+    method: str
+    path: str
+    started_at: datetime
+    status: int = 0
+    duration_ms: float = 0.0
+    sample_interval_ms: float = 0.0
+    samples: Counter[str] = field(default_factory=Counter)
+    statements: list[ExecutedStatement] = field(default_factory=list)
+
+    def folded(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.samples.items())
+
+
+class ProfileStore:
+    """进程内保存最近的若干份请求剖析结果，超出上限时淘汰最旧的。"""
+
+    def __init__(self, max_profiles: int):
+        self.max_profiles = max_profiles
+        self._profiles: OrderedDict[str, Profile] = OrderedDict()
+
+    def add(self, profile: Profile) -> None:
+        self._profiles[profile.id] = profile
+        while len(self._profiles) > self.max_profiles:
+            self._profiles.popitem(last=False)
+
+    def get(self, profile_id: str) -> Profile | None:
+        return self._profiles.get(profile_id)
+
+    def list(self) -> list[Profile]:
+        return list(reversed(self._profiles.values()))
+
+
+profile_store = ProfileStore(settings.PROFILE_STORE_SIZE)
+
+
+@contextmanager
+def profile_request(profile: Profile) -> Iterator[Profile]:
+    """采样调用栈并记录语句，结束后写入 profile_store。"""
+    profiler = SamplingProfiler(
+        settings.PROFILE_SAMPLE_INTERVAL_MS / 1000, asyncio.current_task()
+    )
+    profile.sample_interval_ms = settings.PROFILE_SAMPLE_INTERVAL_MS
+    started = time.perf_counter()
+    profiler.start()
+    try:
+        with capture_statements() as captured:
+            yield profile
+    finally:
+        profile.samples = profiler.stop()
+        profile.duration_ms = (time.perf_counter() - started) * 1000
+        profile.statements = captured
+        profile_store.add(profile)
@@ -1,14 +1,32 @@
+import asyncio
+import hashlib
+import os
+import secrets
 from datetime import datetime, timedelta
+from typing import TYPE_CHECKING
 
 import bcrypt
 from jose import jwt
 
 from app.core.config import get_settings
+from app.core.executor import BoundedExecutor
+
+if TYPE_CHECKING:
+    from concurrent.futures import ProcessPoolExecutor
 
 settings = get_settings()
 
 ALGORITHM = "HS256"
 
+password_executor = BoundedExecutor(
+    "password-hash",
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_queue=settings.PASSWORD_HASH_QUEUE_SIZE,
+)
+# 批量开户专用的进程池，首次使用时创建；与登录校验的线程池分开，
+# 导入占满 CPU 时登录请求仍有自己的工作线程
+_bulk_hash_pool: "ProcessPoolExecutor | None" = None
+
 
 def create_access_token(data: dict, expires_delta: timedelta | None = None) -> str:
     to_encode = data.copy()
@@ -19,6 +37,15 @@ def create_access_token(data: dict, expires_delta: timedelta | None = None) -> s
     return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=ALGORITHM)
 
 
+def new_refresh_token() -> str:
+    return secrets.token_urlsafe(32)
+
+
+def hash_refresh_token(token: str) -> str:
+    # 令牌本身是高熵随机串，单次 SHA-256 即可，不需要 bcrypt
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return bcrypt.checkpw(
         plain_password.encode("utf-8"), hashed_password.encode("utf-8")
@@ -27,3 +54,44 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 
 def get_password_hash(password: str) -> str:
     return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await password_executor.run(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    return await password_executor.run(get_password_hash, password)
+
+
+def bulk_hash_workers() -> int:
+    return settings.BULK_HASH_PROCESSES or os.cpu_count() or 1
+
+
+async def hash_passwords_parallel(passwords: list[str]) -> list[str]:
+    """在进程池中并行计算一批密码哈希，结果与输入顺序一致。"""
+    global _bulk_hash_pool
+    if _bulk_hash_pool is None:
+        # 只有批量开户用到进程池，按需导入，不拖慢启动
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+
+        # forkserver：服务进程已有线程池与后台线程，直接 fork 不安全
+        _bulk_hash_pool = ProcessPoolExecutor(
+            max_workers=bulk_hash_workers(),
+            mp_context=multiprocessing.get_context("forkserver"),
+        )
+    loop = asyncio.get_running_loop()
+    return await asyncio.gather(
+        *(
+            loop.run_in_executor(_bulk_hash_pool, get_password_hash, password)
+            for password in passwords
+        )
+    )
+
+
+def shutdown_bulk_hash_pool() -> None:
+    global _bulk_hash_pool
+    if _bulk_hash_pool is not None:
+        _bulk_hash_pool.shutdown(wait=False, cancel_futures=True)
+        _bulk_hash_pool = None
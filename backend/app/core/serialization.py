@@ -0,0 +1,96 @@
+from collections.abc import Iterable
+from operator import attrgetter
+from typing import Any
+
+import orjson
+from fastapi import HTTPException
+from fastapi.responses import Response
+from pydantic import BaseModel
+
+from app.core.pagination import Page
+
+
+class ORJSONResponse(Response):
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content)
+
+
+def dumps(content: Any) -> bytes:
+    return orjson.dumps(content)
+
+
+class ModelSerializer:
+    """按响应模型的字段直接读取 ORM 属性生成 dict，跳过 pydantic 的逐行校验。
+
+    只用于仓储层返回的可信 ORM 对象；字段顺序与响应模型一致，
+    嵌套对象交给对应的子序列化器。
+    """
+
+    def __init__(
+        self,
+        model: type[BaseModel],
+        nested: dict[str, "ModelSerializer"] | None = None,
+    ):
+        self.model = model
+        self.field_names = tuple(model.model_fields)
+        self.nested = nested or {}
+        self._plans: dict[tuple[str, ...], tuple[Any, tuple[str, ...]]] = {}
+
+    def parse_fields(self, fields: str | None) -> tuple[str, ...]:
+        """把 ``?fields=id,title`` 解析为按模型顺序排列的字段元组。"""
+        if not fields:
+            return self.field_names
+        requested = {f.strip() for f in fields.split(",") if f.strip()}
+        unknown = requested.difference(self.field_names)
+        if unknown:
+            raise HTTPException(
+                status_code=400,
+                detail=f"未知字段: {', '.join(sorted(unknown))}",
+            )
+        return tuple(f for f in self.field_names if f in requested)
+
+    def relations(self, fields: tuple[str, ...]) -> tuple[str, ...]:
+        """所选字段中需要加载的嵌套对象。"""
+        return tuple(f for f in fields if f in self.nested)
+
+    def _plan(self, fields: tuple[str, ...]) -> tuple[Any, tuple[str, ...]]:
+        plan = self._plans.get(fields)
+        if plan is None:
+            getter = attrgetter(*fields)
+            if len(fields) == 1:
+                single = getter
+
+                def getter(obj):
+                    return (single(obj),)
+
+            nested = self.relations(fields)
+            plan = self._plans[fields] = (getter, nested)
+        return plan
+
+    def dump(self, obj: Any, fields: tuple[str, ...] | None = None) -> dict:
+        return self.dump_many((obj,), fields)[0]
+
+    def dump_many(
+        self, objs: Iterable[Any], fields: tuple[str, ...] | None = None
+    ) -> list[dict]:
+        fields = fields or self.field_names
+        getter, nested = self._plan(fields)
+        rows = [dict(zip(fields, getter(obj), strict=True)) for obj in objs]
+        for name in nested:
+            # 同一页里的关联对象常常重复（如同一用户），按对象身份只序列化一次
+            unique = {id(row[name]): row[name] for row in rows if row[name] is not None}
+            dumped = dict(
+                zip(unique, self.nested[name].dump_many(unique.values()), strict=True)
+            )
+            for row in rows:
+                if row[name] is not None:
+                    row[name] = dumped[id(row[name])]
+        return rows
+
+    def dump_page(self, page: Page, fields: tuple[str, ...] | None = None) -> dict:
+        return {
+            "items": self.dump_many(page.items, fields),
+            "next_cursor": page.next_cursor,
+        }
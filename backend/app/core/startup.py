@@ -0,0 +1,54 @@
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from pathlib import Path
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+# PostgreSQL 会话级咨询锁的键，仅用于启动阶段
+ADVISORY_LOCK_KEY = 0x4C696272
+
+
+@asynccontextmanager
+async def startup_lock(engine: AsyncEngine) -> AsyncIterator[None]:
+    """多个 worker 同时启动时串行执行迁移与初始化。
+
+    先拿到锁的 worker 完成初始化，其余 worker 随后只做一次廉价的检查。
+    SQLite 使用数据库文件旁的文件锁，PostgreSQL 使用咨询锁；
+    无法加锁时（内存库、不支持 fcntl 的平台）直接执行，初始化本身是幂等的。
+    """
+    if engine.dialect.name == "postgresql":
+        async with engine.connect() as conn:
+            await conn.execute(
+                text("SELECT pg_advisory_lock(:key)"), {"key": ADVISORY_LOCK_KEY}
+            )
+            await conn.commit()
+            try:
+                yield
+            finally:
+                await conn.execute(
+                    text("SELECT pg_advisory_unlock(:key)"), {"key": ADVISORY_LOCK_KEY}
+                )
+                await conn.commit()
+        return
+    database = engine.url.database
+    if (
+        engine.dialect.name != "sqlite"
+        or fcntl is None
+        or not database
+        or database == ":memory:"
+    ):
+        yield
+        return
+    with Path(f"{database}.startup-lock").open("a") as lock_file:
+        await asyncio.to_thread(fcntl.flock, lock_file.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
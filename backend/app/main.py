@@ -1,30 +1,55 @@
-from contextlib import asynccontextmanager
+import asyncio
+from contextlib import asynccontextmanager, suppress
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 
+from app.api import metrics
+from app.api.profiling import ProfilingMiddleware
 from app.api.v1.router import api_router
 from app.core.config import get_settings
-from app.core.database import AsyncSessionLocal, Base, engine
+from app.core.database import AsyncSessionLocal, engine, read_engine
+from app.core.executor import ExecutorSaturatedError
+from app.core.metrics import MetricsMiddleware
+from app.core.migrations import run_migrations
+from app.core.pagination import InvalidCursorError
+from app.core.security import password_executor, shutdown_bulk_hash_pool
+from app.core.startup import startup_lock
 from app.models import Book, BorrowRecord, User  # noqa: F401 - register models
 from app.services.auth_service import auth_service
+from app.services.overdue_service import overdue_service
 
 settings = get_settings()
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Startup: create tables and initial admin
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
-    async with AsyncSessionLocal() as session:
-        await auth_service.create_initial_admin(
-            session, settings.ADMIN_USERNAME, settings.ADMIN_PASSWORD
+    # Startup: migrate schema and create initial admin
+    # 多个 worker 依次进入；后进入的 worker 只检查版本号与管理员指纹
+    async with startup_lock(engine):
+        await run_migrations(engine)
+        async with AsyncSessionLocal() as session:
+            await auth_service.create_initial_admin(
+                session, settings.ADMIN_USERNAME, settings.ADMIN_PASSWORD
+            )
+            await session.commit()
+    sweeper = None
+    if settings.OVERDUE_SWEEP_INTERVAL_SECONDS > 0:
+        sweeper = asyncio.create_task(
+            overdue_service.run_periodically(settings.OVERDUE_SWEEP_INTERVAL_SECONDS)
         )
-        await session.commit()
     yield
     # Shutdown
+    if sweeper is not None:
+        sweeper.cancel()
+        with suppress(asyncio.CancelledError):
+            await sweeper
+    password_executor.shutdown()
+    shutdown_bulk_hash_pool()
     await engine.dispose()
+    if read_engine is not engine:
+        await read_engine.dispose()
 
 
 app = FastAPI(
@@ -40,5 +65,27 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+if settings.PROFILING_ENABLED:
+    app.add_middleware(ProfilingMiddleware)
+if settings.METRICS_ENABLED:
+    # 最后添加的中间件在最外层，耗时包含 CORS 与剖析处理
+    app.add_middleware(MetricsMiddleware)
+
+
+@app.exception_handler(InvalidCursorError)
+async def invalid_cursor_handler(request: Request, exc: InvalidCursorError):
+    return JSONResponse(status_code=400, content={"detail": "无效的分页游标"})
+
+
+@app.exception_handler(ExecutorSaturatedError)
+async def executor_saturated_handler(request: Request, exc: ExecutorSaturatedError):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "服务繁忙，请稍后重试"},
+        headers={"Retry-After": "1"},
+    )
+
 
 app.include_router(api_router, prefix="/api/v1")
+if settings.METRICS_ENABLED:
+    app.include_router(metrics.router)
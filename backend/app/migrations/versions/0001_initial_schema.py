@@ -0,0 +1,53 @@
+"""initial schema
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0001"
+down_revision: str | None = None
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "users",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("username", sa.String(50), nullable=False, unique=True),
+        sa.Column("hashed_password", sa.String(128), nullable=False),
+        sa.Column("role", sa.String(10), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+    )
+    op.create_table(
+        "books",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("book_no", sa.String(50), nullable=False, unique=True),
+        sa.Column("title", sa.String(200), nullable=False),
+        sa.Column("author", sa.String(100), nullable=False),
+        sa.Column("isbn", sa.String(20), nullable=True),
+        sa.Column("publisher", sa.String(100), nullable=True),
+        sa.Column("status", sa.String(10), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+    )
+    op.create_table(
+        "borrow_records",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("book_id", sa.Integer(), sa.ForeignKey("books.id"), nullable=False),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("borrow_time", sa.DateTime(), nullable=False),
+        sa.Column("return_time", sa.DateTime(), nullable=True),
+        sa.Column("note", sa.Text(), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("borrow_records")
+    op.drop_table("books")
+    op.drop_table("users")
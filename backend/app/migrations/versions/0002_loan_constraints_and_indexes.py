@@ -0,0 +1,60 @@
+"""active-loan constraints and secondary indexes
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0002"
+down_revision: str | None = "0001"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+ACTIVE_LOAN = sa.text("return_time IS NULL")
+
+
+def upgrade() -> None:
+    # 部分唯一索引可能已由旧版启动流程创建，因此使用 if_not_exists
+    for name, column in (
+        ("uq_borrow_records_active_book", "book_id"),
+        ("uq_borrow_records_active_user", "user_id"),
+    ):
+        op.create_index(
+            name,
+            "borrow_records",
+            [column],
+            unique=True,
+            sqlite_where=ACTIVE_LOAN,
+            postgresql_where=ACTIVE_LOAN,
+            if_not_exists=True,
+        )
+    op.create_index(
+        "ix_borrow_records_user_borrow_time",
+        "borrow_records",
+        ["user_id", "borrow_time", "id"],
+    )
+    op.create_index(
+        "ix_borrow_records_book_borrow_time",
+        "borrow_records",
+        ["book_id", "borrow_time", "id"],
+    )
+    op.create_index(
+        "ix_borrow_records_borrow_time", "borrow_records", ["borrow_time", "id"]
+    )
+    op.create_index("ix_books_created_at", "books", ["created_at", "id"])
+    op.create_index("ix_users_created_at", "users", ["created_at", "id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_users_created_at", "users")
+    op.drop_index("ix_books_created_at", "books")
+    op.drop_index("ix_borrow_records_borrow_time", "borrow_records")
+    op.drop_index("ix_borrow_records_book_borrow_time", "borrow_records")
+    op.drop_index("ix_borrow_records_user_borrow_time", "borrow_records")
+    op.drop_index("uq_borrow_records_active_user", "borrow_records")
+    op.drop_index("uq_borrow_records_active_book", "borrow_records")
@@ -0,0 +1,40 @@
+"""books full-text index (SQLite FTS5)
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+revision: str = "0003"
+down_revision: str | None = "0002"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+COLUMNS = "title, author, isbn, publisher, book_no"
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "sqlite":
+        return
+    # 旧版启动流程可能已建立并回填了该表
+    exists = bind.exec_driver_sql(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'books_fts'"
+    ).scalar()
+    if exists:
+        return
+    op.execute(
+        f"CREATE VIRTUAL TABLE books_fts USING fts5({COLUMNS}, tokenize='trigram')"
+    )
+    op.execute(
+        f"INSERT INTO books_fts (rowid, {COLUMNS}) SELECT id, {COLUMNS} FROM books"
+    )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "sqlite":
+        op.execute("DROP TABLE IF EXISTS books_fts")
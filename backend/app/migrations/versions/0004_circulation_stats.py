@@ -0,0 +1,89 @@
+"""circulation statistics summary tables
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0004"
+down_revision: str | None = "0003"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "loan_stats_daily",
+        sa.Column("day", sa.Date(), primary_key=True),
+        sa.Column("loans", sa.Integer(), nullable=False),
+        sa.Column("returns", sa.Integer(), nullable=False),
+    )
+    op.create_table(
+        "book_loan_totals",
+        sa.Column("book_id", sa.Integer(), sa.ForeignKey("books.id"), primary_key=True),
+        sa.Column("loans", sa.Integer(), nullable=False),
+    )
+    op.create_index(
+        "ix_book_loan_totals_loans", "book_loan_totals", ["loans", "book_id"]
+    )
+    op.create_table(
+        "user_loan_totals",
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), primary_key=True),
+        sa.Column("loans", sa.Integer(), nullable=False),
+    )
+    op.create_index(
+        "ix_user_loan_totals_loans", "user_loan_totals", ["loans", "user_id"]
+    )
+    op.create_table(
+        "circulation_counters",
+        sa.Column("name", sa.String(50), primary_key=True),
+        sa.Column("value", sa.Integer(), nullable=False),
+    )
+    _backfill()
+
+
+def _backfill() -> None:
+    # 与 StatsRepository.rebuild 的口径一致；此后由借还操作增量维护
+    if op.get_bind().dialect.name == "sqlite":
+        loan_day, return_day = "date(borrow_time)", "date(return_time)"
+    else:
+        loan_day, return_day = "CAST(borrow_time AS DATE)", "CAST(return_time AS DATE)"
+    op.execute(
+        f"INSERT INTO loan_stats_daily (day, loans, returns) "
+        f"SELECT {loan_day}, count(*), 0 FROM borrow_records "
+        f"WHERE borrow_time IS NOT NULL GROUP BY {loan_day}"
+    )
+    # SQLite 要求 INSERT ... SELECT ... ON CONFLICT 的 SELECT 带 WHERE 子句
+    op.execute(
+        f"INSERT INTO loan_stats_daily (day, loans, returns) "
+        f"SELECT {return_day}, 0, count(*) FROM borrow_records "
+        f"WHERE return_time IS NOT NULL GROUP BY {return_day} "
+        f"ON CONFLICT (day) DO UPDATE SET returns = excluded.returns"
+    )
+    for table, column in (
+        ("book_loan_totals", "book_id"),
+        ("user_loan_totals", "user_id"),
+    ):
+        op.execute(
+            f"INSERT INTO {table} ({column}, loans) "
+            f"SELECT {column}, count(*) FROM borrow_records GROUP BY {column}"
+        )
+    op.execute(
+        "INSERT INTO circulation_counters (name, value) "
+        "SELECT 'currently_borrowed', count(*) FROM borrow_records "
+        "WHERE return_time IS NULL"
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("circulation_counters")
+    op.drop_index("ix_user_loan_totals_loans", "user_loan_totals")
+    op.drop_table("user_loan_totals")
+    op.drop_index("ix_book_loan_totals_loans", "book_loan_totals")
+    op.drop_table("book_loan_totals")
+    op.drop_table("loan_stats_daily")
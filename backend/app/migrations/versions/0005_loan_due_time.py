@@ -0,0 +1,49 @@
+"""loan due time and overdue flag
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+from app.core.config import get_settings
+
+revision: str = "0005"
+down_revision: str | None = "0004"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+ACTIVE_LOAN = sa.text("return_time IS NULL")
+
+
+def upgrade() -> None:
+    op.add_column("borrow_records", sa.Column("due_time", sa.DateTime(), nullable=True))
+    op.add_column(
+        "borrow_records",
+        sa.Column("overdue", sa.Boolean(), server_default=sa.false(), nullable=False),
+    )
+    # 历史记录按当前借阅期限补齐应还时间，逾期标记由启动后的首次扫描完成
+    days = get_settings().LOAN_PERIOD_DAYS
+    if op.get_bind().dialect.name == "sqlite":
+        due = f"datetime(borrow_time, '+{days} days')"
+    else:
+        due = f"borrow_time + interval '{days} days'"
+    op.execute(f"UPDATE borrow_records SET due_time = {due}")
+    op.create_index(
+        "ix_borrow_records_open_due_time",
+        "borrow_records",
+        ["due_time", "id"],
+        sqlite_where=ACTIVE_LOAN,
+        postgresql_where=ACTIVE_LOAN,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_borrow_records_open_due_time", "borrow_records")
+    with op.batch_alter_table("borrow_records") as batch_op:
+        batch_op.drop_column("overdue")
+        batch_op.drop_column("due_time")
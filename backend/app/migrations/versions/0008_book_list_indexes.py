@@ -0,0 +1,33 @@
+"""book list filter and sort indexes
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+revision: str = "0008"
+down_revision: str | None = "0007"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+INDEXES = {
+    "ix_books_title": ["title", "id"],
+    "ix_books_author": ["author", "id"],
+    "ix_books_publisher": ["publisher", "id"],
+    "ix_books_isbn": ["isbn"],
+    "ix_books_status_created_at": ["status", "created_at", "id"],
+}
+
+
+def upgrade() -> None:
+    for name, columns in INDEXES.items():
+        op.create_index(name, "books", columns)
+
+
+def downgrade() -> None:
+    for name in INDEXES:
+        op.drop_index(name, "books")
@@ -0,0 +1,30 @@
+"""drop application markers
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-18
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0009"
+down_revision: str | None = "0008"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    # 表中保存的是管理员凭证的 HMAC 指纹，删除表以免库泄露后被离线爆破
+    op.drop_table("app_markers")
+
+
+def downgrade() -> None:
+    op.create_table(
+        "app_markers",
+        sa.Column("name", sa.String(50), primary_key=True),
+        sa.Column("value", sa.String(128), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+    )
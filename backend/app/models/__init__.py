@@ -1,5 +1,21 @@
 from app.models.book import Book
 from app.models.borrow_record import BorrowRecord
+from app.models.circulation_stats import (
+    BookLoanTotal,
+    CirculationCounter,
+    DailyLoanStat,
+    UserLoanTotal,
+)
+from app.models.refresh_token import RefreshToken
 from app.models.user import User
 
-__all__ = ["User", "Book", "BorrowRecord"]
+__all__ = [
+    "User",
+    "Book",
+    "BorrowRecord",
+    "DailyLoanStat",
+    "BookLoanTotal",
+    "UserLoanTotal",
+    "CirculationCounter",
+    "RefreshToken",
+]
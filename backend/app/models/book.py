@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import DateTime, Integer, String
+from sqlalchemy import DateTime, Index, Integer, String
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.core.database import Base
@@ -8,6 +8,16 @@ from app.core.database import Base
 
 class Book(Base):
     __tablename__ = "books"
+    __table_args__ = (
+        Index("ix_books_created_at", "created_at", "id"),
+        # 列表排序与筛选：排序列带上 id，与游标的 (值, id) 比较一致
+        Index("ix_books_title", "title", "id"),
+        Index("ix_books_author", "author", "id"),
+        Index("ix_books_publisher", "publisher", "id"),
+        Index("ix_books_isbn", "isbn"),
+        # 按状态筛选并按入库时间排序；状态分面计数也只需扫描该索引
+        Index("ix_books_status_created_at", "status", "created_at", "id"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     book_no: Mapped[str] = mapped_column(String(50), unique=True, nullable=False)
@@ -1,13 +1,44 @@
 from datetime import datetime
 
-from sqlalchemy import DateTime, ForeignKey, Integer, Text
+from sqlalchemy import Boolean, DateTime, ForeignKey, Index, Integer, Text, false, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.database import Base
 
+ACTIVE_LOAN = text("return_time IS NULL")
+
 
 class BorrowRecord(Base):
     __tablename__ = "borrow_records"
+    __table_args__ = (
+        # 每本书、每个用户最多一条未归还记录，由数据库保证并发下的正确性
+        Index(
+            "uq_borrow_records_active_book",
+            "book_id",
+            unique=True,
+            sqlite_where=ACTIVE_LOAN,
+            postgresql_where=ACTIVE_LOAN,
+        ),
+        Index(
+            "uq_borrow_records_active_user",
+            "user_id",
+            unique=True,
+            sqlite_where=ACTIVE_LOAN,
+            postgresql_where=ACTIVE_LOAN,
+        ),
+        # 与仓储层的分页查询一一对应：按用户/图书/全部记录，(borrow_time, id) 倒序
+        Index("ix_borrow_records_user_borrow_time", "user_id", "borrow_time", "id"),
+        Index("ix_borrow_records_book_borrow_time", "book_id", "borrow_time", "id"),
+        Index("ix_borrow_records_borrow_time", "borrow_time", "id"),
+        # 未归还记录按应还时间排序：逾期扫描与逾期列表只触及已到期的记录
+        Index(
+            "ix_borrow_records_open_due_time",
+            "due_time",
+            "id",
+            sqlite_where=ACTIVE_LOAN,
+            postgresql_where=ACTIVE_LOAN,
+        ),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     book_id: Mapped[int] = mapped_column(
@@ -18,7 +49,13 @@ class BorrowRecord(Base):
     )
     borrow_time: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
     return_time: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    due_time: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    # 由后台逾期扫描置位；归还后保留，表示该次借阅曾逾期
+    overdue: Mapped[bool] = mapped_column(
+        Boolean, default=False, server_default=false(), nullable=False
+    )
     note: Mapped[str | None] = mapped_column(Text, nullable=True)
 
-    book = relationship("Book", lazy="selectin")
-    user = relationship("User", lazy="selectin")
+    # 关联对象不隐式加载：需要时由查询显式 joinedload，或由服务层直接挂载
+    book = relationship("Book", lazy="raise")
+    user = relationship("User", lazy="raise")
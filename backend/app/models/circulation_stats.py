@@ -0,0 +1,45 @@
+from datetime import date
+
+from sqlalchemy import Date, ForeignKey, Index, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import Base
+
+CURRENTLY_BORROWED = "currently_borrowed"
+
+
+# 借阅统计汇总表：借还时在同一事务内增量维护，统计接口无需扫描借阅历史
+class DailyLoanStat(Base):
+    __tablename__ = "loan_stats_daily"
+
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    loans: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    returns: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+
+
+class BookLoanTotal(Base):
+    __tablename__ = "book_loan_totals"
+    # 倒序扫描该索引即可取前 k 名
+    __table_args__ = (Index("ix_book_loan_totals_loans", "loans", "book_id"),)
+
+    book_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("books.id"), primary_key=True
+    )
+    loans: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+
+
+class UserLoanTotal(Base):
+    __tablename__ = "user_loan_totals"
+    __table_args__ = (Index("ix_user_loan_totals_loans", "loans", "user_id"),)
+
+    user_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("users.id"), primary_key=True
+    )
+    loans: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+
+
+class CirculationCounter(Base):
+    __tablename__ = "circulation_counters"
+
+    name: Mapped[str] = mapped_column(String(50), primary_key=True)
+    value: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
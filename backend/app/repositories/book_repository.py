@@ -1,7 +1,48 @@
-from sqlalchemy import select
+from collections.abc import Collection
+from typing import Any
+
+from sqlalchemy import ColumnElement, Row, func, insert, or_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.pagination import Page, build_page, keyset_page
 from app.models.book import Book
+from app.schemas.book import DEFAULT_BOOK_SORT, BookFilters
+
+SORT_COLUMNS = {
+    "created_at": Book.created_at,
+    "title": Book.title,
+    "author": Book.author,
+}
+# 出版社分面只返回数量最多的若干项
+PUBLISHER_FACET_LIMIT = 20
+
+
+def prefix_conditions(column: Any, prefix: str) -> list[ColumnElement[bool]]:
+    # 前缀查询改写为范围条件 [prefix, upper)，可以走普通 B 树索引
+    upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+    return [column >= prefix, column < upper]
+
+
+def _filter_conditions(
+    filters: BookFilters | None, exclude: str | None = None
+) -> list[ColumnElement[bool]]:
+    """把筛选参数转为查询条件；exclude 用于分面计数时去掉该维度自身的筛选。"""
+    if filters is None:
+        return []
+    conditions = []
+    if filters.status is not None and exclude != "status":
+        conditions.append(Book.status == filters.status)
+    if filters.author is not None:
+        conditions.append(Book.author == filters.author)
+    if filters.publisher is not None and exclude != "publisher":
+        conditions.append(Book.publisher == filters.publisher)
+    if filters.isbn_prefix:
+        conditions.extend(prefix_conditions(Book.isbn, filters.isbn_prefix))
+    if filters.created_from is not None:
+        conditions.append(Book.created_at >= filters.created_from)
+    if filters.created_to is not None:
+        conditions.append(Book.created_at < filters.created_to)
+    return conditions
 
 
 class BookRepository:
@@ -13,19 +54,119 @@ class BookRepository:
         result = await db.execute(select(Book).where(Book.book_no == book_no))
         return result.scalars().first()
 
-    async def get_all(self, db: AsyncSession) -> list[Book]:
-        result = await db.execute(select(Book).order_by(Book.created_at.desc()))
-        return list(result.scalars().all())
+    async def get_all(
+        self,
+        db: AsyncSession,
+        limit: int,
+        cursor: str | None = None,
+        filters: BookFilters | None = None,
+        sort: str = DEFAULT_BOOK_SORT,
+    ) -> Page[Book]:
+        key = sort.lstrip("-")
+        # 默认排序的游标不带排序方式，与加入排序参数之前签发的游标兼容
+        sort_key = None if sort == DEFAULT_BOOK_SORT else sort
+        stmt = keyset_page(
+            select(Book).where(*_filter_conditions(filters)),
+            SORT_COLUMNS[key],
+            Book.id,
+            limit,
+            cursor,
+            descending=sort.startswith("-"),
+            sort_key=sort_key,
+        )
+        result = await db.execute(stmt)
+        return build_page(list(result.scalars().all()), limit, key, sort_key)
+
+    async def count_by_status(
+        self, db: AsyncSession, filters: BookFilters | None = None
+    ) -> list[Row]:
+        result = await db.execute(
+            select(Book.status, func.count())
+            .where(*_filter_conditions(filters, exclude="status"))
+            .group_by(Book.status)
+            .order_by(Book.status)
+        )
+        return list(result.all())
+
+    async def count_by_publisher(
+        self, db: AsyncSession, filters: BookFilters | None = None
+    ) -> list[Row]:
+        count = func.count()
+        result = await db.execute(
+            select(Book.publisher, count)
+            .where(
+                Book.publisher.is_not(None),
+                *_filter_conditions(filters, exclude="publisher"),
+            )
+            .group_by(Book.publisher)
+            .order_by(count.desc(), Book.publisher)
+            .limit(PUBLISHER_FACET_LIMIT)
+        )
+        return list(result.all())
+
+    async def transition_status(
+        self, db: AsyncSession, book_id: int, from_status: str, to_status: str
+    ) -> Book | None:
+        # 条件更新：仅当状态为 from_status 时生效，未命中返回 None
+        result = await db.execute(
+            update(Book)
+            .where(Book.id == book_id, Book.status == from_status)
+            .values(status=to_status)
+            .returning(Book)
+        )
+        return result.scalars().first()
+
+    async def transition_statuses(
+        self,
+        db: AsyncSession,
+        book_ids: Collection[int],
+        from_status: str,
+        to_status: str,
+    ) -> set[int]:
+        # transition_status 的批量版本，返回实际完成状态变更的图书 id
+        result = await db.execute(
+            update(Book)
+            .where(Book.id.in_(book_ids), Book.status == from_status)
+            .values(status=to_status)
+            .returning(Book.id)
+        )
+        return set(result.scalars().all())
+
+    async def get_by_ids_or_book_nos(
+        self, db: AsyncSession, book_ids: Collection[int], book_nos: Collection[str]
+    ) -> list[Row]:
+        # 一次查询按 id 或编号（条码）解析一批图书，只取状态判断所需的列
+        conditions = []
+        if book_ids:
+            conditions.append(Book.id.in_(book_ids))
+        if book_nos:
+            conditions.append(Book.book_no.in_(book_nos))
+        if not conditions:
+            return []
+        result = await db.execute(
+            select(Book.id, Book.book_no, Book.status).where(or_(*conditions))
+        )
+        return list(result.all())
+
+    async def get_existing_book_nos(
+        self, db: AsyncSession, book_nos: list[str]
+    ) -> set[str]:
+        result = await db.execute(
+            select(Book.book_no).where(Book.book_no.in_(book_nos))
+        )
+        return set(result.scalars().all())
+
+    async def bulk_insert(self, db: AsyncSession, rows: list[dict[str, Any]]) -> None:
+        # 多行参数走 executemany，不构建 ORM 对象
+        await db.execute(insert(Book), rows)
 
     async def create(self, db: AsyncSession, book: Book) -> Book:
         db.add(book)
         await db.flush()
-        await db.refresh(book)
         return book
 
     async def update(self, db: AsyncSession, book: Book) -> Book:
         await db.flush()
-        await db.refresh(book)
         return book
 
     async def delete(self, db: AsyncSession, book: Book) -> None:
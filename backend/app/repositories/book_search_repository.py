@@ -0,0 +1,151 @@
+from sqlalchemy import (
+    Column,
+    Integer,
+    MetaData,
+    Table,
+    Text,
+    case,
+    delete,
+    func,
+    insert,
+    literal_column,
+    or_,
+    select,
+    union,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.book import Book
+from app.repositories.book_repository import prefix_conditions
+
+# FTS5 虚拟表由迁移 0003 创建，不属于 ORM 模型，因此单独维护元数据
+books_fts = Table(
+    "books_fts",
+    MetaData(),
+    Column("rowid", Integer, primary_key=True),
+    Column("title", Text),
+    Column("author", Text),
+    Column("isbn", Text),
+    Column("publisher", Text),
+    Column("book_no", Text),
+)
+
+FTS_COLUMNS = ("title", "author", "isbn", "publisher", "book_no")
+# bm25 列权重，与 FTS_COLUMNS 顺序一致：书名命中优先于作者，其余字段次之
+FTS_WEIGHTS = (10.0, 5.0, 2.0, 2.0, 2.0)
+# trigram 分词器只能匹配长度 >= 3 的片段，更短的词改用 LIKE 过滤
+TRIGRAM_MIN_LENGTH = 3
+# 没有可用 FTS 的检索不做全表 LIKE：子串匹配只在最新入库的这些图书中进行，
+# 另按书名/作者前缀走索引覆盖全部图书
+SHORT_TERM_SCAN_ROWS = 5000
+
+
+def _is_sqlite(db: AsyncSession) -> bool:
+    return db.get_bind().dialect.name == "sqlite"
+
+
+class BookSearchRepository:
+    async def index(self, db: AsyncSession, book: Book) -> None:
+        if not _is_sqlite(db):
+            return
+        await db.execute(
+            insert(books_fts).values(
+                rowid=book.id, **{c: getattr(book, c) for c in FTS_COLUMNS}
+            )
+        )
+
+    async def index_book_nos(self, db: AsyncSession, book_nos: list[str]) -> None:
+        if not _is_sqlite(db):
+            return
+        await db.execute(
+            insert(books_fts).from_select(
+                ["rowid", *FTS_COLUMNS],
+                select(Book.id, *(getattr(Book, c) for c in FTS_COLUMNS)).where(
+                    Book.book_no.in_(book_nos)
+                ),
+            )
+        )
+
+    async def reindex(self, db: AsyncSession, book: Book) -> None:
+        await self.remove(db, book.id)
+        await self.index(db, book)
+
+    async def remove(self, db: AsyncSession, book_id: int) -> None:
+        if not _is_sqlite(db):
+            return
+        await db.execute(delete(books_fts).where(books_fts.c.rowid == book_id))
+
+    async def search(self, db: AsyncSession, query: str, limit: int) -> list[Book]:
+        terms = query.split()
+        if not terms:
+            return []
+        long_terms = [t for t in terms if len(t) >= TRIGRAM_MIN_LENGTH]
+        short_terms = [t for t in terms if len(t) < TRIGRAM_MIN_LENGTH]
+        if _is_sqlite(db) and long_terms:
+            stmt = self._fts_plan(long_terms)
+        else:
+            stmt = self._like_plan(terms[0], limit)
+            short_terms = terms
+        for term in short_terms:
+            stmt = stmt.where(_like_any(term))
+        result = await db.execute(stmt.limit(limit))
+        return list(result.scalars().all())
+
+    def _fts_plan(self, terms: list[str]):
+        # 每个词作为短语加引号，既转义 FTS 语法字符，又按子串（含前缀）匹配
+        match = " ".join('"' + t.replace('"', '""') + '"' for t in terms)
+        fts = literal_column("books_fts")
+        return (
+            select(Book)
+            .join(books_fts, books_fts.c.rowid == Book.id)
+            .where(fts.op("MATCH")(match))
+            .order_by(func.bm25(fts, *FTS_WEIGHTS))
+        )
+
+    def _like_plan(self, first_term: str, limit: int):
+        """候选集 = 书名/作者以该词开头的图书 + 最新图书中含该词的图书。
+
+        各部分都带 LIMIT，排序只作用于有界的候选集。
+        """
+        recent = (
+            select(Book.id, *(getattr(Book, c) for c in FTS_COLUMNS))
+            .order_by(Book.created_at.desc(), Book.id.desc())
+            .limit(SHORT_TERM_SCAN_ROWS)
+            .subquery()
+        )
+        # SQLite 复合查询的成员不能直接带 LIMIT，先包成子查询
+        prefixed = [
+            select(Book.id)
+            .where(*prefix_conditions(column, first_term))
+            .limit(limit)
+            .subquery()
+            for column in (Book.title, Book.author)
+        ]
+        candidates = union(
+            *(select(p.c.id) for p in prefixed),
+            select(recent.c.id).where(
+                or_(
+                    *(
+                        recent.c[c].icontains(first_term, autoescape=True)
+                        for c in FTS_COLUMNS
+                    )
+                )
+            ),
+        )
+        title_hit = case(
+            (Book.title.icontains(first_term, autoescape=True), 0), else_=1
+        )
+        return (
+            select(Book)
+            .where(Book.id.in_(candidates))
+            .order_by(title_hit, Book.created_at.desc(), Book.id.desc())
+        )
+
+
+def _like_any(term: str):
+    return or_(
+        *(getattr(Book, c).icontains(term, autoescape=True) for c in FTS_COLUMNS)
+    )
+
+
+book_search_repository = BookSearchRepository()
@@ -1,14 +1,41 @@
-from sqlalchemy import and_, select
+from collections.abc import AsyncIterator, Collection, Sequence
+from datetime import datetime, timedelta
+
+from sqlalchemy import ColumnElement, Row, and_, insert, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute, joinedload
 
+from app.core.config import get_settings
+from app.core.pagination import Page, build_page, keyset_page
+from app.models.book import Book
 from app.models.borrow_record import BorrowRecord
+from app.models.user import User
+from app.repositories.projections import (
+    BOOK_COLUMNS,
+    RECORD_COLUMNS,
+    USER_COLUMNS,
+    BorrowRecordRow,
+    build_record_rows,
+)
+
+RELATIONS = ("book", "user")
+# 导出的列与 API 的 BorrowRecordRow 同源，再附上图书和读者的可读字段
+HISTORY_COLUMNS = (*RECORD_COLUMNS, Book.book_no, Book.title, User.username)
+
+settings = get_settings()
 
 
 class BorrowRepository:
-    async def get_by_id(self, db: AsyncSession, record_id: int) -> BorrowRecord | None:
-        result = await db.execute(
-            select(BorrowRecord).where(BorrowRecord.id == record_id)
-        )
+    async def get_by_id(
+        self, db: AsyncSession, record_id: int, with_relations: bool = False
+    ) -> BorrowRecord | None:
+        stmt = select(BorrowRecord).where(BorrowRecord.id == record_id)
+        if with_relations:
+            stmt = stmt.options(
+                joinedload(BorrowRecord.book, innerjoin=True),
+                joinedload(BorrowRecord.user, innerjoin=True),
+            )
+        result = await db.execute(stmt)
         return result.scalars().first()
 
     async def get_active_by_user(
@@ -37,37 +64,217 @@ class BorrowRepository:
         )
         return result.scalars().first()
 
-    async def get_by_user(self, db: AsyncSession, user_id: int) -> list[BorrowRecord]:
+    async def get_by_user(
+        self,
+        db: AsyncSession,
+        user_id: int,
+        limit: int,
+        cursor: str | None = None,
+        relations: Collection[str] = RELATIONS,
+    ) -> Page[BorrowRecordRow]:
+        return await self._page(
+            db, BorrowRecord.user_id == user_id, limit, cursor, relations
+        )
+
+    async def get_by_book(
+        self,
+        db: AsyncSession,
+        book_id: int,
+        limit: int,
+        cursor: str | None = None,
+        relations: Collection[str] = RELATIONS,
+    ) -> Page[BorrowRecordRow]:
+        return await self._page(
+            db, BorrowRecord.book_id == book_id, limit, cursor, relations
+        )
+
+    async def get_all(
+        self,
+        db: AsyncSession,
+        limit: int,
+        cursor: str | None = None,
+        relations: Collection[str] = RELATIONS,
+    ) -> Page[BorrowRecordRow]:
+        return await self._page(db, None, limit, cursor, relations)
+
+    async def get_overdue(
+        self,
+        db: AsyncSession,
+        now: datetime,
+        limit: int,
+        cursor: str | None = None,
+        relations: Collection[str] = RELATIONS,
+    ) -> Page[BorrowRecordRow]:
+        # 逾期最久的排在前面；return_time IS NULL 使查询命中部分索引
+        return await self._page(
+            db,
+            and_(BorrowRecord.return_time.is_(None), BorrowRecord.due_time < now),
+            limit,
+            cursor,
+            relations,
+            sort_column=BorrowRecord.due_time,
+            descending=False,
+        )
+
+    async def _page(
+        self,
+        db: AsyncSession,
+        criterion: ColumnElement[bool] | None,
+        limit: int,
+        cursor: str | None,
+        relations: Collection[str],
+        sort_column: InstrumentedAttribute = BorrowRecord.borrow_time,
+        descending: bool = True,
+    ) -> Page[BorrowRecordRow]:
+        # 只读列表走 Core 投影：一条 JOIN 查询取齐所需列，不构建 ORM 对象
+        with_book = "book" in relations
+        with_user = "user" in relations
+        columns = list(RECORD_COLUMNS)
+        if with_book:
+            columns += BOOK_COLUMNS
+        if with_user:
+            columns += USER_COLUMNS
+        stmt = select(*columns).select_from(BorrowRecord)
+        if with_book:
+            stmt = stmt.join(Book, Book.id == BorrowRecord.book_id)
+        if with_user:
+            stmt = stmt.join(User, User.id == BorrowRecord.user_id)
+        if criterion is not None:
+            stmt = stmt.where(criterion)
+        stmt = keyset_page(
+            stmt, sort_column, BorrowRecord.id, limit, cursor, descending
+        )
+        result = await db.execute(stmt)
+        rows = build_record_rows(result.all(), with_book, with_user)
+        return build_page(rows, limit, sort_column.key)
+
+    async def stream_history(
+        self,
+        db: AsyncSession,
+        start: datetime | None,
+        end: datetime | None,
+        batch_size: int,
+    ) -> AsyncIterator[Sequence[Row]]:
+        # 服务端游标按批取行，只选需要的列，不构建 ORM 对象
+        stmt = (
+            select(*HISTORY_COLUMNS)
+            .join(Book, Book.id == BorrowRecord.book_id)
+            .join(User, User.id == BorrowRecord.user_id)
+            .order_by(BorrowRecord.borrow_time, BorrowRecord.id)
+            .execution_options(yield_per=batch_size)
+        )
+        if start is not None:
+            stmt = stmt.where(BorrowRecord.borrow_time >= start)
+        if end is not None:
+            stmt = stmt.where(BorrowRecord.borrow_time < end)
+        result = await db.stream(stmt)
+        async for partition in result.partitions():
+            yield partition
+
+    async def open_loan(
+        self, db: AsyncSession, book_id: int, user_id: int
+    ) -> BorrowRecord:
+        now = datetime.utcnow()
+        result = await db.execute(
+            insert(BorrowRecord)
+            .values(
+                book_id=book_id,
+                user_id=user_id,
+                borrow_time=now,
+                due_time=now + timedelta(days=settings.LOAN_PERIOD_DAYS),
+            )
+            .returning(BorrowRecord)
+        )
+        return result.scalars().one()
+
+    async def close_loan(
+        self, db: AsyncSession, book_id: int, user_id: int
+    ) -> BorrowRecord | None:
+        result = await db.execute(
+            update(BorrowRecord)
+            .where(
+                BorrowRecord.book_id == book_id,
+                BorrowRecord.user_id == user_id,
+                BorrowRecord.return_time.is_(None),
+            )
+            .values(return_time=datetime.utcnow())
+            .returning(BorrowRecord)
+        )
+        return result.scalars().first()
+
+    async def get_users_with_active_loans(
+        self, db: AsyncSession, user_ids: Collection[int]
+    ) -> set[int]:
         result = await db.execute(
-            select(BorrowRecord)
-            .where(BorrowRecord.user_id == user_id)
-            .order_by(BorrowRecord.borrow_time.desc())
+            select(BorrowRecord.user_id).where(
+                BorrowRecord.user_id.in_(user_ids), BorrowRecord.return_time.is_(None)
+            )
         )
-        return list(result.scalars().all())
+        return set(result.scalars().all())
 
-    async def get_by_book(self, db: AsyncSession, book_id: int) -> list[BorrowRecord]:
+    async def open_loans(
+        self, db: AsyncSession, loans: Sequence[tuple[int, int]]
+    ) -> list[BorrowRecord]:
+        """批量借出：loans 为 (book_id, user_id)，多行参数合并为一条 INSERT ... RETURNING。"""
+        now = datetime.utcnow()
+        due = now + timedelta(days=settings.LOAN_PERIOD_DAYS)
         result = await db.execute(
-            select(BorrowRecord)
-            .where(BorrowRecord.book_id == book_id)
-            .order_by(BorrowRecord.borrow_time.desc())
+            insert(BorrowRecord).returning(BorrowRecord),
+            [
+                {
+                    "book_id": book_id,
+                    "user_id": user_id,
+                    "borrow_time": now,
+                    "due_time": due,
+                }
+                for book_id, user_id in loans
+            ],
         )
         return list(result.scalars().all())
 
-    async def get_all(self, db: AsyncSession) -> list[BorrowRecord]:
+    async def close_loans(
+        self, db: AsyncSession, book_ids: Collection[int]
+    ) -> list[BorrowRecord]:
+        # 前台归还不区分借阅人：关闭这些图书上的未归还记录
         result = await db.execute(
-            select(BorrowRecord).order_by(BorrowRecord.borrow_time.desc())
+            update(BorrowRecord)
+            .where(
+                BorrowRecord.book_id.in_(book_ids),
+                BorrowRecord.return_time.is_(None),
+            )
+            .values(return_time=datetime.utcnow())
+            .returning(BorrowRecord)
         )
         return list(result.scalars().all())
 
+    async def mark_overdue(
+        self, db: AsyncSession, now: datetime, batch_size: int
+    ) -> int:
+        """把一批已到期但未标记的未归还记录置为逾期，返回本批标记的条数。"""
+        due = (
+            select(BorrowRecord.id)
+            .where(
+                BorrowRecord.return_time.is_(None),
+                BorrowRecord.due_time < now,
+                BorrowRecord.overdue.is_(False),
+            )
+            .order_by(BorrowRecord.due_time)
+            .limit(batch_size)
+        )
+        result = await db.execute(
+            update(BorrowRecord)
+            .where(BorrowRecord.id.in_(due.scalar_subquery()))
+            .values(overdue=True)
+        )
+        return result.rowcount
+
     async def create(self, db: AsyncSession, record: BorrowRecord) -> BorrowRecord:
         db.add(record)
         await db.flush()
-        await db.refresh(record)
         return record
 
     async def update(self, db: AsyncSession, record: BorrowRecord) -> BorrowRecord:
         await db.flush()
-        await db.refresh(record)
         return record
 
 
@@ -0,0 +1,95 @@
+from dataclasses import dataclass, fields
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy.orm import InstrumentedAttribute
+
+from app.models.book import Book
+from app.models.borrow_record import BorrowRecord
+from app.models.user import User
+
+
+# 只读列表使用的轻量行对象：直接由查询结果的列构造，不进入 Session 的身份映射
+@dataclass(frozen=True, slots=True)
+class BookRow:
+    id: int
+    book_no: str
+    title: str
+    author: str
+    isbn: str | None
+    publisher: str | None
+    status: str
+    created_at: datetime
+
+
+@dataclass(frozen=True, slots=True)
+class UserRow:
+    id: int
+    username: str
+    role: str
+    created_at: datetime
+
+
+@dataclass(frozen=True, slots=True)
+class BorrowRecordRow:
+    id: int
+    book_id: int
+    user_id: int
+    borrow_time: datetime
+    return_time: datetime | None
+    due_time: datetime | None
+    overdue: bool
+    note: str | None
+    book: BookRow | None = None
+    user: UserRow | None = None
+
+
+def to_row[T](row_type: type[T], obj: Any, **related: Any) -> T:
+    """由 ORM 对象或带同名属性的对象（如认证得到的 Principal）构造行对象。
+
+    关联字段只取 related 中给出的值，不访问对象上的关联属性。
+    """
+    values = {
+        f.name: getattr(obj, f.name)
+        for f in fields(row_type)
+        if f.name not in ("book", "user")
+    }
+    return row_type(**values, **related)
+
+
+def columns_for(row_type: type, model: type) -> list[InstrumentedAttribute]:
+    # 只取表列，关联字段（book/user）由 build_record_rows 单独填充
+    return [
+        getattr(model, f.name) for f in fields(row_type) if f.name in model.__table__.c
+    ]
+
+
+BOOK_COLUMNS = columns_for(BookRow, Book)
+USER_COLUMNS = columns_for(UserRow, User)
+RECORD_COLUMNS = columns_for(BorrowRecordRow, BorrowRecord)
+
+
+def build_record_rows(
+    rows: list[Any], with_book: bool, with_user: bool
+) -> list[BorrowRecordRow]:
+    """按 RECORD_COLUMNS [+ BOOK_COLUMNS] [+ USER_COLUMNS] 的列顺序切分结果行。
+
+    同一页内重复出现的图书/用户只构造一次。
+    """
+    record_end = len(RECORD_COLUMNS)
+    book_end = record_end + (len(BOOK_COLUMNS) if with_book else 0)
+    books: dict[int, BookRow] = {}
+    users: dict[int, UserRow] = {}
+    result = []
+    for row in rows:
+        book = user = None
+        if with_book:
+            book = books.get(row[record_end])
+            if book is None:
+                book = books[row[record_end]] = BookRow(*row[record_end:book_end])
+        if with_user:
+            user = users.get(row[book_end])
+            if user is None:
+                user = users[row[book_end]] = UserRow(*row[book_end:])
+        result.append(BorrowRecordRow(*row[:record_end], book=book, user=user))
+    return result
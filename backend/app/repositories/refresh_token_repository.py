@@ -0,0 +1,57 @@
+from datetime import datetime
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.refresh_token import RefreshToken
+
+
+class RefreshTokenRepository:
+    async def get_by_hash(
+        self, db: AsyncSession, token_hash: str
+    ) -> RefreshToken | None:
+        result = await db.execute(
+            select(RefreshToken).where(RefreshToken.token_hash == token_hash)
+        )
+        return result.scalars().first()
+
+    async def create(self, db: AsyncSession, token: RefreshToken) -> RefreshToken:
+        db.add(token)
+        await db.flush()
+        return token
+
+    async def revoke(self, db: AsyncSession, token_id: int, now: datetime) -> bool:
+        # 条件更新：并发轮换同一令牌时只有一个请求成功
+        result = await db.execute(
+            update(RefreshToken)
+            .where(RefreshToken.id == token_id, RefreshToken.revoked_at.is_(None))
+            .values(revoked_at=now)
+        )
+        return result.rowcount == 1
+
+    async def revoke_family(
+        self, db: AsyncSession, family_id: str, now: datetime
+    ) -> int:
+        result = await db.execute(
+            update(RefreshToken)
+            .where(
+                RefreshToken.family_id == family_id, RefreshToken.revoked_at.is_(None)
+            )
+            .values(revoked_at=now)
+        )
+        return result.rowcount
+
+    async def revoke_user(
+        self, db: AsyncSession, user_id: int, now: datetime
+    ) -> set[str]:
+        """吊销该用户全部未吊销的刷新令牌，返回涉及的会话（family_id）。"""
+        result = await db.execute(
+            update(RefreshToken)
+            .where(RefreshToken.user_id == user_id, RefreshToken.revoked_at.is_(None))
+            .values(revoked_at=now)
+            .returning(RefreshToken.family_id)
+        )
+        return set(result.scalars().all())
+
+
+refresh_token_repository = RefreshTokenRepository()
@@ -0,0 +1,170 @@
+from collections import Counter
+from collections.abc import Sequence
+from datetime import date, datetime
+from typing import Any
+
+from sqlalchemy import Date, Row, cast, delete, func, literal, select, text
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.book import Book
+from app.models.borrow_record import BorrowRecord
+from app.models.circulation_stats import (
+    CURRENTLY_BORROWED,
+    BookLoanTotal,
+    CirculationCounter,
+    DailyLoanStat,
+    UserLoanTotal,
+)
+from app.models.user import User
+
+
+def _insert(db: AsyncSession):
+    # INSERT ... ON CONFLICT 由各方言各自提供
+    if db.get_bind().dialect.name == "postgresql":
+        return postgresql.insert
+    return sqlite.insert
+
+
+def _day(db: AsyncSession, column):
+    # SQLite 的 Date 列以 'YYYY-MM-DD' 文本存储，CAST AS DATE 会得到数字
+    if db.get_bind().dialect.name == "sqlite":
+        return func.date(column)
+    return cast(column, Date)
+
+
+class StatsRepository:
+    async def _increment(
+        self, db: AsyncSession, model: Any, key: dict[str, Any], **deltas: int
+    ) -> None:
+        stmt = _insert(db)(model).values(**key, **deltas)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=list(key),
+            set_={col: getattr(model, col) + delta for col, delta in deltas.items()},
+        )
+        await db.execute(stmt)
+
+    async def _add_loans(
+        self, db: AsyncSession, model: Any, key: str, loans: Counter[int]
+    ) -> None:
+        # 多行 upsert：每个键的增量取自 excluded，一条语句更新一批汇总行
+        stmt = _insert(db)(model).values(
+            [{key: value, "loans": count} for value, count in loans.items()]
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[key], set_={"loans": model.loans + stmt.excluded.loans}
+        )
+        await db.execute(stmt)
+
+    async def record_loan(
+        self, db: AsyncSession, book_id: int, user_id: int, when: datetime
+    ) -> None:
+        await self.record_loans(db, [(book_id, user_id)], when)
+
+    async def record_loans(
+        self, db: AsyncSession, loans: Sequence[tuple[int, int]], when: datetime
+    ) -> None:
+        """loans 为同一时刻借出的 (book_id, user_id)，语句数与条数无关。"""
+        count = len(loans)
+        await self._increment(db, DailyLoanStat, {"day": when.date()}, loans=count)
+        await self._add_loans(
+            db, BookLoanTotal, "book_id", Counter(b for b, _ in loans)
+        )
+        await self._add_loans(
+            db, UserLoanTotal, "user_id", Counter(u for _, u in loans)
+        )
+        await self._increment(
+            db, CirculationCounter, {"name": CURRENTLY_BORROWED}, value=count
+        )
+
+    async def record_return(
+        self, db: AsyncSession, when: datetime, count: int = 1
+    ) -> None:
+        await self._increment(db, DailyLoanStat, {"day": when.date()}, returns=count)
+        await self._increment(
+            db, CirculationCounter, {"name": CURRENTLY_BORROWED}, value=-count
+        )
+
+    async def get_counter(self, db: AsyncSession, name: str) -> int:
+        result = await db.execute(
+            select(CirculationCounter.value).where(CirculationCounter.name == name)
+        )
+        return result.scalar() or 0
+
+    async def get_daily(self, db: AsyncSession, since: date) -> list[DailyLoanStat]:
+        result = await db.execute(
+            select(DailyLoanStat)
+            .where(DailyLoanStat.day >= since)
+            .order_by(DailyLoanStat.day)
+        )
+        return list(result.scalars().all())
+
+    async def get_top_books(self, db: AsyncSession, limit: int) -> list[Row]:
+        result = await db.execute(
+            select(BookLoanTotal.book_id, Book.book_no, Book.title, BookLoanTotal.loans)
+            .join(Book, Book.id == BookLoanTotal.book_id)
+            .order_by(BookLoanTotal.loans.desc(), BookLoanTotal.book_id.desc())
+            .limit(limit)
+        )
+        return list(result.all())
+
+    async def get_top_users(self, db: AsyncSession, limit: int) -> list[Row]:
+        result = await db.execute(
+            select(UserLoanTotal.user_id, User.username, UserLoanTotal.loans)
+            .join(User, User.id == UserLoanTotal.user_id)
+            .order_by(UserLoanTotal.loans.desc(), UserLoanTotal.user_id.desc())
+            .limit(limit)
+        )
+        return list(result.all())
+
+    async def rebuild(self, db: AsyncSession) -> None:
+        """清空汇总表并按借阅历史重新计算，需在单个事务中执行。"""
+        if db.get_bind().dialect.name == "postgresql":
+            # 阻止重算期间的借还写入，避免增量更新丢失或重复计入
+            await db.execute(text("LOCK TABLE borrow_records IN SHARE MODE"))
+        for model in (DailyLoanStat, BookLoanTotal, UserLoanTotal, CirculationCounter):
+            await db.execute(delete(model))
+
+        insert = _insert(db)
+        loan_day = _day(db, BorrowRecord.borrow_time)
+        return_day = _day(db, BorrowRecord.return_time)
+        await db.execute(
+            insert(DailyLoanStat).from_select(
+                ["day", "loans", "returns"],
+                select(loan_day, func.count(), literal(0))
+                .where(BorrowRecord.borrow_time.is_not(None))
+                .group_by(loan_day),
+            )
+        )
+        returns = insert(DailyLoanStat).from_select(
+            ["day", "loans", "returns"],
+            select(return_day, literal(0), func.count())
+            .where(BorrowRecord.return_time.is_not(None))
+            .group_by(return_day),
+        )
+        await db.execute(
+            returns.on_conflict_do_update(
+                index_elements=["day"], set_={"returns": returns.excluded.returns}
+            )
+        )
+        for model, column in (
+            (BookLoanTotal, BorrowRecord.book_id),
+            (UserLoanTotal, BorrowRecord.user_id),
+        ):
+            await db.execute(
+                insert(model).from_select(
+                    [column.key, "loans"],
+                    select(column, func.count()).group_by(column),
+                )
+            )
+        await db.execute(
+            insert(CirculationCounter).from_select(
+                ["name", "value"],
+                select(literal(CURRENTLY_BORROWED), func.count()).where(
+                    BorrowRecord.return_time.is_(None)
+                ),
+            )
+        )
+
+
+stats_repository = StatsRepository()
@@ -1,6 +1,10 @@
-from sqlalchemy import select
+from collections.abc import Collection
+from typing import Any
+
+from sqlalchemy import insert, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.pagination import Page, build_page, keyset_page
 from app.models.user import User
 
 
@@ -13,19 +17,37 @@ class UserRepository:
         result = await db.execute(select(User).where(User.username == username))
         return result.scalars().first()
 
-    async def get_all(self, db: AsyncSession) -> list[User]:
-        result = await db.execute(select(User).order_by(User.created_at.desc()))
-        return list(result.scalars().all())
+    async def get_existing_ids(
+        self, db: AsyncSession, user_ids: Collection[int]
+    ) -> set[int]:
+        result = await db.execute(select(User.id).where(User.id.in_(user_ids)))
+        return set(result.scalars().all())
+
+    async def get_existing_usernames(
+        self, db: AsyncSession, usernames: Collection[str]
+    ) -> set[str]:
+        result = await db.execute(
+            select(User.username).where(User.username.in_(usernames))
+        )
+        return set(result.scalars().all())
+
+    async def bulk_insert(self, db: AsyncSession, rows: list[dict[str, Any]]) -> None:
+        await db.execute(insert(User), rows)
+
+    async def get_all(
+        self, db: AsyncSession, limit: int, cursor: str | None = None
+    ) -> Page[User]:
+        stmt = keyset_page(select(User), User.created_at, User.id, limit, cursor)
+        result = await db.execute(stmt)
+        return build_page(list(result.scalars().all()), limit, "created_at")
 
     async def create(self, db: AsyncSession, user: User) -> User:
         db.add(user)
         await db.flush()
-        await db.refresh(user)
         return user
 
     async def update(self, db: AsyncSession, user: User) -> User:
         await db.flush()
-        await db.refresh(user)
         return user
 
 
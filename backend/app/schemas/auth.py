@@ -3,4 +3,11 @@ from pydantic import BaseModel
 
 class Token(BaseModel):
     access_token: str
+    refresh_token: str
     token_type: str = "bearer"
+    # 访问令牌的有效秒数
+    expires_in: int
+
+
+class RefreshRequest(BaseModel):
+    refresh_token: str
@@ -1,7 +1,15 @@
 from datetime import datetime
+from typing import Literal
 
 from pydantic import BaseModel
 
+from app.core.serialization import ModelSerializer
+from app.schemas.pagination import CursorPage
+
+# 列表允许的排序方式，"-" 前缀表示倒序；每种排序都有对应的 (列, id) 索引
+BookSort = Literal["-created_at", "created_at", "title", "-title", "author", "-author"]
+DEFAULT_BOOK_SORT = "-created_at"
+
 
 class BookCreate(BaseModel):
     book_no: str
@@ -30,3 +38,33 @@ class BookResponse(BaseModel):
     created_at: datetime
 
     model_config = {"from_attributes": True}
+
+
+book_serializer = ModelSerializer(BookResponse)
+
+
+class BookFilters(BaseModel):
+    status: Literal["available", "borrowed"] | None = None
+    author: str | None = None
+    publisher: str | None = None
+    isbn_prefix: str | None = None
+    # 入库时间范围：含起点，不含终点
+    created_from: datetime | None = None
+    created_to: datetime | None = None
+
+    def cache_key(self) -> str:
+        return self.model_dump_json(exclude_none=True)
+
+
+class FacetCount(BaseModel):
+    value: str
+    count: int
+
+
+class BookFacets(BaseModel):
+    status: list[FacetCount]
+    publisher: list[FacetCount]
+
+
+class BookPage(CursorPage[BookResponse]):
+    facets: BookFacets | None = None
@@ -2,8 +2,9 @@ from datetime import datetime
 
 from pydantic import BaseModel
 
-from app.schemas.book import BookResponse
-from app.schemas.user import UserResponse
+from app.core.serialization import ModelSerializer
+from app.schemas.book import BookResponse, book_serializer
+from app.schemas.user import UserResponse, user_serializer
 
 
 class BorrowRecordResponse(BaseModel):
@@ -12,6 +13,8 @@ class BorrowRecordResponse(BaseModel):
     user_id: int
     borrow_time: datetime
     return_time: datetime | None = None
+    due_time: datetime | None = None
+    overdue: bool = False
     note: str | None = None
     book: BookResponse
     user: UserResponse
@@ -19,5 +22,14 @@ class BorrowRecordResponse(BaseModel):
     model_config = {"from_attributes": True}
 
 
+borrow_record_serializer = ModelSerializer(
+    BorrowRecordResponse, nested={"book": book_serializer, "user": user_serializer}
+)
+
+
 class NoteUpdate(BaseModel):
     note: str
+
+
+class OverdueSweepResult(BaseModel):
+    marked: int
@@ -0,0 +1,32 @@
+from pydantic import BaseModel
+
+# 报告中最多保留的逐行错误数，避免大文件的报告本身过大
+MAX_REPORTED_ERRORS = 1000
+
+
+class RowError(BaseModel):
+    row: int
+    error: str
+
+
+class ImportReport(BaseModel):
+    total: int = 0
+    inserted: int = 0
+    skipped: int = 0
+    failed: int = 0
+    errors: list[RowError] = []
+    errors_truncated: bool = False
+    elapsed_seconds: float = 0.0
+    # 只按成功写入的行计算；校验失败和跳过的行分别记在 failed / skipped
+    rows_per_second: float = 0.0
+
+    def add_error(self, row: int, error: str) -> None:
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append(RowError(row=row, error=error))
+        else:
+            self.errors_truncated = True
+
+    def finish(self, elapsed: float) -> "ImportReport":
+        self.elapsed_seconds = round(elapsed, 3)
+        self.rows_per_second = round(self.inserted / elapsed, 1) if elapsed > 0 else 0.0
+        return self
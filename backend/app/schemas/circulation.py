@@ -0,0 +1,40 @@
+from datetime import datetime
+from typing import Literal
+
+from pydantic import BaseModel
+
+# 单次批量借还的最大条数
+MAX_BATCH_ITEMS = 500
+
+
+class CirculationItem(BaseModel):
+    # book_id 与 book_no（条码）填写其一
+    book_id: int | None = None
+    book_no: str | None = None
+    # 借阅人，未填写时使用请求中的 user_id；归还时忽略
+    user_id: int | None = None
+
+
+class BatchCirculationRequest(BaseModel):
+    action: Literal["borrow", "return"]
+    user_id: int | None = None
+    items: list[CirculationItem]
+
+
+class CirculationItemResult(BaseModel):
+    index: int
+    ok: bool = False
+    error: str | None = None
+    book_id: int | None = None
+    book_no: str | None = None
+    user_id: int | None = None
+    record_id: int | None = None
+    due_time: datetime | None = None
+
+
+class BatchCirculationResult(BaseModel):
+    action: str
+    total: int
+    succeeded: int
+    failed: int
+    items: list[CirculationItemResult]
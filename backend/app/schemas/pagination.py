@@ -0,0 +1,8 @@
+from pydantic import BaseModel
+
+
+class CursorPage[T](BaseModel):
+    items: list[T]
+    next_cursor: str | None = None
+
+    model_config = {"from_attributes": True}
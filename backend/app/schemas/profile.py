@@ -0,0 +1,33 @@
+from datetime import datetime
+
+from pydantic import BaseModel
+
+
+class ProfiledStatement(BaseModel):
+    engine: str
+    sql: str
+    duration_ms: float
+
+
+class ProfileSummary(BaseModel):
+    id: str
+    method: str
+    path: str
+    status: int
+    started_at: datetime
+    duration_ms: float
+    statement_count: int
+    statement_ms: float
+    samples: int
+
+
+class StackSample(BaseModel):
+    stack: str
+    samples: int
+
+
+class ProfileDetail(ProfileSummary):
+    sample_interval_ms: float
+    statements: list[ProfiledStatement]
+    # 采样次数最多的调用栈；完整结果见 /profiles/{id}/folded
+    top_stacks: list[StackSample]
@@ -0,0 +1,29 @@
+from datetime import date
+
+from pydantic import BaseModel
+
+
+class DailyLoans(BaseModel):
+    day: date
+    loans: int
+    returns: int
+
+
+class BookLoans(BaseModel):
+    book_id: int
+    book_no: str
+    title: str
+    loans: int
+
+
+class UserLoans(BaseModel):
+    user_id: int
+    username: str
+    loans: int
+
+
+class CirculationStats(BaseModel):
+    currently_borrowed: int
+    daily: list[DailyLoans]
+    top_books: list[BookLoans]
+    top_users: list[UserLoans]
@@ -2,6 +2,8 @@ from datetime import datetime
 
 from pydantic import BaseModel
 
+from app.core.serialization import ModelSerializer
+
 
 class UserCreate(BaseModel):
     username: str
@@ -18,6 +20,9 @@ class UserResponse(BaseModel):
     model_config = {"from_attributes": True}
 
 
+user_serializer = ModelSerializer(UserResponse)
+
+
 class PasswordChange(BaseModel):
     old_password: str
     new_password: str
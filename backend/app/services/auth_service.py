@@ -1,8 +1,25 @@
+import uuid
+from datetime import datetime, timedelta
+
+from fastapi import HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.security import create_access_token, get_password_hash, verify_password
+from app.core.config import get_settings
+from app.core.principal_cache import password_marker, principal_cache
+from app.core.security import (
+    create_access_token,
+    get_password_hash_async,
+    hash_refresh_token,
+    new_refresh_token,
+    verify_password_async,
+)
+from app.models.refresh_token import RefreshToken
 from app.models.user import User
+from app.repositories.refresh_token_repository import refresh_token_repository
 from app.repositories.user_repository import user_repository
+from app.schemas.auth import Token
+
+settings = get_settings()
 
 
 class AuthService:
@@ -10,29 +27,107 @@ class AuthService:
         self, db: AsyncSession, username: str, password: str
     ) -> User | None:
         user = await user_repository.get_by_username(db, username)
-        if not user or not verify_password(password, user.hashed_password):
+        if not user or not await verify_password_async(password, user.hashed_password):
             return None
         return user
 
-    def create_token(self, user_id: int) -> str:
-        return create_access_token(data={"sub": str(user_id)})
+    async def issue_tokens(
+        self, db: AsyncSession, user: User, family_id: str | None = None
+    ) -> Token:
+        """签发访问令牌与刷新令牌；登录时开启新会话，刷新时沿用原会话。"""
+        family_id = family_id or uuid.uuid4().hex
+        refresh_token = new_refresh_token()
+        await refresh_token_repository.create(
+            db,
+            RefreshToken(
+                user_id=user.id,
+                family_id=family_id,
+                token_hash=hash_refresh_token(refresh_token),
+                expires_at=datetime.utcnow()
+                + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS),
+            ),
+        )
+        return Token(
+            access_token=create_access_token(
+                {
+                    "sub": str(user.id),
+                    "sid": family_id,
+                    "pwd": password_marker(user.hashed_password),
+                }
+            ),
+            refresh_token=refresh_token,
+            expires_in=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+        )
+
+    async def refresh(self, db: AsyncSession, refresh_token: str) -> Token:
+        """轮换刷新令牌：旧令牌作废并签发新的一对，只按摘要查询一次索引。"""
+        now = datetime.utcnow()
+        stored = await refresh_token_repository.get_by_hash(
+            db, hash_refresh_token(refresh_token)
+        )
+        if stored is None or stored.expires_at <= now:
+            raise self._invalid_refresh_token()
+        if stored.revoked_at is not None or not await refresh_token_repository.revoke(
+            db, stored.id, now
+        ):
+            # 已轮换的令牌再次出现，说明令牌可能泄露：吊销整个会话。
+            # 先提交再抛出异常，否则 get_db 会回滚吊销
+            await self._revoke_family(db, stored.family_id, now)
+            await db.commit()
+            raise self._invalid_refresh_token()
+        # 新访问令牌需要带上当前的密码标记；修改密码时会话已被吊销，走不到这里
+        user = await user_repository.get_by_id(db, stored.user_id)
+        if user is None:
+            raise self._invalid_refresh_token()
+        return await self.issue_tokens(db, user, stored.family_id)
+
+    async def logout(self, db: AsyncSession, refresh_token: str) -> None:
+        stored = await refresh_token_repository.get_by_hash(
+            db, hash_refresh_token(refresh_token)
+        )
+        if stored is not None:
+            await self._revoke_family(db, stored.family_id, datetime.utcnow())
+
+    async def _revoke_family(
+        self, db: AsyncSession, family_id: str, now: datetime
+    ) -> None:
+        await refresh_token_repository.revoke_family(db, family_id, now)
+        # 该会话已签发的访问令牌在过期前也一并拒绝（仅当前进程）
+        principal_cache.revoke_session(family_id)
+
+    def _invalid_refresh_token(self) -> HTTPException:
+        return HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="刷新令牌无效或已过期",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
 
     async def create_initial_admin(
         self, db: AsyncSession, username: str, password: str
     ) -> None:
+        """确保配置的管理员存在，且密码与角色和配置一致。
+
+        配置的密码与库中哈希一致且角色正确时不写库，只有密码不同才重新哈希。
+        """
         existing = await user_repository.get_by_username(db, username)
         if existing:
-            # 如果用户已存在，更新密码以确保配置中的密码生效
-            existing.hashed_password = get_password_hash(password)
+            # 用 bcrypt 校验而不保存明文密码的快速摘要，避免库泄露后被离线爆破
+            if await verify_password_async(password, existing.hashed_password):
+                if existing.role == "admin":
+                    return
+            else:
+                existing.hashed_password = await get_password_hash_async(password)
             existing.role = "admin"  # 确保角色是 admin
             await user_repository.update(db, existing)
-            return
-        admin = User(
-            username=username,
-            hashed_password=get_password_hash(password),
-            role="admin",
-        )
-        await user_repository.create(db, admin)
+        else:
+            await user_repository.create(
+                db,
+                User(
+                    username=username,
+                    hashed_password=await get_password_hash_async(password),
+                    role="admin",
+                ),
+            )
 
 
 auth_service = AuthService()
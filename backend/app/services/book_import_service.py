@@ -0,0 +1,105 @@
+import time
+from collections.abc import AsyncIterator
+from typing import Any
+
+from pydantic import ValidationError
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.bulk_io import RowParseError, format_validation_error
+from app.core.catalog_cache import catalog_cache
+from app.core.events import book_events
+from app.repositories.book_repository import book_repository
+from app.repositories.book_search_repository import book_search_repository
+from app.schemas.book import BookCreate
+from app.schemas.bulk import ImportReport
+
+
+class BookImportService:
+    async def import_records(
+        self,
+        db: AsyncSession,
+        records: AsyncIterator[tuple[int, dict[str, Any] | RowParseError]],
+        chunk_size: int,
+    ) -> ImportReport:
+        report = ImportReport()
+        started = time.perf_counter()
+        # book_no -> (行号, 数据)；同一批内的重复编号在入批时即被拒绝
+        chunk: dict[str, tuple[int, dict[str, Any]]] = {}
+        async for row, record in records:
+            report.total += 1
+            if isinstance(record, RowParseError):
+                report.failed += 1
+                report.add_error(row, str(record))
+                continue
+            try:
+                data = BookCreate.model_validate(record)
+            except ValidationError as e:
+                report.failed += 1
+                report.add_error(row, format_validation_error(e))
+                continue
+            if data.book_no in chunk:
+                report.skipped += 1
+                report.add_error(row, f"文件内图书编号重复: {data.book_no}")
+                continue
+            chunk[data.book_no] = (row, data.model_dump())
+            if len(chunk) >= chunk_size:
+                await self._flush(db, chunk, report)
+                chunk = {}
+        if chunk:
+            await self._flush(db, chunk, report)
+        return report.finish(time.perf_counter() - started)
+
+    async def _flush(
+        self,
+        db: AsyncSession,
+        chunk: dict[str, tuple[int, dict[str, Any]]],
+        report: ImportReport,
+    ) -> None:
+        existing = await book_repository.get_existing_book_nos(db, list(chunk))
+        for book_no in existing:
+            self._skip_existing(chunk, book_no, report)
+        if not chunk:
+            return
+        try:
+            await book_repository.bulk_insert(db, [data for _, data in chunk.values()])
+        except IntegrityError:
+            # 检查之后有其他请求插入了同编号的图书：回滚本批后逐行插入
+            await db.rollback()
+            await self._insert_rows(db, chunk, report)
+            if not chunk:
+                return
+        await book_search_repository.index_book_nos(db, list(chunk))
+        catalog_cache.invalidate_on_commit(db)
+        # 批量导入不逐本推送，客户端收到后整体刷新列表
+        book_events.publish_on_commit(db, "imported", {"count": len(chunk)})
+        # 每批单独提交：导入中途失败时已完成的批次得以保留，也不会长时间占用写锁
+        await db.commit()
+        report.inserted += len(chunk)
+
+    def _skip_existing(
+        self,
+        chunk: dict[str, tuple[int, dict[str, Any]]],
+        book_no: str,
+        report: ImportReport,
+    ) -> None:
+        row, _ = chunk.pop(book_no)
+        report.skipped += 1
+        report.add_error(row, f"图书编号已存在: {book_no}")
+
+    async def _insert_rows(
+        self,
+        db: AsyncSession,
+        chunk: dict[str, tuple[int, dict[str, Any]]],
+        report: ImportReport,
+    ) -> None:
+        # 每行一个 SAVEPOINT，冲突只回滚该行；book_no 是唯一的唯一约束
+        for book_no, (_, data) in list(chunk.items()):
+            try:
+                async with db.begin_nested():
+                    await book_repository.bulk_insert(db, [data])
+            except IntegrityError:
+                self._skip_existing(chunk, book_no, report)
+
+
+book_import_service = BookImportService()
@@ -1,13 +1,20 @@
-from datetime import datetime
-
 from fastapi import HTTPException
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.catalog_cache import catalog_cache
+from app.core.database import mark_recent_writer
+from app.core.events import book_events
+from app.core.pagination import Page
+from app.core.principal_cache import Principal
 from app.models.book import Book
 from app.models.borrow_record import BorrowRecord
 from app.repositories.book_repository import book_repository
+from app.repositories.book_search_repository import book_search_repository
 from app.repositories.borrow_repository import borrow_repository
-from app.schemas.book import BookCreate, BookUpdate
+from app.repositories.projections import BookRow, BorrowRecordRow, UserRow, to_row
+from app.repositories.stats_repository import stats_repository
+from app.schemas.book import DEFAULT_BOOK_SORT, BookCreate, BookFilters, BookUpdate
 
 
 class BookService:
@@ -22,7 +29,13 @@ class BookService:
             isbn=data.isbn,
             publisher=data.publisher,
         )
-        return await book_repository.create(db, book)
+        book = await book_repository.create(db, book)
+        await book_search_repository.index(db, book)
+        catalog_cache.invalidate_on_commit(db)
+        book_events.publish_on_commit(
+            db, "created", {"book_id": book.id, "status": book.status}
+        )
+        return book
 
     async def update_book(
         self, db: AsyncSession, book_id: int, data: BookUpdate
@@ -37,7 +50,13 @@ class BookService:
         update_data = data.model_dump(exclude_unset=True)
         for field, value in update_data.items():
             setattr(book, field, value)
-        return await book_repository.update(db, book)
+        book = await book_repository.update(db, book)
+        await book_search_repository.reindex(db, book)
+        catalog_cache.invalidate_on_commit(db)
+        book_events.publish_on_commit(
+            db, "updated", {"book_id": book.id, "status": book.status}
+        )
+        return book
 
     async def delete_book(self, db: AsyncSession, book_id: int) -> None:
         book = await book_repository.get_by_id(db, book_id)
@@ -45,10 +64,37 @@ class BookService:
             raise HTTPException(status_code=404, detail="图书不存在")
         if book.status == "borrowed":
             raise HTTPException(status_code=400, detail="图书正在借阅中，无法删除")
+        await book_search_repository.remove(db, book.id)
         await book_repository.delete(db, book)
+        catalog_cache.invalidate_on_commit(db)
+        book_events.publish_on_commit(db, "deleted", {"book_id": book_id})
 
-    async def get_all(self, db: AsyncSession) -> list[Book]:
-        return await book_repository.get_all(db)
+    async def get_all(
+        self,
+        db: AsyncSession,
+        limit: int,
+        cursor: str | None = None,
+        filters: BookFilters | None = None,
+        sort: str = DEFAULT_BOOK_SORT,
+    ) -> Page[Book]:
+        return await book_repository.get_all(db, limit, cursor, filters, sort)
+
+    async def get_facets(
+        self, db: AsyncSession, filters: BookFilters | None = None
+    ) -> dict[str, list[dict]]:
+        """按状态、出版社分组计数。
+
+        每个维度的计数不应用该维度自身的筛选，客户端据此展示切换取值后的数量。
+        """
+        by_status = await book_repository.count_by_status(db, filters)
+        by_publisher = await book_repository.count_by_publisher(db, filters)
+        return {
+            "status": [{"value": v, "count": n} for v, n in by_status],
+            "publisher": [{"value": v, "count": n} for v, n in by_publisher],
+        }
+
+    async def search(self, db: AsyncSession, query: str, limit: int) -> list[Book]:
+        return await book_search_repository.search(db, query, limit)
 
     async def get_by_id(self, db: AsyncSession, book_id: int) -> Book:
         book = await book_repository.get_by_id(db, book_id)
@@ -57,41 +103,68 @@ class BookService:
         return book
 
     async def borrow_book(
-        self, db: AsyncSession, book_id: int, user_id: int
-    ) -> BorrowRecord:
-        book = await book_repository.get_by_id(db, book_id)
+        self, db: AsyncSession, book_id: int, user: Principal
+    ) -> BorrowRecordRow:
+        book = await book_repository.transition_status(
+            db, book_id, "available", "borrowed"
+        )
         if not book:
-            raise HTTPException(status_code=404, detail="图书不存在")
-        if book.status == "borrowed":
+            if not await book_repository.get_by_id(db, book_id):
+                raise HTTPException(status_code=404, detail="图书不存在")
             raise HTTPException(status_code=400, detail="图书已被借出")
-        # Check borrow limit: max 1 book per user
-        active_borrow = await borrow_repository.get_active_by_user(db, user_id)
-        if active_borrow:
-            raise HTTPException(
-                status_code=400, detail="您已借阅一本图书，请归还后再借阅"
-            )
-        # Create borrow record
-        record = BorrowRecord(book_id=book_id, user_id=user_id)
-        record = await borrow_repository.create(db, record)
-        # Update book status
-        book.status = "borrowed"
-        await book_repository.update(db, book)
-        return record
+        try:
+            record = await borrow_repository.open_loan(db, book_id, user.id)
+        except IntegrityError as e:
+            # 部分唯一索引保证每个用户最多一条未归还记录
+            if "user_id" in str(e.orig) or "active_user" in str(e.orig):
+                raise HTTPException(
+                    status_code=400, detail="您已借阅一本图书，请归还后再借阅"
+                ) from e
+            raise HTTPException(status_code=400, detail="图书已被借出") from e
+        # 统计汇总与借阅记录同一事务提交，失败时一并回滚
+        await stats_repository.record_loan(db, book_id, user.id, record.borrow_time)
+        catalog_cache.invalidate_on_commit(db)
+        book_events.publish_on_commit(
+            db, "borrowed", {"book_id": book_id, "status": "borrowed"}
+        )
+        mark_recent_writer(db, user.id)
+        return await self._attach(db, record, book, user)
 
     async def return_book(
-        self, db: AsyncSession, book_id: int, user_id: int
-    ) -> BorrowRecord:
-        book = await book_repository.get_by_id(db, book_id)
-        if not book:
-            raise HTTPException(status_code=404, detail="图书不存在")
-        active = await borrow_repository.get_active_by_book(db, book_id)
-        if not active or active.user_id != user_id:
+        self, db: AsyncSession, book_id: int, user: Principal
+    ) -> BorrowRecordRow:
+        record = await borrow_repository.close_loan(db, book_id, user.id)
+        if not record:
+            if not await book_repository.get_by_id(db, book_id):
+                raise HTTPException(status_code=404, detail="图书不存在")
             raise HTTPException(status_code=400, detail="您未借阅此图书")
-        active.return_time = datetime.utcnow()
-        await borrow_repository.update(db, active)
-        book.status = "available"
-        await book_repository.update(db, book)
-        return active
+        book = await book_repository.transition_status(
+            db, book_id, "borrowed", "available"
+        )
+        await stats_repository.record_return(db, record.return_time)
+        catalog_cache.invalidate_on_commit(db)
+        book_events.publish_on_commit(
+            db, "returned", {"book_id": book_id, "status": "available"}
+        )
+        mark_recent_writer(db, user.id)
+        return await self._attach(db, record, book, user)
+
+    async def _attach(
+        self,
+        db: AsyncSession,
+        record: BorrowRecord,
+        book: Book | None,
+        user: Principal,
+    ) -> BorrowRecordRow:
+        # 响应直接由已取得的对象构造：借阅人就是当前用户，认证时已取得所需字段
+        if book is None:
+            book = await book_repository.get_by_id(db, record.book_id)
+        return to_row(
+            BorrowRecordRow,
+            record,
+            book=to_row(BookRow, book),
+            user=to_row(UserRow, user),
+        )
 
 
 book_service = BookService()
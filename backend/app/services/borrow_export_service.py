@@ -0,0 +1,55 @@
+import csv
+import io
+import json
+from collections.abc import AsyncIterator, Sequence
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import Row
+
+from app.core.database import AsyncReadSessionLocal
+from app.repositories.borrow_repository import HISTORY_COLUMNS, borrow_repository
+
+EXPORT_BATCH_SIZE = 1000
+EXPORT_COLUMNS = tuple(column.key for column in HISTORY_COLUMNS)
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv; charset=utf-8"}
+
+
+def _to_dict(row: Row) -> dict[str, Any]:
+    return {
+        key: value.isoformat() if isinstance(value, datetime) else value
+        for key, value in row._asdict().items()
+    }
+
+
+def _encode_ndjson(rows: Sequence[Row]) -> bytes:
+    lines = [json.dumps(_to_dict(row), ensure_ascii=False) for row in rows]
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def _encode_csv(rows: Sequence[Row] | None) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if rows is None:
+        writer.writerow(EXPORT_COLUMNS)
+    else:
+        writer.writerows(_to_dict(row).values() for row in rows)
+    return buffer.getvalue().encode("utf-8")
+
+
+class BorrowExportService:
+    async def export_history(
+        self, fmt: str, start: datetime | None, end: datetime | None
+    ) -> AsyncIterator[bytes]:
+        # 响应开始后请求级会话可能已关闭，因此在生成器内自行管理会话
+        if fmt == "csv":
+            yield "﻿".encode() + _encode_csv(None)
+        encode = _encode_csv if fmt == "csv" else _encode_ndjson
+        async with AsyncReadSessionLocal() as db:
+            async for rows in borrow_repository.stream_history(
+                db, start, end, EXPORT_BATCH_SIZE
+            ):
+                yield encode(rows)
+
+
+borrow_export_service = BorrowExportService()
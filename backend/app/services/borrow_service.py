@@ -1,28 +1,52 @@
+from collections.abc import Collection
+
 from fastapi import HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.pagination import Page
 from app.models.borrow_record import BorrowRecord
-from app.repositories.borrow_repository import borrow_repository
+from app.repositories.borrow_repository import RELATIONS, borrow_repository
+from app.repositories.projections import BorrowRecordRow
 
 
 class BorrowService:
     async def get_user_records(
-        self, db: AsyncSession, user_id: int
-    ) -> list[BorrowRecord]:
-        return await borrow_repository.get_by_user(db, user_id)
+        self,
+        db: AsyncSession,
+        user_id: int,
+        limit: int,
+        cursor: str | None = None,
+        relations: Collection[str] = RELATIONS,
+    ) -> Page[BorrowRecordRow]:
+        return await borrow_repository.get_by_user(
+            db, user_id, limit, cursor, relations
+        )
 
     async def get_book_records(
-        self, db: AsyncSession, book_id: int
-    ) -> list[BorrowRecord]:
-        return await borrow_repository.get_by_book(db, book_id)
-
-    async def get_all_records(self, db: AsyncSession) -> list[BorrowRecord]:
-        return await borrow_repository.get_all(db)
+        self,
+        db: AsyncSession,
+        book_id: int,
+        limit: int,
+        cursor: str | None = None,
+        relations: Collection[str] = RELATIONS,
+    ) -> Page[BorrowRecordRow]:
+        return await borrow_repository.get_by_book(
+            db, book_id, limit, cursor, relations
+        )
+
+    async def get_all_records(
+        self,
+        db: AsyncSession,
+        limit: int,
+        cursor: str | None = None,
+        relations: Collection[str] = RELATIONS,
+    ) -> Page[BorrowRecordRow]:
+        return await borrow_repository.get_all(db, limit, cursor, relations)
 
     async def update_note(
         self, db: AsyncSession, record_id: int, user_id: int, note: str
     ) -> BorrowRecord:
-        record = await borrow_repository.get_by_id(db, record_id)
+        record = await borrow_repository.get_by_id(db, record_id, with_relations=True)
         if not record:
             raise HTTPException(status_code=404, detail="借阅记录不存在")
         if record.user_id != user_id:
@@ -0,0 +1,190 @@
+from fastapi import HTTPException
+from sqlalchemy import Row
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.catalog_cache import catalog_cache
+from app.core.database import mark_recent_writer
+from app.core.events import book_events
+from app.models.borrow_record import BorrowRecord
+from app.repositories.book_repository import book_repository
+from app.repositories.borrow_repository import borrow_repository
+from app.repositories.stats_repository import stats_repository
+from app.repositories.user_repository import user_repository
+from app.schemas.circulation import (
+    MAX_BATCH_ITEMS,
+    BatchCirculationRequest,
+    BatchCirculationResult,
+    CirculationItemResult,
+)
+
+
+class CirculationService:
+    """前台批量借还：整批在一个事务内完成，语句数与条数无关。
+
+    先用一次 IN 查询解析全部图书，再以集合式的条件更新/多行插入变更状态，
+    逐条给出结果；单条失败不影响其余条目。
+    """
+
+    async def batch(
+        self, db: AsyncSession, request: BatchCirculationRequest
+    ) -> BatchCirculationResult:
+        if not request.items:
+            raise HTTPException(status_code=400, detail="请至少提供一本图书")
+        if len(request.items) > MAX_BATCH_ITEMS:
+            raise HTTPException(
+                status_code=400, detail=f"单次最多处理 {MAX_BATCH_ITEMS} 本图书"
+            )
+        results = [
+            CirculationItemResult(index=i, book_id=item.book_id, book_no=item.book_no)
+            for i, item in enumerate(request.items)
+        ]
+        books = await self._resolve(db, request, results)
+        if request.action == "borrow":
+            await self._borrow(db, request, results, books)
+        else:
+            await self._return(db, results, books)
+        succeeded = sum(r.ok for r in results)
+        return BatchCirculationResult(
+            action=request.action,
+            total=len(results),
+            succeeded=succeeded,
+            failed=len(results) - succeeded,
+            items=results,
+        )
+
+    async def _resolve(
+        self,
+        db: AsyncSession,
+        request: BatchCirculationRequest,
+        results: list[CirculationItemResult],
+    ) -> dict[int, Row]:
+        """按 id 或条码解析图书，返回 条目序号 -> 图书；无法处理的条目直接记为失败。"""
+        rows = await book_repository.get_by_ids_or_book_nos(
+            db,
+            {i.book_id for i in request.items if i.book_id is not None},
+            {i.book_no for i in request.items if i.book_no is not None},
+        )
+        by_id = {row.id: row for row in rows}
+        by_no = {row.book_no: row for row in rows}
+        books: dict[int, Row] = {}
+        seen: set[int] = set()
+        for index, item in enumerate(request.items):
+            result = results[index]
+            if (item.book_id is None) == (item.book_no is None):
+                result.error = "book_id 与 book_no 须填写其一"
+                continue
+            book = by_id.get(item.book_id) or by_no.get(item.book_no)
+            if book is None:
+                result.error = "图书不存在"
+                continue
+            result.book_id, result.book_no = book.id, book.book_no
+            if book.id in seen:
+                result.error = "同一批次中重复的图书"
+                continue
+            seen.add(book.id)
+            books[index] = book
+        return books
+
+    async def _borrow(
+        self,
+        db: AsyncSession,
+        request: BatchCirculationRequest,
+        results: list[CirculationItemResult],
+        books: dict[int, Row],
+    ) -> None:
+        borrowers = {
+            index: request.items[index].user_id or request.user_id for index in books
+        }
+        user_ids = {u for u in borrowers.values() if u is not None}
+        existing = await user_repository.get_existing_ids(db, user_ids)
+        # 每个用户最多一条未归还记录：已有借阅的用户与本批次中重复的用户均不能再借
+        busy = await borrow_repository.get_users_with_active_loans(db, existing)
+        candidates: dict[int, tuple[int, int]] = {}
+        for index, book in books.items():
+            result, user_id = results[index], borrowers[index]
+            result.user_id = user_id
+            if user_id is None:
+                result.error = "未指定借阅人"
+            elif user_id not in existing:
+                result.error = "用户不存在"
+            elif book.status != "available":
+                result.error = "图书已被借出"
+            elif user_id in busy:
+                result.error = "该用户已借阅一本图书，请归还后再借阅"
+            else:
+                busy.add(user_id)
+                candidates[index] = (book.id, user_id)
+        if not candidates:
+            return
+
+        # 条件更新只对仍为 available 的图书生效，并发借出的图书在此落选
+        borrowed = await book_repository.transition_statuses(
+            db, [book_id for book_id, _ in candidates.values()], "available", "borrowed"
+        )
+        loans = []
+        for index, (book_id, user_id) in candidates.items():
+            if book_id in borrowed:
+                loans.append((book_id, user_id))
+            else:
+                results[index].error = "图书已被借出"
+        if not loans:
+            return
+        try:
+            records = await borrow_repository.open_loans(db, loans)
+        except IntegrityError as e:
+            # 检查之后有并发借阅占用了同一用户：整批回滚，由前台重试
+            raise HTTPException(
+                status_code=409, detail="借阅状态已变化，请重新提交"
+            ) from e
+
+        by_book = {record.book_id: record for record in records}
+        for index, (book_id, _) in candidates.items():
+            record = by_book.get(book_id)
+            if record is not None:
+                result = results[index]
+                result.ok, result.record_id = True, record.id
+                result.due_time = record.due_time
+        await stats_repository.record_loans(db, loans, records[0].borrow_time)
+        self._after_change(db, records, "borrowed")
+
+    async def _return(
+        self,
+        db: AsyncSession,
+        results: list[CirculationItemResult],
+        books: dict[int, Row],
+    ) -> None:
+        if not books:
+            return
+        records = await borrow_repository.close_loans(
+            db, [book.id for book in books.values()]
+        )
+        by_book = {record.book_id: record for record in records}
+        for index, book in books.items():
+            result, record = results[index], by_book.get(book.id)
+            if record is None:
+                result.error = "图书未被借出"
+                continue
+            result.ok, result.record_id = True, record.id
+            result.user_id, result.due_time = record.user_id, record.due_time
+        if not records:
+            return
+        await book_repository.transition_statuses(
+            db, list(by_book), "borrowed", "available"
+        )
+        await stats_repository.record_return(db, records[0].return_time, len(records))
+        self._after_change(db, records, "returned")
+
+    def _after_change(
+        self, db: AsyncSession, records: list[BorrowRecord], event_type: str
+    ) -> None:
+        status = "borrowed" if event_type == "borrowed" else "available"
+        catalog_cache.invalidate_on_commit(db)
+        for record in records:
+            book_events.publish_on_commit(
+                db, event_type, {"book_id": record.book_id, "status": status}
+            )
+        mark_recent_writer(db, *(record.user_id for record in records))
+
+
+circulation_service = CirculationService()
@@ -0,0 +1,55 @@
+import asyncio
+import logging
+from collections.abc import Collection
+from datetime import datetime
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.core.database import AsyncSessionLocal
+from app.core.pagination import Page
+from app.repositories.borrow_repository import RELATIONS, borrow_repository
+from app.repositories.projections import BorrowRecordRow
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+
+class OverdueService:
+    async def get_overdue(
+        self,
+        db: AsyncSession,
+        limit: int,
+        cursor: str | None = None,
+        relations: Collection[str] = RELATIONS,
+    ) -> Page[BorrowRecordRow]:
+        return await borrow_repository.get_overdue(
+            db, datetime.utcnow(), limit, cursor, relations
+        )
+
+    async def sweep(self, batch_size: int = settings.OVERDUE_SWEEP_BATCH_SIZE) -> int:
+        """分批标记逾期记录，每批单独提交以缩短写锁持有时间，返回标记总数。"""
+        now = datetime.utcnow()
+        total = 0
+        while True:
+            async with AsyncSessionLocal() as db:
+                marked = await borrow_repository.mark_overdue(db, now, batch_size)
+                await db.commit()
+            total += marked
+            if marked < batch_size:
+                return total
+            # 批次之间让出事件循环，避免长时间占用写连接
+            await asyncio.sleep(0)
+
+    async def run_periodically(self, interval: float) -> None:
+        # 标记操作是幂等的，多个 worker 进程同时运行也不会重复计数
+        while True:
+            try:
+                await self.sweep()
+            except Exception:
+                logger.exception("逾期扫描失败")
+            await asyncio.sleep(interval)
+
+
+overdue_service = OverdueService()
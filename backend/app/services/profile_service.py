@@ -0,0 +1,62 @@
+from fastapi import HTTPException, status
+
+from app.core.profiling import Profile, profile_store
+from app.schemas.profile import (
+    ProfileDetail,
+    ProfiledStatement,
+    ProfileSummary,
+    StackSample,
+)
+
+TOP_STACKS = 20
+
+
+def _summary_fields(profile: Profile) -> dict:
+    return {
+        "id": profile.id,
+        "method": profile.method,
+        "path": profile.path,
+        "status": profile.status,
+        "started_at": profile.started_at,
+        "duration_ms": round(profile.duration_ms, 3),
+        "statement_count": len(profile.statements),
+        "statement_ms": round(sum(s.duration_ms for s in profile.statements), 3),
+        "samples": sum(profile.samples.values()),
+    }
+
+
+class ProfileService:
+    def list_profiles(self) -> list[ProfileSummary]:
+        return [ProfileSummary(**_summary_fields(p)) for p in profile_store.list()]
+
+    def get_profile(self, profile_id: str) -> Profile:
+        profile = profile_store.get(profile_id)
+        if profile is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="剖析结果不存在或已过期",
+            )
+        return profile
+
+    def get_detail(self, profile_id: str) -> ProfileDetail:
+        profile = self.get_profile(profile_id)
+        return ProfileDetail(
+            **_summary_fields(profile),
+            sample_interval_ms=profile.sample_interval_ms,
+            statements=[
+                ProfiledStatement(
+                    engine=s.engine, sql=s.sql, duration_ms=round(s.duration_ms, 3)
+                )
+                for s in profile.statements
+            ],
+            top_stacks=[
+                StackSample(stack=stack, samples=count)
+                for stack, count in profile.samples.most_common(TOP_STACKS)
+            ],
+        )
+
+    def get_folded(self, profile_id: str) -> str:
+        return self.get_profile(profile_id).folded()
+
+
+profile_service = ProfileService()
@@ -0,0 +1,49 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.circulation_stats import CURRENTLY_BORROWED
+from app.repositories.stats_repository import stats_repository
+from app.schemas.stats import BookLoans, CirculationStats, DailyLoans, UserLoans
+
+
+class StatsService:
+    async def get_circulation(
+        self, db: AsyncSession, days: int, top: int
+    ) -> CirculationStats:
+        # 借阅时间按 UTC 记录，日期口径与之保持一致
+        today = datetime.utcnow().date()
+        since = today - timedelta(days=days - 1)
+        stored = {s.day: s for s in await stats_repository.get_daily(db, since)}
+        daily = []
+        for offset in range(days):
+            day = since + timedelta(days=offset)
+            stat = stored.get(day)
+            daily.append(
+                DailyLoans(
+                    day=day,
+                    loans=stat.loans if stat else 0,
+                    returns=stat.returns if stat else 0,
+                )
+            )
+        return CirculationStats(
+            currently_borrowed=await stats_repository.get_counter(
+                db, CURRENTLY_BORROWED
+            ),
+            daily=daily,
+            top_books=[
+                BookLoans.model_validate(row._mapping)
+                for row in await stats_repository.get_top_books(db, top)
+            ],
+            top_users=[
+                UserLoans.model_validate(row._mapping)
+                for row in await stats_repository.get_top_users(db, top)
+            ],
+        )
+
+    async def rebuild(self, db: AsyncSession) -> None:
+        await stats_repository.rebuild(db)
+        await db.commit()
+
+
+stats_service = StatsService()
@@ -0,0 +1,120 @@
+import logging
+import time
+from collections.abc import AsyncIterator, Callable
+from typing import Any
+
+from pydantic import ValidationError
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.bulk_io import RowParseError, format_validation_error
+from app.core.security import hash_passwords_parallel
+from app.repositories.user_repository import user_repository
+from app.schemas.bulk import ImportReport
+from app.schemas.user import UserCreate
+
+logger = logging.getLogger(__name__)
+
+ProgressCallback = Callable[[ImportReport], None]
+
+
+class UserImportService:
+    async def import_records(
+        self,
+        db: AsyncSession,
+        records: AsyncIterator[tuple[int, dict[str, Any] | RowParseError]],
+        chunk_size: int,
+        on_progress: ProgressCallback | None = None,
+    ) -> ImportReport:
+        report = ImportReport()
+        started = time.perf_counter()
+        # username -> (行号, 数据)；同一批内的重复用户名在入批时即被拒绝
+        chunk: dict[str, tuple[int, UserCreate]] = {}
+        async for row, record in records:
+            report.total += 1
+            if isinstance(record, RowParseError):
+                report.failed += 1
+                report.add_error(row, str(record))
+                continue
+            try:
+                data = UserCreate.model_validate(record)
+            except ValidationError as e:
+                report.failed += 1
+                report.add_error(row, format_validation_error(e))
+                continue
+            if data.role not in ("admin", "user"):
+                report.failed += 1
+                report.add_error(row, f"无效的角色: {data.role}")
+                continue
+            if data.username in chunk:
+                report.skipped += 1
+                report.add_error(row, f"文件内用户名重复: {data.username}")
+                continue
+            chunk[data.username] = (row, data)
+            if len(chunk) >= chunk_size:
+                await self._flush(db, chunk, report)
+                chunk = {}
+                self._progress(report, on_progress)
+        if chunk:
+            await self._flush(db, chunk, report)
+            self._progress(report, on_progress)
+        return report.finish(time.perf_counter() - started)
+
+    def _progress(
+        self, report: ImportReport, on_progress: ProgressCallback | None
+    ) -> None:
+        logger.info(
+            "批量开户：已处理 %d 行，新增 %d，跳过 %d，失败 %d",
+            report.total,
+            report.inserted,
+            report.skipped,
+            report.failed,
+        )
+        if on_progress is not None:
+            on_progress(report)
+
+    async def _drop_existing(
+        self,
+        db: AsyncSession,
+        chunk: dict[str, tuple[int, UserCreate]],
+        report: ImportReport,
+    ) -> None:
+        existing = await user_repository.get_existing_usernames(db, list(chunk))
+        for username in existing:
+            row, _ = chunk.pop(username)
+            report.skipped += 1
+            report.add_error(row, f"用户名已存在: {username}")
+
+    async def _flush(
+        self,
+        db: AsyncSession,
+        chunk: dict[str, tuple[int, UserCreate]],
+        report: ImportReport,
+    ) -> None:
+        await self._drop_existing(db, chunk, report)
+        # 哈希一批密码需要数秒，先结束查询事务，期间不占用写连接
+        await db.commit()
+        if not chunk:
+            return
+        hashes = await hash_passwords_parallel(
+            [data.password for _, data in chunk.values()]
+        )
+        rows = [
+            {"username": username, "hashed_password": hashed, "role": data.role}
+            for (username, (_, data)), hashed in zip(chunk.items(), hashes, strict=True)
+        ]
+        try:
+            await user_repository.bulk_insert(db, rows)
+            await db.commit()
+        except IntegrityError:
+            # 哈希期间有其他请求创建了同名用户：剔除冲突行后重试一次
+            await db.rollback()
+            await self._drop_existing(db, chunk, report)
+            rows = [r for r in rows if r["username"] in chunk]
+            if rows:
+                await user_repository.bulk_insert(db, rows)
+            await db.commit()
+        report.inserted += len(chunk)
+
+
+user_import_service = UserImportService()
@@ -1,8 +1,13 @@
+from datetime import datetime
+
 from fastapi import HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.security import get_password_hash, verify_password
+from app.core.pagination import Page
+from app.core.principal_cache import principal_cache
+from app.core.security import get_password_hash_async, verify_password_async
 from app.models.user import User
+from app.repositories.refresh_token_repository import refresh_token_repository
 from app.repositories.user_repository import user_repository
 from app.schemas.user import UserCreate
 
@@ -16,21 +21,33 @@ class UserService:
             raise HTTPException(status_code=400, detail="无效的角色")
         user = User(
             username=data.username,
-            hashed_password=get_password_hash(data.password),
+            hashed_password=await get_password_hash_async(data.password),
             role=data.role,
         )
         return await user_repository.create(db, user)
 
-    async def get_all(self, db: AsyncSession) -> list[User]:
-        return await user_repository.get_all(db)
+    async def get_all(
+        self, db: AsyncSession, limit: int, cursor: str | None = None
+    ) -> Page[User]:
+        return await user_repository.get_all(db, limit, cursor)
 
     async def change_password(
-        self, db: AsyncSession, user: User, old_password: str, new_password: str
+        self, db: AsyncSession, user_id: int, old_password: str, new_password: str
     ) -> User:
-        if not verify_password(old_password, user.hashed_password):
+        user = await user_repository.get_by_id(db, user_id)
+        if not user:
+            raise HTTPException(status_code=404, detail="用户不存在")
+        if not await verify_password_async(old_password, user.hashed_password):
             raise HTTPException(status_code=400, detail="原密码错误")
-        user.hashed_password = get_password_hash(new_password)
-        return await user_repository.update(db, user)
+        user.hashed_password = await get_password_hash_async(new_password)
+        user = await user_repository.update(db, user)
+        # 同一事务内吊销全部登录会话：泄露的刷新令牌不能再换取访问令牌
+        sessions = await refresh_token_repository.revoke_user(
+            db, user.id, datetime.utcnow()
+        )
+        principal_cache.invalidate_on_commit(db, user.id)
+        principal_cache.revoke_sessions_on_commit(db, sessions)
+        return user
 
     async def update_role(self, db: AsyncSession, user_id: int, role: str) -> User:
         if role not in ("admin", "user"):
@@ -39,7 +56,9 @@ class UserService:
         if not user:
             raise HTTPException(status_code=404, detail="用户不存在")
         user.role = role
-        return await user_repository.update(db, user)
+        user = await user_repository.update(db, user)
+        principal_cache.invalidate_on_commit(db, user.id)
+        return user
 
 
 user_service = UserService()
@@ -0,0 +1,143 @@
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+from benchmarks.scale import SCALES, Scale
+
+DEFAULT_SCENARIOS = (
+    "login",
+    "refresh",
+    "list_books",
+    "book_detail",
+    "search_books",
+    "borrow_return",
+    "my_records",
+    "book_records",
+    "circulation_stats",
+)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks", description="进程内驱动后端的负载与延迟基准"
+    )
+    parser.add_argument("--scale", choices=SCALES, default="10k")
+    parser.add_argument("--books", type=int, help="覆盖 --scale 的图书数")
+    parser.add_argument("--users", type=int, help="覆盖 --scale 的用户数")
+    parser.add_argument("--records", type=int, help="覆盖 --scale 的借阅记录数")
+    parser.add_argument(
+        "--scenarios",
+        default=",".join(DEFAULT_SCENARIOS),
+        help="逗号分隔的场景列表",
+    )
+    parser.add_argument("--requests", type=int, default=1000, help="每个场景的请求数")
+    parser.add_argument(
+        "--login-requests",
+        type=int,
+        default=100,
+        help="登录场景的请求数（bcrypt 开销大，单独设置）",
+    )
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--warmup", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=42, help="随机数种子")
+    parser.add_argument(
+        "--database-url",
+        help="默认每次使用新的临时 SQLite 库；指定已有库时复用其中的数据",
+    )
+    parser.add_argument(
+        "--output", type=Path, help="结果 JSON 写入文件，默认输出到终端"
+    )
+    parser.add_argument(
+        "--query-budgets",
+        action="store_true",
+        help="只检查各接口单次请求的 SQL 语句数预算，超出时返回非零状态",
+    )
+    parser.add_argument(
+        "--startup",
+        action="store_true",
+        help="只测量从启动进程到完成首个请求的时间，超出目标时返回非零状态",
+    )
+    parser.add_argument(
+        "--startup-target-ms",
+        type=float,
+        default=2000,
+        help="已初始化数据库时单进程启动的目标耗时",
+    )
+    parser.add_argument(
+        "--startup-workers", type=int, default=4, help="同时启动的 worker 进程数"
+    )
+    return parser.parse_args()
+
+
+def check_budgets(scale: Scale, rng_seed: int) -> int:
+    # 关闭进程内缓存，使每次请求的语句数稳定可比
+    os.environ["CATALOG_CACHE_ENABLED"] = "false"
+    os.environ["AUTH_CACHE_ENABLED"] = "false"
+    from benchmarks.budgets import check_query_budgets
+
+    lines, passed = asyncio.run(check_query_budgets(scale, rng_seed))
+    sys.stdout.write("\n".join(lines) + "\n")
+    return 0 if passed else 1
+
+
+def main() -> None:
+    args = parse_args()
+    scenarios = [s.strip() for s in args.scenarios.split(",") if s.strip()]
+    unknown = set(scenarios).difference(DEFAULT_SCENARIOS)
+    if unknown:
+        raise SystemExit(f"未知场景: {', '.join(sorted(unknown))}")
+    base = SCALES[args.scale]
+    scale = Scale(
+        books=args.books or base.books,
+        users=args.users or base.users,
+        records=args.records if args.records is not None else base.records,
+    )
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # 配置在导入 app 时读取，因此必须先设置环境变量
+        os.environ["DATABASE_URL"] = (
+            args.database_url or f"sqlite+aiosqlite:///{Path(tmp) / 'bench.db'}"
+        )
+        # 后台逾期扫描会干扰计时
+        os.environ["OVERDUE_SWEEP_INTERVAL_SECONDS"] = "0"
+        if args.query_budgets:
+            raise SystemExit(check_budgets(scale, args.seed))
+        if args.startup:
+            from benchmarks.startup import measure_startup
+
+            result, passed = asyncio.run(
+                measure_startup(
+                    os.environ["DATABASE_URL"],
+                    args.startup_workers,
+                    args.startup_target_ms,
+                )
+            )
+            print(json.dumps(result, ensure_ascii=False, indent=2))
+            raise SystemExit(0 if passed else 1)
+        from benchmarks.runner import run_benchmarks
+
+        result = asyncio.run(
+            run_benchmarks(
+                scale,
+                scenarios,
+                {"login": args.login_requests},
+                args.requests,
+                args.concurrency,
+                args.warmup,
+                args.seed,
+            )
+        )
+
+    report = json.dumps(result, ensure_ascii=False, indent=2)
+    if args.output:
+        args.output.write_text(report + "\n", encoding="utf-8")
+    else:
+        sys.stdout.write(report + "\n")
+
+
+if __name__ == "__main__":
+    main()
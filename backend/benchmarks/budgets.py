@@ -0,0 +1,212 @@
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any
+
+import httpx
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.core.database import AsyncSessionLocal
+from app.core.principal_cache import Principal
+from app.core.profiling import QueryBudgetExceeded, query_budget
+from app.main import app
+from app.schemas.book import BookCreate, BookUpdate
+from app.schemas.user import UserCreate
+from app.services.book_service import book_service
+from app.services.borrow_service import borrow_service
+from app.services.user_service import user_service
+from benchmarks.runner import auth_headers
+from benchmarks.scale import Scale
+from benchmarks.scenarios import API
+from benchmarks.seed import PASSWORD, Dataset, seed
+
+# 批量借还的条数：预算不随条数变化，条数取得足够大才能暴露逐条查询
+BATCH_ITEMS = 50
+
+
+@dataclass(frozen=True, slots=True)
+class Budget:
+    method: str
+    # {book_id} 为有借阅历史且在借的图书，{free_book_id} 为可借图书
+    path: str
+    max_statements: int
+    as_user: bool = False
+    body: Callable[[Dataset], dict[str, Any]] | None = None
+
+
+def _batch(action: str) -> Callable[[Dataset], dict[str, Any]]:
+    # 使用开头的图书与用户（均无未归还记录），与单本借还的 free_book_id 错开
+    def body(dataset: Dataset) -> dict[str, Any]:
+        pairs = zip(
+            dataset.book_ids[1 : BATCH_ITEMS + 1],
+            dataset.user_ids[1 : BATCH_ITEMS + 1],
+            strict=True,
+        )
+        return {
+            "action": action,
+            "items": [{"book_id": book, "user_id": user} for book, user in pairs],
+        }
+
+    return body
+
+
+# 每个接口单次请求允许执行的 SQL 语句数（含认证查询用户）。
+# 列表接口的语句数不应随 limit 增长，超出预算通常意味着出现了 N+1 查询
+BUDGETS: tuple[Budget, ...] = (
+    Budget("GET", "/books/?limit=50", 2),
+    # 列表 + 状态、出版社两条分组计数
+    Budget("GET", "/books/?limit=50&status=available&sort=title&facets=true", 4),
+    Budget("GET", "/books/{book_id}", 2),
+    Budget("GET", "/books/search?q=图书&limit=50", 2),
+    Budget("GET", "/books/{book_id}/records?limit=50", 2),
+    Budget("GET", "/borrow-records/?limit=50", 2, as_user=True),
+    Budget("GET", "/borrow-records/overdue?limit=50", 2),
+    Budget("GET", "/users/?limit=50", 2),
+    Budget("GET", "/users/me", 1, as_user=True),
+    Budget("GET", "/stats/circulation", 5),
+    Budget("POST", "/books/{free_book_id}/borrow", 7, as_user=True),
+    Budget("POST", "/books/{free_book_id}/return", 5, as_user=True),
+    Budget("POST", "/circulation/batch", 10, body=_batch("borrow")),
+    Budget("POST", "/circulation/batch", 6, body=_batch("return")),
+)
+
+
+@dataclass(frozen=True, slots=True)
+class ServiceBudget:
+    label: str
+    max_statements: int
+    # 参数为会话与前面步骤保存的结果，依次执行，每步单独提交
+    call: Callable[[AsyncSession, dict[str, Any]], Awaitable[Any]]
+    save: str | None = None
+
+
+# 服务层写方法单次调用的语句数（不含提交）。
+# 写入应通过 RETURNING 取回服务端生成的值，不应再额外 SELECT 刷新对象
+SERVICE_BUDGETS: tuple[ServiceBudget, ...] = (
+    ServiceBudget(
+        "BookService.create_book",
+        3,
+        lambda db, s: book_service.create_book(
+            db, BookCreate(book_no="budget-book", title="预算图书", author="预算")
+        ),
+        save="book",
+    ),
+    ServiceBudget(
+        "BookService.update_book",
+        5,
+        lambda db, s: book_service.update_book(
+            db, s["book"].id, BookUpdate(book_no="budget-book-2", title="预算图书 2")
+        ),
+    ),
+    ServiceBudget(
+        "BookService.delete_book",
+        3,
+        lambda db, s: book_service.delete_book(db, s["book"].id),
+    ),
+    ServiceBudget(
+        "UserService.create_user",
+        2,
+        lambda db, s: user_service.create_user(
+            db, UserCreate(username="budget-user", password=PASSWORD)
+        ),
+        save="user",
+    ),
+    ServiceBudget(
+        "UserService.update_role",
+        2,
+        lambda db, s: user_service.update_role(db, s["user"].id, "admin"),
+    ),
+    ServiceBudget(
+        "UserService.change_password",
+        3,
+        lambda db, s: user_service.change_password(
+            db, s["user"].id, PASSWORD, PASSWORD
+        ),
+    ),
+    ServiceBudget(
+        "BookService.borrow_book",
+        6,
+        lambda db, s: book_service.borrow_book(
+            db, s["free_book_id"], Principal.from_user(s["user"])
+        ),
+        save="record",
+    ),
+    ServiceBudget(
+        "BorrowService.update_note",
+        2,
+        lambda db, s: borrow_service.update_note(
+            db, s["record"].id, s["user"].id, "预算备注"
+        ),
+    ),
+    ServiceBudget(
+        "BookService.return_book",
+        4,
+        lambda db, s: book_service.return_book(
+            db, s["free_book_id"], Principal.from_user(s["user"])
+        ),
+    ),
+)
+
+
+async def check_service_budgets(dataset: Dataset) -> tuple[list[str], bool]:
+    lines: list[str] = []
+    passed = True
+    # 与单本借还、批量借还使用的图书错开
+    state: dict[str, Any] = {"free_book_id": dataset.book_ids[BATCH_ITEMS + 1]}
+    for budget in SERVICE_BUDGETS:
+        async with AsyncSessionLocal() as db:
+            try:
+                # 预算在调用完成后才检查，超出时结果仍然有效，后续步骤照常执行
+                with query_budget(budget.max_statements, budget.label) as captured:
+                    result = await budget.call(db, state)
+            except QueryBudgetExceeded as e:
+                lines.append(str(e))
+                passed = False
+            else:
+                lines.append(f"{budget.label}: {len(captured)}/{budget.max_statements}")
+            await db.commit()
+        if budget.save:
+            state[budget.save] = result
+    return lines, passed
+
+
+async def check_query_budgets(scale: Scale, rng_seed: int) -> tuple[list[str], bool]:
+    """逐个请求预算表中的接口，返回报告行与是否全部通过。"""
+    settings = get_settings()
+    lines: list[str] = []
+    passed = True
+    async with app.router.lifespan_context(app):
+        async with AsyncSessionLocal() as db:
+            dataset, _ = await seed(db, scale, rng_seed)
+        ids = {"book_id": dataset.book_ids[-1], "free_book_id": dataset.book_ids[0]}
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as c:
+            admin = await auth_headers(
+                c, settings.ADMIN_USERNAME, settings.ADMIN_PASSWORD
+            )
+            user = await auth_headers(c, dataset.usernames[0], PASSWORD)
+            for budget in BUDGETS:
+                body = budget.body(dataset) if budget.body else None
+                label = f"{budget.method} {budget.path}"
+                if body is not None:
+                    label += f" ({body['action']} × {len(body['items'])})"
+                try:
+                    with query_budget(budget.max_statements, label) as captured:
+                        response = await c.request(
+                            budget.method,
+                            API + budget.path.format(**ids),
+                            headers=user if budget.as_user else admin,
+                            json=body,
+                        )
+                except QueryBudgetExceeded as e:
+                    lines.append(str(e))
+                    passed = False
+                    continue
+                if response.status_code >= 400:
+                    lines.append(f"{label} -> {response.status_code}")
+                    passed = False
+                    continue
+                lines.append(f"{label}: {len(captured)}/{budget.max_statements}")
+        service_lines, services_passed = await check_service_budgets(dataset)
+    return lines + service_lines, passed and services_passed
@@ -0,0 +1,171 @@
+import asyncio
+import platform
+import random
+import statistics
+import subprocess
+import time
+from typing import Any
+
+import httpx
+from sqlalchemy import event
+
+from app.core.config import get_settings
+from app.core.database import AsyncSessionLocal, engine, read_engine
+from app.main import app
+from benchmarks.scale import Scale
+from benchmarks.scenarios import SCENARIOS, BenchContext
+from benchmarks.seed import PASSWORD, seed
+
+
+def _percentile(sorted_ms: list[float], pct: float) -> float:
+    if not sorted_ms:
+        return 0.0
+    index = min(len(sorted_ms) - 1, max(0, round(pct / 100 * len(sorted_ms)) - 1))
+    return sorted_ms[index]
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class StatementCounter:
+    """统计读写两个引擎上实际发往数据库的语句数。"""
+
+    def __init__(self):
+        self.count = 0
+        self._engines = {
+            id(e.sync_engine): e.sync_engine for e in (engine, read_engine)
+        }
+
+    def _on_execute(self, *args) -> None:
+        self.count += 1
+
+    def __enter__(self) -> "StatementCounter":
+        for sync_engine in self._engines.values():
+            event.listen(sync_engine, "before_cursor_execute", self._on_execute)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        for sync_engine in self._engines.values():
+            event.remove(sync_engine, "before_cursor_execute", self._on_execute)
+
+
+async def auth_headers(client: httpx.AsyncClient, username: str, password: str) -> dict:
+    response = await client.post(
+        "/api/v1/auth/login", data={"username": username, "password": password}
+    )
+    response.raise_for_status()
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+async def _run_scenario(
+    ctx: BenchContext, name: str, requests: int, concurrency: int, warmup: int
+) -> dict[str, Any]:
+    scenario = SCENARIOS[name]
+    for i in range(warmup):
+        await scenario(ctx, i % concurrency, i)
+
+    latencies: list[float] = []
+    errors: list[str] = []
+    issued = 0
+
+    async def worker(worker_id: int) -> None:
+        nonlocal issued
+        while issued < requests:
+            i = issued
+            issued += 1
+            started = time.perf_counter()
+            try:
+                await scenario(ctx, worker_id, i)
+            except Exception as e:
+                errors.append(str(e))
+                continue
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    with StatementCounter() as counter:
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(w) for w in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": requests,
+        "errors": len(errors),
+        "first_error": errors[0] if errors else None,
+        "duration_s": round(elapsed, 3),
+        "throughput_rps": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "latency_ms": {
+            "mean": round(statistics.fmean(latencies), 3) if latencies else 0.0,
+            "p50": round(_percentile(latencies, 50), 3),
+            "p95": round(_percentile(latencies, 95), 3),
+            "p99": round(_percentile(latencies, 99), 3),
+            "max": round(latencies[-1], 3) if latencies else 0.0,
+        },
+        "statements_per_request": round(counter.count / requests, 2),
+    }
+
+
+async def run_benchmarks(
+    scale: Scale,
+    scenarios: list[str],
+    requests_override: dict[str, int],
+    requests: int,
+    concurrency: int,
+    warmup: int,
+    rng_seed: int,
+) -> dict[str, Any]:
+    settings = get_settings()
+    async with app.router.lifespan_context(app):
+        async with AsyncSessionLocal() as db:
+            dataset, seed_seconds = await seed(db, scale, rng_seed)
+        if len(dataset.usernames) < concurrency:
+            raise SystemExit("基准用户数少于并发数")
+        if len(dataset.book_ids) - dataset.active < concurrency:
+            raise SystemExit("可借图书数少于并发数")
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as c:
+            admin = await auth_headers(
+                c, settings.ADMIN_USERNAME, settings.ADMIN_PASSWORD
+            )
+            users = [
+                await auth_headers(c, name, PASSWORD)
+                for name in dataset.usernames[:concurrency]
+            ]
+            ctx = BenchContext(c, dataset, admin, users, random.Random(rng_seed))
+            results = {
+                name: await _run_scenario(
+                    ctx,
+                    name,
+                    requests_override.get(name, requests),
+                    concurrency,
+                    warmup,
+                )
+                for name in scenarios
+            }
+
+    return {
+        "meta": {
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "database": engine.dialect.name,
+            "scale": {
+                "books": len(dataset.book_ids),
+                "users": len(dataset.usernames),
+                "records": dataset.records,
+            },
+            "seed_seconds": round(seed_seconds, 1),
+            "requests": requests,
+            "concurrency": concurrency,
+            "warmup": warmup,
+        },
+        "scenarios": results,
+    }
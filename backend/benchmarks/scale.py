@@ -0,0 +1,16 @@
+from dataclasses import dataclass
+
+
+# 不依赖 app：__main__ 需要在设置数据库环境变量之前解析参数
+@dataclass(frozen=True, slots=True)
+class Scale:
+    books: int
+    users: int
+    records: int
+
+
+SCALES = {
+    "10k": Scale(10_000, 10_000, 10_000),
+    "100k": Scale(100_000, 100_000, 100_000),
+    "1m": Scale(1_000_000, 1_000_000, 1_000_000),
+}
@@ -0,0 +1,134 @@
+import random
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+
+import httpx
+
+from benchmarks.seed import PASSWORD, Dataset
+
+API = "/api/v1"
+
+
+class ScenarioError(RuntimeError):
+    pass
+
+
+@dataclass
+class BenchContext:
+    client: httpx.AsyncClient
+    dataset: Dataset
+    admin_headers: dict[str, str]
+    # 按 worker 编号分配的普通用户凭证，借还场景中各 worker 互不冲突
+    user_headers: list[dict[str, str]]
+    rng: random.Random
+    cursors: dict[int, str | None] = field(default_factory=dict)
+    refresh_tokens: dict[int, str] = field(default_factory=dict)
+
+    def random_book(self) -> int:
+        return self.rng.choice(self.dataset.book_ids)
+
+
+def _check(response: httpx.Response, *expected: int) -> httpx.Response:
+    if response.status_code not in (expected or (200,)):
+        raise ScenarioError(f"{response.request.url} -> {response.status_code}")
+    return response
+
+
+async def login(ctx: BenchContext, worker: int, i: int) -> None:
+    users = ctx.dataset.usernames
+    _check(
+        await ctx.client.post(
+            f"{API}/auth/login",
+            data={"username": users[i % len(users)], "password": PASSWORD},
+        )
+    )
+
+
+async def refresh(ctx: BenchContext, worker: int, i: int) -> None:
+    # 每个 worker 沿自己的令牌链轮换；首次使用时登录一次，发生在预热阶段
+    token = ctx.refresh_tokens.get(worker)
+    if token is None:
+        response = _check(
+            await ctx.client.post(
+                f"{API}/auth/login",
+                data={"username": ctx.dataset.usernames[worker], "password": PASSWORD},
+            )
+        )
+        token = response.json()["refresh_token"]
+    response = _check(
+        await ctx.client.post(f"{API}/auth/refresh", json={"refresh_token": token})
+    )
+    ctx.refresh_tokens[worker] = response.json()["refresh_token"]
+
+
+async def list_books(ctx: BenchContext, worker: int, i: int) -> None:
+    # 每个 worker 沿游标向后翻页，到末页后从头开始
+    cursor = ctx.cursors.get(worker)
+    params = {"limit": 50} | ({"cursor": cursor} if cursor else {})
+    response = _check(
+        await ctx.client.get(f"{API}/books/", params=params, headers=ctx.admin_headers)
+    )
+    ctx.cursors[worker] = response.json()["next_cursor"]
+
+
+async def book_detail(ctx: BenchContext, worker: int, i: int) -> None:
+    _check(
+        await ctx.client.get(
+            f"{API}/books/{ctx.random_book()}", headers=ctx.admin_headers
+        )
+    )
+
+
+async def search_books(ctx: BenchContext, worker: int, i: int) -> None:
+    _check(
+        await ctx.client.get(
+            f"{API}/books/search",
+            params={"q": f"图书 {ctx.rng.randrange(1000)}"},
+            headers=ctx.admin_headers,
+        )
+    )
+
+
+async def borrow_return(ctx: BenchContext, worker: int, i: int) -> None:
+    # 一次操作 = 借阅 + 归还；worker 只操作自己的图书，避免互相冲突
+    book_id = ctx.dataset.book_ids[worker]
+    headers = ctx.user_headers[worker]
+    _check(await ctx.client.post(f"{API}/books/{book_id}/borrow", headers=headers))
+    _check(await ctx.client.post(f"{API}/books/{book_id}/return", headers=headers))
+
+
+async def my_records(ctx: BenchContext, worker: int, i: int) -> None:
+    _check(
+        await ctx.client.get(
+            f"{API}/borrow-records/",
+            params={"limit": 50},
+            headers=ctx.user_headers[worker],
+        )
+    )
+
+
+async def book_records(ctx: BenchContext, worker: int, i: int) -> None:
+    _check(
+        await ctx.client.get(
+            f"{API}/books/{ctx.random_book()}/records",
+            params={"limit": 50},
+            headers=ctx.admin_headers,
+        )
+    )
+
+
+async def circulation_stats(ctx: BenchContext, worker: int, i: int) -> None:
+    _check(await ctx.client.get(f"{API}/stats/circulation", headers=ctx.admin_headers))
+
+
+SCENARIOS: dict[str, Callable[[BenchContext, int, int], Awaitable[None]]] = {
+    "login": login,
+    "refresh": refresh,
+    "list_books": list_books,
+    "book_detail": book_detail,
+    "search_books": search_books,
+    "borrow_return": borrow_return,
+    "my_records": my_records,
+    "book_records": book_records,
+    "circulation_stats": circulation_stats,
+}
@@ -0,0 +1,173 @@
+import random
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.core.security import get_password_hash
+from app.models.book import Book
+from app.models.borrow_record import BorrowRecord
+from app.models.user import User
+from app.repositories.book_search_repository import book_search_repository
+from app.repositories.stats_repository import stats_repository
+from benchmarks.scale import Scale
+
+BATCH_SIZE = 5000
+# 基准用户统一使用该密码，只计算一次 bcrypt
+PASSWORD = "bench-password"
+# 借阅历史分布在最近两年内
+HISTORY_DAYS = 730
+# 约 1% 的用户/图书处于借阅中，放在 id 末尾，借还场景使用开头的用户和图书
+ACTIVE_RATIO = 0.01
+
+
+@dataclass(frozen=True, slots=True)
+class Dataset:
+    book_ids: list[int]
+    user_ids: list[int]
+    usernames: list[str]
+    records: int
+    active: int
+
+
+def _chunks(total: int):
+    for start in range(0, total, BATCH_SIZE):
+        yield start, min(start + BATCH_SIZE, total)
+
+
+async def _seed_books(db: AsyncSession, count: int, now: datetime) -> None:
+    for start, end in _chunks(count):
+        rows = [
+            {
+                "book_no": f"BENCH-{i:07d}",
+                "title": f"基准测试图书 {i}",
+                "author": f"作者 {i % 5000}",
+                "isbn": f"978{i:010d}",
+                "publisher": f"出版社 {i % 200}",
+                "status": "available",
+                "created_at": now - timedelta(minutes=count - i),
+            }
+            for i in range(start, end)
+        ]
+        await db.execute(insert(Book), rows)
+        await book_search_repository.index_book_nos(db, [r["book_no"] for r in rows])
+        await db.commit()
+
+
+async def _seed_users(db: AsyncSession, count: int, now: datetime) -> None:
+    hashed = get_password_hash(PASSWORD)
+    for start, end in _chunks(count):
+        await db.execute(
+            insert(User),
+            [
+                {
+                    "username": f"bench{i:07d}",
+                    "hashed_password": hashed,
+                    "role": "user",
+                    "created_at": now - timedelta(minutes=count - i),
+                }
+                for i in range(start, end)
+            ],
+        )
+        await db.commit()
+
+
+async def _seed_records(
+    db: AsyncSession,
+    count: int,
+    book_ids: list[int],
+    user_ids: list[int],
+    active: int,
+    now: datetime,
+    rng: random.Random,
+) -> None:
+    period = timedelta(days=get_settings().LOAN_PERIOD_DAYS)
+    history = count - active
+    for start, end in _chunks(history):
+        rows = []
+        for _ in range(start, end):
+            borrowed = now - timedelta(seconds=rng.randrange(HISTORY_DAYS * 86400))
+            returned = borrowed + timedelta(seconds=rng.randrange(1, 40 * 86400))
+            rows.append(
+                {
+                    "book_id": rng.choice(book_ids),
+                    "user_id": rng.choice(user_ids),
+                    "borrow_time": borrowed,
+                    "return_time": min(returned, now),
+                    "due_time": borrowed + period,
+                    "overdue": returned > borrowed + period,
+                }
+            )
+        await db.execute(insert(BorrowRecord), rows)
+        await db.commit()
+    # 未归还记录：每本书、每个用户最多一条，对应图书置为借出
+    active_books, active_users = book_ids[-active:], user_ids[-active:]
+    for start, end in _chunks(active):
+        rows = []
+        for book_id, user_id in zip(
+            active_books[start:end], active_users[start:end], strict=True
+        ):
+            borrowed = now - timedelta(seconds=rng.randrange(60 * 86400))
+            rows.append(
+                {
+                    "book_id": book_id,
+                    "user_id": user_id,
+                    "borrow_time": borrowed,
+                    "due_time": borrowed + period,
+                    "overdue": borrowed + period < now,
+                }
+            )
+        await db.execute(insert(BorrowRecord), rows)
+        await db.execute(
+            update(Book)
+            .where(Book.id.in_(active_books[start:end]))
+            .values(status="borrowed")
+        )
+        await db.commit()
+
+
+async def _load(db: AsyncSession) -> Dataset:
+    book_ids = list(
+        (await db.execute(select(Book.id).order_by(Book.id))).scalars().all()
+    )
+    users = (
+        await db.execute(
+            select(User.id, User.username).where(User.role == "user").order_by(User.id)
+        )
+    ).all()
+    records = (
+        await db.execute(select(func.count()).select_from(BorrowRecord))
+    ).scalar_one()
+    active = (
+        await db.execute(select(func.count()).where(BorrowRecord.return_time.is_(None)))
+    ).scalar_one()
+    return Dataset(
+        book_ids=book_ids,
+        user_ids=[u.id for u in users],
+        usernames=[u.username for u in users],
+        records=records,
+        active=active,
+    )
+
+
+async def seed(db: AsyncSession, scale: Scale, rng_seed: int) -> tuple[Dataset, float]:
+    """按规模写入图书、用户和借阅记录；库中已有图书时直接复用。"""
+    started = time.perf_counter()
+    if (await db.execute(select(func.count()).select_from(Book))).scalar_one():
+        return await _load(db), 0.0
+    now = datetime.utcnow().replace(microsecond=0)
+    rng = random.Random(rng_seed)
+    await _seed_books(db, scale.books, now)
+    await _seed_users(db, scale.users, now)
+    dataset = await _load(db)
+    active = max(1, int(min(scale.books, scale.users) * ACTIVE_RATIO))
+    active = min(active, scale.records)
+    await _seed_records(
+        db, scale.records, dataset.book_ids, dataset.user_ids, active, now, rng
+    )
+    await stats_repository.rebuild(db)
+    await db.commit()
+    return await _load(db), time.perf_counter() - started
@@ -0,0 +1,94 @@
+import asyncio
+import json
+import os
+import sys
+import time
+from typing import Any
+
+import httpx
+
+# 启动后的第一个请求：经过认证并查询数据库，代表真实的首个业务请求
+FIRST_REQUEST = "/api/v1/books/?limit=1"
+
+
+async def _serve_first_request() -> dict[str, float]:
+    started = time.perf_counter()
+    from app.core.config import get_settings
+    from app.core.database import AsyncReadSessionLocal
+    from app.core.principal_cache import password_marker
+    from app.core.security import create_access_token
+    from app.main import app
+    from app.repositories.user_repository import user_repository
+
+    imported = time.perf_counter()
+    async with app.router.lifespan_context(app):
+        ready = time.perf_counter()
+        # 直接签发令牌，避免把登录的 bcrypt 开销计入启动时间
+        async with AsyncReadSessionLocal() as db:
+            admin = await user_repository.get_by_username(
+                db, get_settings().ADMIN_USERNAME
+            )
+        token = create_access_token(
+            {"sub": str(admin.id), "pwd": password_marker(admin.hashed_password)}
+        )
+        headers = {"Authorization": f"Bearer {token}"}
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://boot") as c:
+            response = await c.get(FIRST_REQUEST, headers=headers)
+        response.raise_for_status()
+        served_at = time.time()
+        served = time.perf_counter()
+    return {
+        "import_ms": round((imported - started) * 1000, 1),
+        "lifespan_ms": round((ready - imported) * 1000, 1),
+        "first_request_ms": round((served - ready) * 1000, 1),
+        "served_at": served_at,
+    }
+
+
+async def _boot(env: dict[str, str]) -> dict[str, Any]:
+    spawned = time.time()
+    proc = await asyncio.create_subprocess_exec(
+        sys.executable,
+        "-m",
+        "benchmarks.startup",
+        env=env,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    stdout, stderr = await proc.communicate()
+    if proc.returncode != 0:
+        raise SystemExit(f"启动失败：\n{stderr.decode()}")
+    result = json.loads(stdout.decode().strip().splitlines()[-1])
+    # 从创建进程到首个请求返回，包含解释器启动与导入
+    return {"boot_ms": round((result.pop("served_at") - spawned) * 1000, 1)} | result
+
+
+async def measure_startup(
+    database_url: str, workers: int, target_ms: float
+) -> tuple[dict[str, Any], bool]:
+    """分别测量空库首次启动、已初始化库的启动和多个 worker 同时启动。
+
+    目标只约束已初始化库的单进程启动：这是部署与重启时的常见情况。
+    """
+    env = os.environ | {
+        "DATABASE_URL": database_url,
+        "OVERDUE_SWEEP_INTERVAL_SECONDS": "0",
+    }
+    first = await _boot(env)
+    warm = await _boot(env)
+    parallel = await asyncio.gather(*(_boot(env) for _ in range(workers)))
+    passed = warm["boot_ms"] <= target_ms
+    return {
+        "target_ms": target_ms,
+        "passed": passed,
+        "first_boot": first,
+        "warm_boot": warm,
+        "parallel_workers": workers,
+        "parallel_boot_max_ms": max(p["boot_ms"] for p in parallel),
+        "parallel_lifespan_max_ms": max(p["lifespan_ms"] for p in parallel),
+    }, passed
+
+
+if __name__ == "__main__":
+    print(json.dumps(asyncio.run(_serve_first_request())))
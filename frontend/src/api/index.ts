@@ -1,5 +1,14 @@
-import axios from 'axios'
-import type { Book, BorrowRecord, Token, User } from '@/types'
+import axios, { type InternalAxiosRequestConfig } from 'axios'
+import type {
+  Book,
+  BookListParams,
+  BookPage,
+  BorrowRecord,
+  Page,
+  PageParams,
+  Token,
+  User,
+} from '@/types'
 import { useAuthStore } from '@/stores/auth'
 
 const api = axios.create({
@@ -14,12 +23,27 @@ api.interceptors.request.use((config) => {
   return config
 })
 
+// 多个请求同时因访问令牌过期失败时共用一次刷新
+let refreshing: Promise<boolean> | null = null
+
 api.interceptors.response.use(
   (response) => response,
-  (error) => {
+  async (error) => {
+    const original = error.config as
+      | (InternalAxiosRequestConfig & { _retried?: boolean })
+      | undefined
     if (error.response?.status === 401) {
       const authStore = useAuthStore()
-      authStore.logout()
+      if (original && !original._retried && !original.url?.startsWith('/auth/')) {
+        original._retried = true
+        refreshing ??= authStore.refresh().finally(() => {
+          refreshing = null
+        })
+        if (await refreshing) {
+          return api(original)
+        }
+      }
+      authStore.clear()
       window.location.href = '/login'
     }
     return Promise.reject(error)
@@ -36,6 +60,10 @@ export const authApi = {
       headers: { 'Content-Type': 'application/x-www-form-urlencoded' },
     })
   },
+  refresh: (refreshToken: string) =>
+    api.post<Token>('/auth/refresh', { refresh_token: refreshToken }),
+  logout: (refreshToken: string) =>
+    api.post('/auth/logout', { refresh_token: refreshToken }),
 }
 
 // Users
@@ -48,14 +76,14 @@ export const userApi = {
     }),
   create: (data: { username: string; password: string; role: string }) =>
     api.post<User>('/users/', data),
-  list: () => api.get<User[]>('/users/'),
+  list: (params?: PageParams) => api.get<Page<User>>('/users/', { params }),
   updateRole: (userId: number, role: string) =>
     api.put<User>(`/users/${userId}/role`, { role }),
 }
 
 // Books
 export const bookApi = {
-  list: () => api.get<Book[]>('/books/'),
+  list: (params?: BookListParams) => api.get<BookPage>('/books/', { params }),
   get: (id: number) => api.get<Book>(`/books/${id}`),
   create: (data: {
     book_no: string
@@ -68,12 +96,14 @@ export const bookApi = {
   delete: (id: number) => api.delete(`/books/${id}`),
   borrow: (id: number) => api.post<BorrowRecord>(`/books/${id}/borrow`),
   return: (id: number) => api.post<BorrowRecord>(`/books/${id}/return`),
-  getRecords: (id: number) => api.get<BorrowRecord[]>(`/books/${id}/records`),
+  getRecords: (id: number, params?: PageParams) =>
+    api.get<Page<BorrowRecord>>(`/books/${id}/records`, { params }),
 }
 
 // Borrow Records
 export const borrowApi = {
-  listMine: () => api.get<BorrowRecord[]>('/borrow-records/'),
+  listMine: (params?: PageParams) =>
+    api.get<Page<BorrowRecord>>('/borrow-records/', { params }),
   updateNote: (recordId: number, note: string) =>
     api.put<BorrowRecord>(`/borrow-records/${recordId}/note`, { note }),
 }
@@ -1,22 +1,42 @@
 import { computed, ref } from 'vue'
 import { defineStore } from 'pinia'
-import type { User } from '@/types'
+import type { Token, User } from '@/types'
 import { authApi, userApi } from '@/api'
 
 export const useAuthStore = defineStore('auth', () => {
   const token = ref<string | null>(localStorage.getItem('token'))
+  const refreshToken = ref<string | null>(localStorage.getItem('refresh_token'))
   const user = ref<User | null>(null)
 
   const isLoggedIn = computed(() => !!token.value)
   const isAdmin = computed(() => user.value?.role === 'admin')
 
-  async function login(username: string, password: string) {
-    const { data } = await authApi.login(username, password)
+  function setTokens(data: Token) {
     token.value = data.access_token
+    refreshToken.value = data.refresh_token
     localStorage.setItem('token', data.access_token)
+    localStorage.setItem('refresh_token', data.refresh_token)
+  }
+
+  async function login(username: string, password: string) {
+    const { data } = await authApi.login(username, password)
+    setTokens(data)
     await fetchUser()
   }
 
+  // 访问令牌过期后换取新令牌，不需要重新输入密码
+  async function refresh(): Promise<boolean> {
+    if (!refreshToken.value) return false
+    try {
+      const { data } = await authApi.refresh(refreshToken.value)
+      setTokens(data)
+      return true
+    } catch {
+      clear()
+      return false
+    }
+  }
+
   async function fetchUser() {
     if (!token.value) return
     try {
@@ -27,11 +47,22 @@ export const useAuthStore = defineStore('auth', () => {
     }
   }
 
-  function logout() {
+  function clear() {
     token.value = null
+    refreshToken.value = null
     user.value = null
     localStorage.removeItem('token')
+    localStorage.removeItem('refresh_token')
+  }
+
+  function logout() {
+    const pending = refreshToken.value
+    clear()
+    if (pending) {
+      // 吊销服务端会话；失败不影响本地退出
+      authApi.logout(pending).catch(() => undefined)
+    }
   }
 
-  return { token, user, isLoggedIn, isAdmin, login, fetchUser, logout }
+  return { token, user, isLoggedIn, isAdmin, login, refresh, fetchUser, clear, logout }
 })
@@ -22,12 +22,54 @@ export interface BorrowRecord {
   user_id: number
   borrow_time: string
   return_time: string | null
+  due_time: string | null
+  overdue: boolean
   note: string | null
   book: Book
   user: User
 }
 
+export interface Page<T> {
+  items: T[]
+  next_cursor: string | null
+}
+
+export interface PageParams {
+  limit?: number
+  cursor?: string
+  // 逗号分隔的字段列表，只返回需要的字段
+  fields?: string
+}
+
+export interface FacetCount {
+  value: string
+  count: number
+}
+
+export interface BookPage extends Page<Book> {
+  // 仅在请求 facets=true 时返回
+  facets?: {
+    status: FacetCount[]
+    publisher: FacetCount[]
+  }
+}
+
+export type BookSort = '-created_at' | 'created_at' | 'title' | '-title' | 'author' | '-author'
+
+export interface BookListParams extends PageParams {
+  status?: Book['status']
+  author?: string
+  publisher?: string
+  isbn_prefix?: string
+  created_from?: string
+  created_to?: string
+  sort?: BookSort
+  facets?: boolean
+}
+
 export interface Token {
   access_token: string
+  refresh_token: string
   token_type: string
+  expires_in: number
 }